@@ -52,13 +52,33 @@ def _ensure_module_aliases():
         ('plugins.module_utils.conf.change', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.conf.change'),
         ('plugins.module_utils.conf.release', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.conf.release'),
         # module_utils
-        ('plugins.module_utils.api_util', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util'),
+        # (dependencies first, so every importer sees the aliased module objects)
         ('plugins.module_utils.error_handler', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.error_handler'),
-        ('plugins.module_utils.oauth', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.oauth'),
         ('plugins.module_utils.sdp_config', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config'),
+        ('plugins.module_utils.cassette', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.cassette'),
+        ('plugins.module_utils.local_cache', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.local_cache'),
+        ('plugins.module_utils.circuit_breaker', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.circuit_breaker'),
+        ('plugins.module_utils.compression', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.compression'),
+        ('plugins.module_utils.hedging', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.hedging'),
+        ('plugins.module_utils.json_stream', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.json_stream'),
+        ('plugins.module_utils.gateway', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.gateway'),
+        ('plugins.module_utils.oauth', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.oauth'),
+        ('plugins.module_utils.response_cache', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.response_cache'),
+        ('plugins.module_utils.concurrency', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.concurrency'),
         ('plugins.module_utils.udf_utils', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.udf_utils'),
+        ('plugins.module_utils.field_schema', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.field_schema'),
+        ('plugins.module_utils.sdp_core', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_core'),
+        ('plugins.module_utils.api_util', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util'),
+        ('plugins.module_utils.async_client', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.async_client'),
+        ('plugins.module_utils.reference_data', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.reference_data'),
+        ('plugins.module_utils.user_directory', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.user_directory'),
+        ('plugins.module_utils.journal', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.journal'),
         ('plugins.module_utils.write_helpers', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.write_helpers'),
         ('plugins.module_utils.read_helpers', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.read_helpers'),
+        ('plugins.module_utils.bulk_helpers', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.bulk_helpers'),
+        ('plugins.module_utils.import_helpers', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.import_helpers'),
+        ('plugins.module_utils.time_windows', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.time_windows'),
+        ('plugins.module_utils.sdp_cli', 'ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_cli'),
         # modules
         ('plugins.modules.write_record', 'ansible_collections.manageengine.sdp_cloud.plugins.modules.write_record'),
         ('plugins.modules.read_record', 'ansible_collections.manageengine.sdp_cloud.plugins.modules.read_record'),
@@ -71,6 +91,8 @@ def _ensure_module_aliases():
         ('plugins.modules.change_info', 'ansible_collections.manageengine.sdp_cloud.plugins.modules.change_info'),
         ('plugins.modules.release', 'ansible_collections.manageengine.sdp_cloud.plugins.modules.release'),
         ('plugins.modules.release_info', 'ansible_collections.manageengine.sdp_cloud.plugins.modules.release_info'),
+        ('plugins.modules.sdp_reconcile', 'ansible_collections.manageengine.sdp_cloud.plugins.modules.sdp_reconcile'),
+        ('plugins.modules.sdp_import', 'ansible_collections.manageengine.sdp_cloud.plugins.modules.sdp_import'),
     ]
     for short, long in prefixes:
         try:
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Documentation fragment for the multi-id forms of the write modules.
+    DOCUMENTATION = r'''
+options:
+  skip_existence_check:
+    description:
+      - When updating or deleting a list of IDs, send the writes without first fetching the current records.
+      - Saves the lookup calls, but updates are then sent even to records that already match I(payload).
+      - IDs the API reports as not found are still returned in C(missing) or C(already_absent).
+      - In check mode every ID is then reported as updated or deleted.
+    type: bool
+    default: false
+  concurrency:
+    description:
+      - Maximum number of API calls sent in parallel when a list of IDs is given (1-32).
+    type: int
+    default: 4
+'''
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Documentation fragment for the adaptive limit on parallel API calls.
+    DOCUMENTATION = r'''
+options:
+  adaptive_concurrency:
+    description:
+      - Adjust the number of parallel API calls to the portal's load instead of keeping it at I(concurrency).
+      - Starts at I(concurrency), adds one parallel call after every 10 consecutive successful calls, and halves
+        the number when the API answers HTTP 429 or 5xx, within 1-32.
+      - The final, highest and lowest number of parallel calls and the number of throttled calls are returned
+        in C(adaptive_concurrency).
+      - With the local gateway enabled (E(SDP_CLOUD_GATEWAY)), the calls of every task to a portal also share
+        one adaptive limit in the gateway daemon. It starts at E(SDP_CLOUD_GATEWAY_CONCURRENCY) parallel calls
+        (default C(32), the maximum), so it does not hold back a higher I(concurrency). A call that finds no free
+        slot within I(timeout) is retried without counting as a failure of the portal.
+    type: bool
+    default: false
+'''
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Documentation fragment for the write-ahead journal of bulk writes.
+    DOCUMENTATION = r'''
+options:
+  journal:
+    description:
+      - Path of an append-only JSONL journal on the controller for the creates and updates of a bulk run.
+      - Each operation is journaled before it is sent, and its outcome is journaled after the API answers.
+        Outcomes are fsynced in batches.
+      - A run that ends with nothing left to retry marks the journal complete, and the next run starts a new section.
+      - If the journal holds an interrupted run, the task fails unless I(resume=true).
+      - Only used by bulk runs. Bulk deletes are not journaled, because re-running one reports deleted IDs as already absent.
+    type: path
+  resume:
+    description:
+      - Continue the interrupted run recorded in I(journal).
+      - Operations the journal records as done, or as failed with a non-retryable error, are not sent again.
+        Only pending operations and those that failed with a retryable error (transport errors, HTTP 401, 429
+        and 5xx) are replayed.
+      - An operation that was pending when the run died may already have reached the API.
+    type: bool
+    default: false
+'''
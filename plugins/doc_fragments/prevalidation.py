@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Documentation fragment for local payload pre-validation in write modules.
+    DOCUMENTATION = r'''
+options:
+  validate_lookups:
+    description:
+      - Validate lookup values in I(payload) (for example C(priority), C(status), C(group), C(site), C(category))
+        against the portal's reference data before any write is sent.
+      - Reference data is fetched once per portal and cached on the controller for I(reference_cache_ttl) seconds.
+      - Invalid values fail the task locally, listing the allowed values, instead of after an API round trip.
+    type: bool
+    default: false
+  lookup_by_id:
+    description:
+      - "Send validated lookup values as C({id: ...}) instead of C({name: ...})."
+      - Implies I(validate_lookups=true).
+    type: bool
+    default: false
+  validate_users:
+    description:
+      - Check that every user value in I(payload) (for example C(requester), C(technician), C(change_manager),
+        or user-type UDFs) belongs to an existing portal user or technician before any write is sent.
+      - Users and technicians are cached on the controller; once the cache is older than I(reference_cache_ttl)
+        only records updated since the last sync are fetched, and unknown emails are looked up in one batched search.
+    type: bool
+    default: false
+  reference_cache_ttl:
+    description:
+      - How long, in seconds, cached reference data and the cached user directory stay valid.
+      - Set to C(0) to always refetch.
+      - The cache directory defaults to C(~/.cache/manageengine.sdp_cloud) and can be changed with the
+        E(SDP_CLOUD_CACHE_DIR) environment variable.
+      - Both caches are kept per portal and per user (refresh token, or access token without one), so users
+        sharing an OAuth client never see data fetched with each other's credentials.
+    type: int
+    default: 3600
+'''
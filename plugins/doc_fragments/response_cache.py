@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Documentation fragment for the cache of read responses.
+    DOCUMENTATION = r'''
+options:
+  cache_ttl:
+    description:
+      - Reuse the response of an identical read (same endpoint and query) made by any task on the controller
+        at most this many seconds ago, instead of calling the API.
+      - Responses are cached in memory and in the controller's cache directory (C(SDP_CLOUD_CACHE_DIR), by
+        default C(~/.cache/manageengine.sdp_cloud)), shared by every task reading the same portal.
+      - Writes made through this collection drop the cached responses of the record written, its sub-resources
+        and the lists containing it. Changes made outside of it are only seen once the cached response is older
+        than I(cache_ttl).
+      - C(0) disables the cache.
+    type: int
+    default: 0
+'''
@@ -30,4 +30,18 @@ options:
       - Mutually exclusive with I(client_id), I(client_secret), and I(refresh_token).
       - If not set, the value of the E(SDP_CLOUD_AUTH_TOKEN) environment variable is used.
     type: str
+  timeout:
+    description:
+      - Seconds to wait for the portal to accept a connection or send data, per HTTP attempt.
+      - Capped by the time left before I(deadline).
+    type: int
+    default: 10
+  deadline:
+    description:
+      - Maximum number of seconds the task may spend on API calls in total, including retries, backoff waits
+        and every page of list operations.
+      - When it is reached, the module fails and says so. Records already written by bulk operations are still
+        reported, and paged reads report the number of records read as C(records_read).
+      - By default there is no limit.
+    type: int
 '''
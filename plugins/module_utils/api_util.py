@@ -5,20 +5,17 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
-import json
 import os
-import time
 from ansible.module_utils.basic import env_fallback
 from ansible.module_utils.urls import fetch_url
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.concurrency import adaptive_limiter
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.oauth import get_access_token
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import DC_CHOICES, MODULE_CONFIG
-
-from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.error_handler import handle_error
-try:
-    import urllib.parse as urllib_parse
-except ImportError:
-    import urllib
-    urllib_parse = urllib
+# Re-exported: the client core and its errors were moved to sdp_core, which does not depend on Ansible
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_core import (  # noqa: F401  pylint: disable=unused-import
+    DEFAULT_PREFETCH_DEPTH, DEFAULT_TIMEOUT, ENV_AUTH_TOKEN, ENV_CLIENT_ID, ENV_CLIENT_SECRET, ENV_PREFETCH_DEPTH,
+    ENV_REFRESH_TOKEN, DeadlineExceeded, SDPAPIError, SDPCoreClient, _values_match, has_differences,
+)
 
 
 # Auth Constants
@@ -49,11 +46,8 @@ def sanitize_string_params(module):
     module.params = _strip_strings(module.params)
 
 
-# Environment variable names for credential fallback
-ENV_AUTH_TOKEN = 'SDP_CLOUD_AUTH_TOKEN'
-ENV_CLIENT_ID = 'SDP_CLOUD_CLIENT_ID'
-ENV_CLIENT_SECRET = 'SDP_CLOUD_CLIENT_SECRET'
-ENV_REFRESH_TOKEN = 'SDP_CLOUD_REFRESH_TOKEN'
+# When true, module results carry the client's transfer metrics as 'sdp_metrics'
+ENV_METRICS = 'SDP_CLOUD_METRICS'
 
 
 def base_argument_spec():
@@ -70,6 +64,8 @@ def base_argument_spec():
         client_secret=dict(type='str', no_log=True, fallback=(env_fallback, [ENV_CLIENT_SECRET])),
         refresh_token=dict(type='str', no_log=True, fallback=(env_fallback, [ENV_REFRESH_TOKEN])),
         dc=dict(type='str', required=True, choices=DC_CHOICES),
+        timeout=dict(type='int', default=DEFAULT_TIMEOUT),
+        deadline=dict(type='int'),
     )
 
 
@@ -146,27 +142,44 @@ def construct_endpoint(module, operation=None):
     return endpoint
 
 
-class SDPClient:
+class SDPClient(SDPCoreClient):
+    """SDPCoreClient adapted to an AnsibleModule.
+
+    Connection settings come from module.params, calls are sent with
+    fetch_url, warnings go to module.warn, and request(),
+    fetch_existing_record() and iter_records() fail the module instead of
+    raising. call() and call_stream() still raise SDPAPIError, for worker
+    threads.
+    """
+
     def __init__(self, module):
         sanitize_string_params(module)
+        params = module.params
+        try:
+            super(SDPClient, self).__init__(
+                params.get('domain'), params.get('portal_name'), dc=params.get('dc'),
+                auth_token=params.get('auth_token'), client_id=params.get('client_id'),
+                client_secret=params.get('client_secret'), refresh_token=params.get('refresh_token'),
+                timeout=params.get('timeout'), deadline=params.get('deadline'),
+                transport=self._fetch_url, warn=module.warn,
+                # AIMD limit on concurrent calls when the module sets adaptive_concurrency (see concurrency.py)
+                limiter=adaptive_limiter(module),
+            )
+        except ValueError as e:
+            module.fail_json(msg=str(e))
         self.module = module
-        self.params = module.params
-        self.domain = self.params.get('domain')
-        self.portal = self.params.get('portal_name')
-        self.auth_token = self.params.get('auth_token')
-
-        # OAuth params
-        self.client_id = self.params.get('client_id')
-        self.client_secret = self.params.get('client_secret')
-        self.refresh_token = self.params.get('refresh_token')
-        self.dc = self.params.get('dc')
+        self.params = params
 
-        self.base_url = "https://{0}/app/{1}/api/v3".format(self.domain, self.portal)
+        if os.environ.get(ENV_METRICS, '').lower() in ('1', 'true', 'yes'):
+            self._add_to_results('sdp_metrics', self._metrics_snapshot)
+        if self.limiter is not None:
+            self._add_to_results('adaptive_concurrency', self.limiter.stats)
 
-    # HTTP status codes that are safe to retry (transient errors)
-    RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+    def _fetch_url(self, url, data=None, method='GET', headers=None, timeout=DEFAULT_TIMEOUT):
+        """Transport for SDPCoreClient; fetch_url's own gzip decoding is replaced by the core's."""
+        return fetch_url(self.module, url, data=data, method=method, headers=headers, decompress=False, timeout=timeout)
 
-    def _ensure_auth(self):
+    def ensure_auth(self):
         """Ensure we have a valid auth token, generating one if needed.
 
         Resolves credentials from module params first, then falls back to
@@ -180,10 +193,15 @@ class SDPClient:
             self.refresh_token = auth['refresh_token']
 
         if not self.auth_token:
-            if self.client_id and self.client_secret and self.refresh_token:
+            if self._can_refresh():
+                try:
+                    timeout = self._attempt_timeout()
+                except DeadlineExceeded as e:
+                    self.module.fail_json(**e.fail_kwargs)
                 token_data = get_access_token(
                     self.module, self.client_id, self.client_secret,
-                    self.refresh_token, self.dc
+                    self.refresh_token, self.dc, cassette=self.cassette,
+                    timeout=timeout, gateway=self.gateway
                 )
                 self.auth_token = token_data['access_token']
             else:
@@ -191,7 +209,25 @@ class SDPClient:
                     msg="Missing authentication credentials."
                 )
 
-    def request(self, endpoint, method='GET', data=None, max_retries=3, retry_delay=2):
+    def _request_token(self, stale_token=None):
+        return get_access_token(
+            self.module, self.client_id, self.client_secret,
+            self.refresh_token, self.dc, cassette=self.cassette,
+            timeout=self._attempt_timeout(), gateway=self.gateway, stale_token=stale_token
+        )
+
+    def _add_to_results(self, key, snapshot):
+        """Add snapshot() to every exit_json()/fail_json() result of the module under key."""
+        for name in ('exit_json', 'fail_json'):
+            original = getattr(self.module, name)
+
+            def _with_snapshot(original=original, **kwargs):
+                kwargs.setdefault(key, snapshot())
+                return original(**kwargs)
+
+            setattr(self.module, name, _with_snapshot)
+
+    def request(self, endpoint, method='GET', data=None, max_retries=3, retry_delay=2, cache_ttl=None):
         """Make API request with exponential backoff for transient errors.
 
         Args:
@@ -200,123 +236,31 @@ class SDPClient:
             data: Request payload dict (will be JSON-encoded).
             max_retries: Maximum number of retry attempts for transient errors.
             retry_delay: Base delay in seconds between retries (doubles each attempt).
+            cache_ttl: For GETs, reuse a cached response up to this many seconds old (see call()).
 
         Returns:
-            Parsed JSON response dict from the API.
+            Parsed JSON response dict from the API. Fails the module on error.
         """
-        self._ensure_auth()
-
-        url = "{0}/{1}".format(self.base_url, endpoint)
-
-        headers = {
-            'Authorization': 'Zoho-oauthtoken {0}'.format(self.auth_token),
-            'Accept': 'application/vnd.manageengine.sdp.v3+json'
-        }
-        payload = None
-        if data:
-            payload = urllib_parse.urlencode({'input_data': json.dumps(data)})
-            headers['Content-Type'] = 'application/x-www-form-urlencoded'
-
-        last_info = None
-        for attempt in range(max_retries + 1):
-            response, info = fetch_url(
-                self.module,
-                url,
-                data=payload,
-                method=method,
-                headers=headers
-            )
-
-            status_code = info.get('status', -1)
-            last_info = info
-
-            # If request succeeded (response is not None), break out of retry loop
-            if response:
-                break
-
-            # Check if the error is retryable
-            if status_code in self.RETRYABLE_STATUS_CODES and attempt < max_retries:
-                delay = retry_delay * (2 ** attempt)
-                self.module.warn(
-                    "Request to {0} returned HTTP {1}, retrying in {2}s (attempt {3}/{4})".format(
-                        url, status_code, delay, attempt + 1, max_retries
-                    )
-                )
-                time.sleep(delay)
-                continue
-
-            # Non-retryable error or retries exhausted
-            handle_error(self.module, info, "API Request Failed")
-
-        return self._parse_response(response, last_info)
-
-    def _parse_response(self, response, info):
-        """Parse and validate the API response."""
-        status_code = info.get('status', -1)
-        body = response.read()
-
-        # Treat HTTP 4xx/5xx as failure (e.g. 404 wrong endpoint) so we don't return changed=True
-        if status_code >= 400:
-            error_info = dict(info)
-            if body:
-                error_info['body'] = body.decode('utf-8', errors='replace') if isinstance(body, bytes) else body
-            handle_error(self.module, error_info, "API Request Failed")
-
-        if not body:
-            return {"status": status_code, "msg": "Empty response body"}
-
         try:
-            result = json.loads(body)
-        except ValueError:
-            self.module.fail_json(msg="Invalid JSON response from SDP API", raw_response=body)
-
-        # Check for API-level errors even on HTTP 200
-        if isinstance(result, dict):
-            resp_status = result.get('response_status', {})
-            if isinstance(resp_status, dict) and resp_status.get('status_code', 2000) >= 4000:
-                self.module.fail_json(
-                    msg="{0}".format(resp_status.get('messages', [{}])[0].get('message', 'API Error')),
-                    status=resp_status.get('status_code'),
-                    response=result
-                )
-
-        return result
+            return self.call(endpoint, method=method, data=data, max_retries=max_retries, retry_delay=retry_delay,
+                             cache_ttl=cache_ttl)
+        except SDPAPIError as e:
+            self.module.fail_json(**e.fail_kwargs)
 
     def fetch_existing_record(self, endpoint):
         """Fetch a single record for idempotency checks. Returns None if not found."""
-        self._ensure_auth()
-
-        url = "{0}/{1}".format(self.base_url, endpoint)
-
-        headers = {
-            'Authorization': 'Zoho-oauthtoken {0}'.format(self.auth_token),
-            'Accept': 'application/vnd.manageengine.sdp.v3+json'
-        }
-
-        response, info = fetch_url(
-            self.module,
-            url,
-            method='GET',
-            headers=headers
-        )
-
-        status_code = info.get('status', -1)
-
-        if status_code == 404 or not response:
-            return None
-
-        body = response.read()
-        if not body:
-            return None
+        try:
+            return super(SDPClient, self).fetch_existing_record(endpoint)
+        except SDPAPIError as e:
+            self.module.fail_json(**e.fail_kwargs)
 
+    def iter_records(self, endpoint, response_key, list_info=None, prefetch=0):
+        """Same as SDPCoreClient.iter_records(), but fails the module on API errors."""
         try:
-            return json.loads(body)
-        except ValueError:
-            self.module.warn(
-                "Failed to parse JSON response from {0} (HTTP {1}). "
-                "Idempotency check skipped.".format(endpoint, status_code)
-            )
-            return None
+            for record in super(SDPClient, self).iter_records(endpoint, response_key, list_info, prefetch):
+                yield record
+        except SDPAPIError as e:
+            self.module.fail_json(**e.fail_kwargs)
 
 
 def get_current_record(client, module):
@@ -339,67 +283,3 @@ def get_current_record(client, module):
     # The API wraps the record under the module name key (e.g., 'request', 'problem')
     parent_module = module.params['parent_module_name']
     return result.get(parent_module)
-
-
-def has_differences(desired_payload, current_record, parent_module):
-    """Compare the desired payload against the current record to detect changes.
-
-    Performs a shallow comparison of the fields present in the desired payload
-    against the current record. Only fields specified in the payload are compared.
-
-    Args:
-        desired_payload: The constructed API payload dict (e.g., {'request': {...}}).
-        current_record: The current record dict from the API.
-        parent_module: The module name key (e.g., 'request').
-
-    Returns:
-        True if there are differences, False if the desired state matches current.
-    """
-    if not desired_payload or not current_record:
-        return True
-
-    desired_fields = desired_payload.get(parent_module, {})
-
-    for key, desired_value in desired_fields.items():
-        current_value = current_record.get(key)
-
-        if key == 'udf_fields':
-            # Compare UDF fields individually
-            current_udfs = current_record.get('udf_fields', {})
-            for udf_key, udf_value in desired_value.items():
-                if not _values_match(udf_value, current_udfs.get(udf_key)):
-                    return True
-            continue
-
-        if not _values_match(desired_value, current_value):
-            return True
-
-    return False
-
-
-def _values_match(desired, current):
-    """Compare a desired value with the current value from the API.
-
-    Handles the various SDP API value formats:
-    - lookup fields: {'name': 'value'} compared to {'name': 'value', 'id': '123', ...}
-    - user fields: {'email_id': 'value'} (only email_id is accepted as input)
-    - datetime fields: {'value': timestamp}
-    - scalar fields: direct comparison
-
-    Returns:
-        True if the values match, False otherwise.
-    """
-    if desired is None and current is None:
-        return True
-    if desired is None or current is None:
-        return False
-
-    # Both are dicts: compare the keys present in desired
-    if isinstance(desired, dict) and isinstance(current, dict):
-        for k, v in desired.items():
-            if current.get(k) != v:
-                return False
-        return True
-
-    # Direct scalar comparison
-    return desired == current
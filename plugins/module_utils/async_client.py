@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import asyncio
+import functools
+import json
+import ssl
+from urllib.parse import urlencode, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.compression import (
+    ACCEPT_ENCODING, content_encoding, decode_body, is_supported,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.error_handler import parse_error_info
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_core import (
+    DEFAULT_TIMEOUT, DeadlineExceeded, SDPAPIError,
+)
+
+
+DEFAULT_ASYNC_CONCURRENCY = 100
+
+# Idle keep-alive connections kept per host
+MAX_IDLE_CONNECTIONS = 100
+
+# Seconds between checks for an adaptive limiter slot freed by a thread outside the event loop
+LIMITER_POLL_INTERVAL = 0.05
+
+
+class HTTPResult:
+    """A fully read HTTP response, exposing read() like the objects fetch_url returns."""
+
+    def __init__(self, status, reason, headers, body):
+        self.status = self.code = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    def read(self):
+        return self.body
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed by server")
+    parts = status_line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+    version, status = parts[0], int(parts[1])
+    reason = parts[2] if len(parts) > 2 else ''
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _sep, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    framed = True
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        body = bytearray()
+        while True:
+            size = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+            if size == 0:
+                # Skip trailers up to the blank line ending the message
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                break
+            body += await reader.readexactly(size)
+            await reader.readexactly(2)
+        body = bytes(body)
+    elif 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+    else:
+        body = await reader.read()
+        framed = False
+
+    keep_alive = framed and version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+    return HTTPResult(status, reason, headers, body), keep_alive
+
+
+class AsyncHTTPTransport:
+    """Minimal HTTP/1.1 client on asyncio streams with per-host keep-alive connections."""
+
+    def __init__(self):
+        self._idle = {}
+        self._ssl_context = None
+
+    def _ssl(self):
+        if self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        return self._ssl_context
+
+    async def _connect(self, scheme, host, port, timeout):
+        ssl_context = self._ssl() if scheme == 'https' else None
+        return await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=ssl_context, server_hostname=host if ssl_context else None),
+            timeout)
+
+    async def request(self, method, url, headers=None, body=None, timeout=DEFAULT_TIMEOUT):
+        """Send one request and return an HTTPResult, waiting up to timeout seconds each to connect, send and read it.
+
+        Raises OSError or asyncio errors on transport failure.
+        """
+        parsed = urlsplit(url)
+        scheme = parsed.scheme
+        port = parsed.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parsed.hostname, port)
+        target = parsed.path or '/'
+        if parsed.query:
+            target += '?' + parsed.query
+
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        lines = ['{0} {1} HTTP/1.1'.format(method, target), 'Host: {0}'.format(parsed.netloc)]
+        for name, value in (headers or {}).items():
+            lines.append('{0}: {1}'.format(name, value))
+        lines.append('Content-Length: {0}'.format(len(body or b'')))
+        message = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (body or b'')
+
+        idle = self._idle.setdefault(key, [])
+        while True:
+            reused = bool(idle)
+            reader, writer = idle.pop() if reused else await self._connect(scheme, parsed.hostname, port, timeout)
+            try:
+                writer.write(message)
+                # A peer that stops reading would otherwise stall a large upload indefinitely
+                await asyncio.wait_for(writer.drain(), timeout)
+                result, keep_alive = await asyncio.wait_for(_read_response(reader), timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused:
+                    # The server closed an idle keep-alive connection; retry on a fresh one
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            if keep_alive and len(idle) < MAX_IDLE_CONNECTIONS:
+                idle.append((reader, writer))
+            else:
+                writer.close()
+            return result
+
+    def close(self):
+        """Close every idle connection."""
+        for connections in self._idle.values():
+            for _reader, writer in connections:
+                writer.close()
+        self._idle = {}
+
+
+class AsyncSDPClient:
+    """asyncio counterpart of SDPCoreClient for high fan-out workloads.
+
+    Shares the wrapped client's credentials, timeout, deadline, adaptive
+    limiter, circuit breaker, metrics and response parsing, so call() has
+    the same retry and error semantics as SDPCoreClient.call(): it retries
+    RETRYABLE_STATUS_CODES with exponential backoff, refreshes the token
+    once on HTTP 401 and raises SDPAPIError. At most 'max_concurrency'
+    calls are in flight at once; waiting calls cost a coroutine, not a
+    thread. Hedging and coalescing of GETs do not apply.
+
+    Token refreshes and circuit breaker updates read and write files, so
+    they run on the default executor rather than on the event loop.
+
+    When a cassette or gateway is active, or the portal is reached through
+    a proxy, calls go through the synchronous client on the default
+    executor, so they are recorded, replayed or relayed as usual; the
+    executor's thread count then bounds concurrency.
+
+    Args:
+        client: An SDPCoreClient (or SDPClient) to take settings and state from.
+        max_concurrency: Maximum number of calls in flight at once.
+    """
+
+    def __init__(self, client, max_concurrency=DEFAULT_ASYNC_CONCURRENCY):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+        self._transport = None
+        self._slot_freed = None
+
+    def _use_sync(self):
+        """Return True when calls must go through the synchronous client."""
+        client = self.client
+        if client.cassette or client.gateway is not None:
+            return True
+        parsed = urlsplit(client.base_url)
+        return bool(getproxies().get(parsed.scheme)) and not proxy_bypass(parsed.hostname)
+
+    @staticmethod
+    async def _off_loop(func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+    async def _breaker(self, func, *args):
+        """Run one of the client's _breaker_* methods, off the event loop when a breaker is configured."""
+        if self.client.breaker is None:
+            return func(*args)
+        return await self._off_loop(func, *args)
+
+    def _start(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._transport = AsyncHTTPTransport()
+            self._slot_freed = asyncio.Event()
+
+    def close(self):
+        """Close the idle connections; the next call opens new ones."""
+        if self._transport is not None:
+            self._transport.close()
+        self._semaphore = self._transport = self._slot_freed = None
+
+    async def _acquire_slot(self):
+        """Wait for a slot of the client's adaptive limiter without blocking the event loop."""
+        limiter = self.client.limiter
+        while True:
+            slot = limiter.acquire(blocking=False)
+            if slot is not None:
+                return slot
+            # Calls on this loop set the event when they finish; threads sharing the limiter are polled
+            self._slot_freed.clear()
+            try:
+                await asyncio.wait_for(self._slot_freed.wait(), LIMITER_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fetch(self, url, data, method, headers):
+        """Send one authenticated call; returns (response, info) as the core transports do."""
+        client = self.client
+        headers = dict(client._auth_headers(headers), **{'Accept-Encoding': ACCEPT_ENCODING})
+        async with self._semaphore:
+            try:
+                result = await self._transport.request(method, url, headers=headers, body=data,
+                                                       timeout=client._attempt_timeout())
+            except (OSError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                client._count_bytes(0, 0, responses=1)
+                return None, {'status': -1, 'msg': 'Request failed: {0}'.format(e), 'url': url}
+
+        encoding = content_encoding(result.headers)
+        wire = len(result.body)
+        result.body = decode_body(result.body, encoding if is_supported(encoding) else 'identity')
+        client._count_bytes(wire, len(result.body), responses=1)
+
+        info = dict(result.headers, status=result.status, msg='OK', url=url)
+        if result.status < 400:
+            return result, info
+        info.update(msg='HTTP Error {0}: {1}'.format(result.status, result.reason), body=result.body)
+        return None, info
+
+    async def _fetch_authorized(self, url, data, method, headers):
+        """Async form of SDPCoreClient._fetch_authorized(): refresh the token once on 401, feed the limiter."""
+        client = self.client
+        client.check_deadline()
+        limiter = client.limiter
+        slot = await self._acquire_slot() if limiter is not None else None
+        status_code = -1
+        try:
+            token = client.auth_token
+            response, info = await self._fetch(url, data, method, headers)
+            if info.get('status') == 401 and client._can_refresh():
+                await self._off_loop(client._refresh_auth, token)
+                response, info = await self._fetch(url, data, method, headers)
+            status_code = info.get('status', -1)
+        finally:
+            if limiter is not None:
+                limiter.release(slot, None if status_code == -1 else (status_code == 429 or status_code >= 500))
+                self._slot_freed.set()
+        return response, info
+
+    async def call(self, endpoint, method='GET', data=None, max_retries=3, retry_delay=2):
+        """Make one API call; returns the parsed response and raises SDPAPIError on failure.
+
+        Authentication must have been ensured (client.ensure_auth()) before
+        the event loop started; call_many() does this itself.
+        """
+        client = self.client
+        if self._use_sync():
+            return await self._off_loop(functools.partial(
+                client.call, endpoint, method=method, data=data, max_retries=max_retries, retry_delay=retry_delay))
+
+        self._start()
+        url = "{0}/{1}".format(client.base_url, endpoint)
+        headers = {}
+        payload = None
+        if data:
+            payload = urlencode({'input_data': json.dumps(data)})
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+
+        try:
+            for attempt in range(max_retries + 1):
+                probe = await self._breaker(client._breaker_admit)
+                response, info = await self._fetch_authorized(url, payload, method, headers)
+                status_code = info.get('status', -1)
+                await self._breaker(client._breaker_record, status_code, probe)
+
+                if response is not None:
+                    return client._parse_response(response, info)
+
+                if status_code in client.RETRYABLE_STATUS_CODES and attempt < max_retries:
+                    delay = retry_delay * (2 ** attempt)
+                    await self._breaker(client._breaker_check, delay)
+                    remaining = client.remaining_time()
+                    if remaining is not None and delay >= remaining:
+                        raise DeadlineExceeded(
+                            "Deadline of {0}s would be exceeded retrying {1} after HTTP {2}.".format(
+                                client.deadline, url, status_code),
+                            details=parse_error_info(info, "API Request Failed"))
+                    client.warn(
+                        "Request to {0} returned HTTP {1}, retrying in {2}s (attempt {3}/{4})".format(
+                            url, status_code, delay, attempt + 1, max_retries
+                        )
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+
+                raise SDPAPIError.from_info(info, "API Request Failed")
+        finally:
+            if method != 'GET':
+                await self._off_loop(functools.partial(client.response_cache.invalidate, endpoint,
+                                                       subtree=method != 'POST'))
+
+    async def _call_all(self, calls):
+        async def _run(item):
+            try:
+                return item, await self.call(**item), None
+            except Exception as e:
+                return item, None, e
+
+        try:
+            return await asyncio.gather(*[_run(item) for item in calls])
+        finally:
+            self.close()
+
+    def call_many(self, calls):
+        """Run many API calls concurrently on a private event loop.
+
+        Args:
+            calls: Iterable of dicts of call() keyword arguments
+                   (endpoint, and optionally method, data, max_retries, retry_delay).
+
+        Returns:
+            A list of (call, result, error) tuples in input order, like
+            run_concurrently; error is an exception or None.
+        """
+        calls = list(calls)
+        if not calls:
+            return []
+        self.client.ensure_auth()
+        return asyncio.run(self._call_all(calls))
@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_core import SDPAPIError, has_differences
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.concurrency import (
+    concurrency_argument_spec, run_concurrently, validate_concurrency,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.field_schema import FieldValidationError
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.journal import (
+    journal_argument_spec, open_journal,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.read_helpers import (
+    fetch_records_by_ids, unique_ids,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.udf_utils import is_udf_field
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.write_helpers import (
+    build_payload, construct_payload, prevalidate_payload,
+)
+
+
+# Statuses meaning the record does not exist: HTTP 404 for a single record, 4007 in the
+# per-record response_status of a multi-id call
+NOT_FOUND_STATUS_CODES = (404, 4007)
+
+
+def bulk_argument_spec():
+    """Return the argument spec shared by the multi-id forms of the write modules."""
+    spec = dict(
+        skip_existence_check=dict(type='bool', default=False),
+    )
+    spec.update(concurrency_argument_spec())
+    spec.update(journal_argument_spec())
+    return spec
+
+
+def _key_text(value):
+    """Normalise a key value (scalar or API value dict) to a comparable string."""
+    if isinstance(value, dict):
+        for attr in ('name', 'email_id', 'value'):
+            if value.get(attr) is not None:
+                value = value[attr]
+                break
+        else:
+            return None
+    if value is None or value == '':
+        return None
+    return str(value)
+
+
+def record_key_value(record, key_field):
+    """Return the external key of an API record as a string, or None if unset."""
+    if is_udf_field(key_field):
+        return _key_text((record.get('udf_fields') or {}).get(key_field.lower()))
+    return _key_text(record.get(key_field))
+
+
+def build_keyed_payloads(module, client, records, key_field):
+    """Build the API payload for every desired record, keyed by its external key.
+
+    Every record is validated before anything is sent; all problems are
+    reported together in a single failure.
+
+    Returns:
+        A list of (key, payload) tuples in input order.
+    """
+    entity = module.params['parent_module_name']
+    desired = []
+    seen = set()
+    errors = []
+
+    for index, record in enumerate(records):
+        key = _key_text(record.get(key_field))
+        if key is None:
+            errors.append("records[{0}]: missing value for key field '{1}'.".format(index, key_field))
+            continue
+        if key in seen:
+            errors.append("records[{0}]: duplicate key '{1}'.".format(index, key))
+            continue
+        seen.add(key)
+        try:
+            desired.append((key, build_payload(module, client, record)))
+        except FieldValidationError as e:
+            errors.append("records[{0}] (key '{1}'): {2}".format(index, key, e))
+
+    if errors:
+        module.fail_json(msg="Invalid records for {0}: {1}".format(entity, '; '.join(errors)), errors=errors)
+
+    return desired
+
+
+def required_fields_for(desired, entity, key_field):
+    """Return the list_info 'fields_required' needed to diff the desired payloads."""
+    fields = set(['id'])
+    for _key, data in desired:
+        for name, value in data.get(entity, {}).items():
+            if name == 'udf_fields':
+                fields.update('udf_fields.{0}'.format(udf) for udf in value)
+            else:
+                fields.add(name)
+    if is_udf_field(key_field):
+        fields.add('udf_fields.{0}'.format(key_field.lower()))
+    else:
+        fields.add(key_field)
+    return sorted(fields)
+
+
+def index_records_by_key(module, client, entity_config, key_field, list_info):
+    """Build the key -> record index from one paged scan of the entity list.
+
+    Records without a key value are ignored. When several records share a
+    key, the first one wins and a warning is emitted.
+    """
+    endpoint = entity_config['endpoint']
+    index = {}
+    duplicates = set()
+
+    for record in client.iter_records(endpoint, endpoint, list_info, prefetch=client.prefetch_depth):
+        key = record_key_value(record, key_field)
+        if key is None:
+            continue
+        if key in index:
+            duplicates.add(key)
+            continue
+        index[key] = record
+
+    if duplicates:
+        module.warn("Several {0} records share the key values {1}; only the first of each is reconciled.".format(
+            endpoint, sorted(duplicates)))
+
+    return index
+
+
+def plan_reconcile(entity, entity_config, desired, current_index, delete_missing=False):
+    """Work out the creates, updates and deletes that bring the portal to the desired set.
+
+    Args:
+        entity: Entity name (e.g., 'request').
+        entity_config: Dict from MODULE_CONFIG for this entity.
+        desired: List of (key, payload) tuples from build_keyed_payloads.
+        current_index: Dict of key -> current API record.
+        delete_missing: Also delete indexed records whose key is not desired.
+
+    Returns:
+        A (operations, unchanged) tuple. Operations are dicts with keys
+        action, key, id, method, endpoint and data; unchanged is a list of
+        {'key', 'id'} dicts.
+    """
+    endpoint = entity_config['endpoint']
+    operations = []
+    unchanged = []
+
+    for key, data in desired:
+        current = current_index.get(key)
+        if current is None:
+            operations.append(dict(action='create', key=key, id=None, method='POST', endpoint=endpoint, data=data))
+        elif has_differences(data, current, entity):
+            record_id = current.get('id')
+            operations.append(dict(action='update', key=key, id=record_id, method='PUT',
+                                   endpoint='{0}/{1}'.format(endpoint, record_id), data=data))
+        else:
+            unchanged.append(dict(key=key, id=current.get('id')))
+
+    if delete_missing:
+        desired_keys = set(key for key, _data in desired)
+        for key, current in current_index.items():
+            if key not in desired_keys:
+                record_id = current.get('id')
+                operations.append(dict(action='delete', key=key, id=record_id, method='DELETE',
+                                       endpoint='{0}/{1}'.format(endpoint, record_id), data=None))
+
+    return operations, unchanged
+
+
+def apply_operations(client, operations, max_workers, journal=None, resume=False):
+    """Send planned operations on a bounded worker pool.
+
+    With a WriteJournal, every operation is journaled before it is sent and
+    its outcome after; with resume, operations the interrupted run already
+    settled are reported from the journal instead of being sent again.
+
+    Returns:
+        A list of (operation, response, error) in the order of operations.
+    """
+    if not operations:
+        return []
+
+    planned = operations
+    settled = []
+    if journal is not None:
+        operations, settled = journal.begin(planned, resume)
+
+    # Authenticate once up front so workers never need to fail the module
+    if operations:
+        client.ensure_auth()
+
+    def _apply(operation):
+        try:
+            response = client.call(operation['endpoint'], method=operation['method'], data=operation.get('data'))
+        except Exception as e:
+            if journal is not None:
+                journal.record(operation, None, e)
+            raise
+        if journal is not None:
+            journal.record(operation, response, None)
+        return response
+
+    try:
+        results = run_concurrently(_apply, operations, max_workers)
+    finally:
+        if journal is not None:
+            journal.close()
+
+    if not settled:
+        return results
+    order = dict((id(operation), index) for index, operation in enumerate(planned))
+    return sorted(settled + results, key=lambda result: order[id(result[0])])
+
+
+def summarize_operations(entity, results):
+    """Group operation results into per-action lists plus a 'failed' list."""
+    summary = dict(created=[], updated=[], deleted=[], failed=[])
+    action_keys = dict(create='created', update='updated', delete='deleted')
+
+    for operation, response, error in results:
+        entry = dict(key=operation.get('key'), id=operation.get('id'))
+        if error is not None:
+            entry.update(action=operation['action'], msg=str(error), status=getattr(error, 'status', None))
+            summary['failed'].append(entry)
+            continue
+        if operation['action'] == 'create':
+            entry['id'] = ((response or {}).get(entity) or {}).get('id')
+        summary[action_keys[operation['action']]].append(entry)
+
+    return summary
+
+
+def _batch_statuses(response):
+    """Map record id -> per-record response_status of a multi-id API response."""
+    statuses = (response or {}).get('response_status')
+    if not isinstance(statuses, list):
+        return {}
+    return dict((str(status['id']), status) for status in statuses
+                if isinstance(status, dict) and status.get('id') is not None)
+
+
+def _status_message(status):
+    messages = status.get('messages') or [{}]
+    return messages[0].get('message') or status.get('status') or 'API Error'
+
+
+def bulk_delete(module, client, entity, ids, max_workers, skip_existence_check=False):
+    """Delete many records of one entity.
+
+    Unless skip_existence_check is set, existing ids are resolved first with
+    fetch_records_by_ids so that only those are deleted. Entities with a
+    'bulk_delete_batch_size' delete ids in multi-id batches; ids of a batch
+    the API rejects or does not confirm with a per-record status, and ids of
+    every other entity, are deleted one by one on a bounded worker pool. A
+    not-found status, in a batch or on a single delete, counts as already
+    absent.
+
+    Returns:
+        A dict with 'deleted' and 'already_absent' id lists and a 'failed'
+        list of {'id', 'msg', 'status'} dicts, all in input order.
+    """
+    entity_config = MODULE_CONFIG[entity]
+    endpoint = entity_config['endpoint']
+    ids = unique_ids(ids)
+
+    absent = []
+    if skip_existence_check:
+        targets = ids
+    else:
+        records, absent = fetch_records_by_ids(module, client, entity, ids, max_workers)
+        targets = list(records)
+
+    if module.check_mode or not targets:
+        return dict(deleted=targets, already_absent=absent, failed=[])
+
+    # Authenticate once up front so workers never need to fail the module
+    client.ensure_auth()
+
+    deleted = set()
+    absent = set(absent)
+    failed = {}
+    remaining = targets
+
+    batch_size = entity_config.get('bulk_delete_batch_size')
+    if batch_size and len(targets) > 1:
+        def _delete_batch(batch):
+            return client.call('{0}?ids={1}'.format(endpoint, ','.join(batch)), method='DELETE')
+
+        remaining = []
+        batches = [targets[start:start + batch_size] for start in range(0, len(targets), batch_size)]
+        for batch, response, error in run_concurrently(_delete_batch, batches, max_workers):
+            if error is not None:
+                remaining.extend(batch)
+                continue
+            statuses = _batch_statuses(response)
+            for record_id in batch:
+                status_code = statuses.get(record_id, {}).get('status_code')
+                if status_code is None:
+                    # Unconfirmed; a single delete tells whether the record is gone
+                    remaining.append(record_id)
+                elif status_code in NOT_FOUND_STATUS_CODES:
+                    absent.add(record_id)
+                elif status_code >= 4000:
+                    failed[record_id] = dict(id=record_id, msg=_status_message(statuses[record_id]), status=status_code)
+                else:
+                    deleted.add(record_id)
+
+    def _delete_one(record_id):
+        return client.call('{0}/{1}'.format(endpoint, record_id), method='DELETE')
+
+    for record_id, _response, error in run_concurrently(_delete_one, remaining, max_workers):
+        if error is None:
+            deleted.add(record_id)
+        elif isinstance(error, SDPAPIError) and error.status in NOT_FOUND_STATUS_CODES:
+            absent.add(record_id)
+        else:
+            failed[record_id] = dict(id=record_id, msg=str(error), status=getattr(error, 'status', None))
+
+    return dict(
+        deleted=[record_id for record_id in ids if record_id in deleted],
+        already_absent=[record_id for record_id in ids if record_id in absent],
+        failed=[failed[record_id] for record_id in ids if record_id in failed],
+    )
+
+
+def handle_bulk_absent(module, client, ids):
+    """Handle state=absent for a list of ids and exit the module.
+
+    Fails the module, with the full per-id result, if any delete failed.
+    """
+    entity = module.params['parent_module_name']
+    result = bulk_delete(module, client, entity, ids, validate_concurrency(module),
+                         module.params.get('skip_existence_check'))
+    changed = bool(result['deleted'])
+
+    if result['failed']:
+        module.fail_json(msg="{0} of {1} deletes failed.".format(len(result['failed']), len(unique_ids(ids))),
+                         changed=changed, **result)
+
+    module.exit_json(changed=changed, **result)
+
+
+def bulk_update(module, client, entity, ids, data, max_workers, skip_existence_check=False, journal=None):
+    """Apply one constructed payload to many records of one entity.
+
+    Unless skip_existence_check is set, the current records are fetched in
+    bulk with fetch_records_by_ids and only those that differ from the
+    payload are updated. Updates run on a bounded worker pool; a 404 on an
+    update counts as missing.
+
+    Returns:
+        A dict with 'updated', 'unchanged' and 'missing' id lists and a
+        'failed' list of {'id', 'msg', 'status'} dicts, all in input order.
+    """
+    entity_config = MODULE_CONFIG[entity]
+    ids = unique_ids(ids)
+
+    missing = []
+    if skip_existence_check:
+        operations = [dict(action='update', key=record_id, id=record_id, method='PUT',
+                           endpoint='{0}/{1}'.format(entity_config['endpoint'], record_id), data=data)
+                      for record_id in ids]
+        unchanged = []
+    else:
+        current, missing = fetch_records_by_ids(module, client, entity, ids, max_workers,
+                                                fields_required=required_fields_for([(None, data)], entity, 'id'))
+        operations, unchanged = plan_reconcile(entity, entity_config, [(record_id, data) for record_id in current], current)
+
+    result = dict(updated=[op['id'] for op in operations], unchanged=[entry['id'] for entry in unchanged],
+                  missing=missing, failed=[])
+    if module.check_mode or not operations:
+        return result
+
+    results = apply_operations(client, operations, max_workers, journal, module.params.get('resume'))
+    summary = summarize_operations(entity, results)
+    updated = set(entry['id'] for entry in summary['updated'])
+    missing = set(missing)
+    failed = {}
+    for entry in summary['failed']:
+        if entry['status'] in NOT_FOUND_STATUS_CODES:
+            missing.add(entry['id'])
+        else:
+            failed[entry['id']] = dict(id=entry['id'], msg=entry['msg'], status=entry['status'])
+
+    result.update(
+        updated=[record_id for record_id in ids if record_id in updated],
+        missing=[record_id for record_id in ids if record_id in missing],
+        failed=[failed[record_id] for record_id in ids if record_id in failed],
+    )
+    return result
+
+
+def handle_bulk_present(module, client, ids):
+    """Handle state=present for a list of ids and a shared payload, and exit the module.
+
+    The payload is constructed and pre-validated once for all records. Fails
+    the module, with the full per-id result, if any update failed.
+    """
+    entity = module.params['parent_module_name']
+    if not module.params.get('payload'):
+        module.fail_json(msg="payload is required when updating a list of IDs.")
+
+    data = construct_payload(module, client)
+    data = prevalidate_payload(module, client, data)
+
+    result = bulk_update(module, client, entity, ids, data, validate_concurrency(module),
+                         module.params.get('skip_existence_check'), open_journal(module, entity))
+    changed = bool(result['updated'])
+
+    if result['failed']:
+        module.fail_json(msg="{0} of {1} updates failed.".format(
+            len(result['failed']), len(result['updated']) + len(result['failed'])), changed=changed, **result)
+
+    module.exit_json(changed=changed, **result)
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import json
+import os
+import threading
+import time
+
+try:
+    import urllib.parse as urllib_parse
+except ImportError:
+    import urllib
+    urllib_parse = urllib
+
+
+# Environment variables that turn on record/replay for every SDPClient
+ENV_CASSETTE = 'SDP_CLOUD_CASSETTE'
+ENV_CASSETTE_MODE = 'SDP_CLOUD_CASSETTE_MODE'
+ENV_CASSETTE_LATENCY = 'SDP_CLOUD_CASSETTE_REPLAY_LATENCY'
+
+CASSETTE_MODES = ('record', 'replay')
+
+# Keys whose values are never written to a cassette file
+SECRET_KEYS = frozenset([
+    'access_token', 'refresh_token', 'client_id', 'client_secret',
+    'auth_token', 'id_token', 'password',
+])
+
+REDACTED = '**REDACTED**'
+
+
+def redact(value):
+    """Recursively replace secret values in dicts/lists with a placeholder."""
+    if isinstance(value, dict):
+        return {k: (REDACTED if k in SECRET_KEYS else redact(v)) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def _decode_form(data):
+    """Decode an urlencoded request body into a redacted dict.
+
+    The SDP API sends its payload as a JSON document in the 'input_data'
+    form field, which is decoded so cassettes stay readable and diffable.
+    """
+    if not data:
+        return None
+    if isinstance(data, bytes):
+        data = data.decode('utf-8', errors='replace')
+    form = dict(urllib_parse.parse_qsl(data, keep_blank_values=True))
+    if 'input_data' in form:
+        try:
+            form['input_data'] = json.loads(form['input_data'])
+        except ValueError:
+            pass
+    return redact(form)
+
+
+def _redact_body(body):
+    """Redact secrets from a JSON response body; non-JSON bodies pass through."""
+    if not body:
+        return body
+    try:
+        parsed = json.loads(body)
+    except ValueError:
+        return body
+    return json.dumps(redact(parsed))
+
+
+def _to_text(body):
+    if isinstance(body, bytes):
+        return body.decode('utf-8', errors='replace')
+    return body or ''
+
+
+def interaction_key(method, url, data):
+    """Return the key used to match a live call against recorded interactions."""
+    return (method.upper(), url, json.dumps(_decode_form(data), sort_keys=True))
+
+
+class CassetteResponse:
+    """Replayed HTTP response exposing the read() interface of fetch_url responses."""
+
+    def __init__(self, body, status=200):
+        self._stream = io.BytesIO(body.encode('utf-8') if isinstance(body, str) else body)
+        self.status = status
+        self.code = status
+
+    def read(self, size=-1):
+        return self._stream.read(size)
+
+    def close(self):
+        self._stream.close()
+
+
+class Cassette:
+    """Record every HTTP interaction to a JSON Lines file, or replay them offline.
+
+    In record mode each call is forwarded to the real transport and the
+    redacted request/response pair is appended to the file as soon as it
+    completes, so a crashed run still leaves a usable cassette behind.
+    In replay mode no network calls are made: interactions are matched by
+    method, URL and redacted request body, and served in recorded order.
+    """
+
+    def __init__(self, path, mode='replay', replay_latency=False):
+        if mode not in CASSETTE_MODES:
+            raise ValueError("Invalid cassette mode '{0}'. Allowed modes: {1}".format(mode, list(CASSETTE_MODES)))
+        self.path = path
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self._lock = threading.Lock()
+        self._interactions = {}
+        if mode == 'replay':
+            self._load()
+
+    @classmethod
+    def from_env(cls):
+        """Build a Cassette from SDP_CLOUD_CASSETTE* env vars, or return None when unset."""
+        path = os.environ.get(ENV_CASSETTE)
+        if not path:
+            return None
+        mode = os.environ.get(ENV_CASSETTE_MODE, 'replay').lower()
+        latency = os.environ.get(ENV_CASSETTE_LATENCY, '').lower() in ('1', 'true', 'yes')
+        return cls(os.path.expanduser(path), mode=mode, replay_latency=latency)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            raise ValueError("Cassette file '{0}' not found for replay.".format(self.path))
+        with open(self.path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                key = (entry['method'], entry['url'], json.dumps(entry.get('request'), sort_keys=True))
+                self._interactions.setdefault(key, []).append(entry)
+
+    def fetch(self, module, fetch_fn, url, data=None, method='GET', headers=None, **kwargs):
+        """Drop-in replacement for fetch_url that records or replays the call."""
+        if self.mode == 'replay':
+            return self._replay(module, url, data, method)
+        return self._record(module, fetch_fn, url, data, method, headers, **kwargs)
+
+    def _record(self, module, fetch_fn, url, data, method, headers, **kwargs):
+        started = time.time()
+        response, info = fetch_fn(module, url, data=data, method=method, headers=headers, **kwargs)
+        elapsed = time.time() - started
+
+        status = info.get('status', -1)
+        if response:
+            body = response.read()
+            replayed = CassetteResponse(body, status)
+        else:
+            body = info.get('body')
+            replayed = None
+
+        entry = {
+            'method': method.upper(),
+            'url': url,
+            'request': _decode_form(data),
+            'status': status,
+            'msg': info.get('msg', ''),
+            'has_response': response is not None,
+            'body': _redact_body(_to_text(body)),
+            'elapsed': round(elapsed, 4),
+        }
+        line = json.dumps(entry) + '\n'
+        with self._lock:
+            with open(self.path, 'a') as f:
+                f.write(line)
+
+        # The live body has been consumed, so hand back a re-readable copy
+        return replayed, info
+
+    def _replay(self, module, url, data, method):
+        key = interaction_key(method, url, data)
+        with self._lock:
+            queue = self._interactions.get(key)
+            if not queue:
+                msg = "No recorded interaction for {0} {1} in cassette '{2}'.".format(method.upper(), url, self.path)
+                # Callers without a module (sdp_core.SDPCoreClient) get an exception instead
+                if module is None:
+                    raise LookupError(msg)
+                module.fail_json(msg=msg)
+            # Serve in recorded order; the last entry repeats for polling loops
+            entry = queue.pop(0) if len(queue) > 1 else queue[0]
+
+        if self.replay_latency and entry.get('elapsed'):
+            time.sleep(entry['elapsed'])
+
+        info = {'status': entry['status'], 'msg': entry.get('msg', ''), 'url': url}
+        if not entry.get('has_response'):
+            info['body'] = entry.get('body', '')
+            return None, info
+        return CassetteResponse(entry.get('body', ''), entry['status']), info
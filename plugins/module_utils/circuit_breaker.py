@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import atexit
+import os
+import threading
+import time
+import weakref
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.local_cache import (
+    cache_key, get_cache_dir, load_json, update_json,
+)
+
+
+# Environment variables configuring the breaker; it is off unless SDP_CLOUD_CIRCUIT_BREAKER is true
+ENV_BREAKER = 'SDP_CLOUD_CIRCUIT_BREAKER'
+ENV_FAILURE_RATE = 'SDP_CLOUD_BREAKER_FAILURE_RATE'
+ENV_MIN_CALLS = 'SDP_CLOUD_BREAKER_MIN_CALLS'
+ENV_WINDOW = 'SDP_CLOUD_BREAKER_WINDOW'
+ENV_COOLDOWN = 'SDP_CLOUD_BREAKER_COOLDOWN'
+
+DEFAULT_FAILURE_RATE = 0.5
+DEFAULT_MIN_CALLS = 10
+DEFAULT_WINDOW = 60
+DEFAULT_COOLDOWN = 30
+
+# Successes of a closed breaker are written to the shared file after this many calls, and at exit
+FLUSH_EVERY = 50
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+# Breakers flushed at exit; held weakly so clients dropped before then are freed
+_BREAKERS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    for breaker in list(_BREAKERS):
+        breaker.flush()
+
+
+class CircuitOpenError(Exception):
+    """Raised by CircuitBreaker.before_call() while calls must fail fast."""
+
+    def __init__(self, key, retry_in):
+        super(CircuitOpenError, self).__init__(
+            "Circuit breaker for {0} is open after repeated failures; failing fast. "
+            "Next probe in {1}s.".format(key, int(retry_in) + 1))
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker whose state is shared by every process on the host.
+
+    The state of one key (the portal's base URL) lives in a small JSON file
+    in the cache directory, read and updated under an exclusive flock, so
+    all forks of a play see the same breaker.
+
+    closed: calls go through; outcomes are counted in a fixed window of
+            'window' seconds. Once at least 'min_calls' calls were made and
+            the share of failures reaches 'failure_rate', the breaker opens.
+    open: calls fail fast for 'cooldown' seconds.
+    half_open: one probe call at a time is let through (a probe that never
+               reports back expires after another cool-down). A successful
+               probe closes the breaker; a failed one opens it again. Calls
+               admitted before the breaker opened may still report back;
+               their outcomes are ignored.
+
+    Successes of a closed breaker are counted in memory and written every
+    FLUSH_EVERY calls, and at exit. Failures, probes, calls once the window
+    has rolled over and successes that could complete a trip are written
+    at once, so the file is locked about once per FLUSH_EVERY healthy calls.
+    """
+
+    def __init__(self, key, failure_rate=DEFAULT_FAILURE_RATE, min_calls=DEFAULT_MIN_CALLS,
+                 window=DEFAULT_WINDOW, cooldown=DEFAULT_COOLDOWN, directory=None):
+        self.key = key
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.cooldown = cooldown
+        directory = directory or get_cache_dir('circuit_breaker')
+        self.path = os.path.join(directory, '{0}.json'.format(cache_key(key)))
+        self._lock = threading.Lock()
+        self._seen = {}
+        self._pending = 0
+        _BREAKERS.add(self)
+
+    @classmethod
+    def from_env(cls, key):
+        """Build a CircuitBreaker from SDP_CLOUD_* env vars, or return None when disabled.
+
+        Raises:
+            ValueError: If a setting is not a number.
+        """
+        if os.environ.get(ENV_BREAKER, '').lower() not in ('1', 'true', 'yes'):
+            return None
+        return cls(
+            key,
+            failure_rate=float(os.environ.get(ENV_FAILURE_RATE, DEFAULT_FAILURE_RATE)),
+            min_calls=int(os.environ.get(ENV_MIN_CALLS, DEFAULT_MIN_CALLS)),
+            window=float(os.environ.get(ENV_WINDOW, DEFAULT_WINDOW)),
+            cooldown=float(os.environ.get(ENV_COOLDOWN, DEFAULT_COOLDOWN)),
+        )
+
+    def _update(self, change):
+        """Apply change(state, now) to the shared state under an exclusive lock."""
+        def _change(state):
+            state.setdefault('state', CLOSED)
+            return change(state, time.time())
+
+        return update_json(self.path, _change)
+
+    def state(self):
+        """Return the current state name (closed, open or half_open)."""
+        return (load_json(self.path) or {}).get('state', CLOSED)
+
+    def before_call(self):
+        """Admit a call, or raise CircuitOpenError while it must fail fast.
+
+        Returns:
+            True if the call is a half-open probe.
+        """
+        # Closed is the common case; the state file is replaced atomically, so no lock is needed to see it
+        seen = load_json(self.path) or {}
+        with self._lock:
+            self._seen = seen
+        if seen.get('state', CLOSED) == CLOSED:
+            return False
+
+        def _admit(state, now):
+            if state['state'] == CLOSED:
+                return False
+            if state['state'] == OPEN:
+                remaining = state['opened_at'] + self.cooldown - now
+                if remaining > 0:
+                    raise CircuitOpenError(self.key, remaining)
+                state['state'] = HALF_OPEN
+                state['probe_until'] = 0
+            if state.get('probe_until', 0) > now:
+                raise CircuitOpenError(self.key, state['probe_until'] - now)
+            state['probe_until'] = now + self.cooldown
+            return True
+
+        return self._update(_admit)
+
+    def check(self, within=0):
+        """Raise CircuitOpenError if a call made 'within' seconds from now would still fail fast.
+
+        Read-only: a caller about to back off and retry can give up before
+        sleeping instead of finding the breaker open after the sleep.
+        """
+        state = load_json(self.path) or {}
+        if state.get('state') == OPEN:
+            until = state['opened_at'] + self.cooldown
+        elif state.get('state') == HALF_OPEN:
+            until = state.get('probe_until', 0)
+        else:
+            return
+        now = time.time()
+        if until > now + within:
+            raise CircuitOpenError(self.key, until - now)
+
+    def record(self, success, probe=False):
+        """Record the outcome of an admitted call.
+
+        probe is what before_call() returned when the call was admitted.
+        """
+        with self._lock:
+            if success and not probe and self._pending + 1 < FLUSH_EVERY and self._can_defer(time.time()):
+                self._pending += 1
+                return
+        self._write(success, probe)
+
+    def flush(self):
+        """Write the successes counted in memory to the shared file."""
+        with self._lock:
+            if not self._pending:
+                return
+        try:
+            self._write(None)
+        except (IOError, OSError):
+            pass
+
+    def _can_defer(self, now):
+        """Return True if one more success can wait in memory without missing a trip. Caller holds _lock."""
+        seen = self._seen
+        if seen.get('state') != CLOSED or now - seen.get('window_start', 0) > self.window:
+            return False
+        # A success can only complete a trip by bringing the window to min_calls while failures are high
+        calls = seen.get('calls', 0) + self._pending + 1
+        return calls < self.min_calls or seen.get('failures', 0) < self.failure_rate * calls
+
+    def _write(self, success, probe=False):
+        """Add the pending successes and one outcome (None for none) to the shared state."""
+        with self._lock:
+            pending, self._pending = self._pending, 0
+
+        def _record(state, now):
+            # Only the probe's outcome matters until the breaker closes again
+            if state['state'] == OPEN:
+                return dict(state)
+            if state['state'] == HALF_OPEN:
+                if probe and success is not None:
+                    if success:
+                        state.clear()
+                        state['state'] = CLOSED
+                    else:
+                        self._open(state, now)
+                return dict(state)
+
+            if now - state.get('window_start', 0) > self.window:
+                # Pending successes belong to the window that just ended
+                state.update(window_start=now, calls=0, failures=0)
+            else:
+                state['calls'] += pending
+            if success is not None:
+                state['calls'] += 1
+                state['failures'] += 0 if success else 1
+            if state['calls'] >= self.min_calls and state['failures'] >= self.failure_rate * state['calls']:
+                self._open(state, now)
+            return dict(state)
+
+        seen = self._update(_record)
+        with self._lock:
+            self._seen = seen
+
+    @staticmethod
+    def _open(state, now):
+        state.clear()
+        state.update(state=OPEN, opened_at=now)
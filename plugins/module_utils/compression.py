@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import zlib
+
+
+# Value of the Accept-Encoding request header sent by the clients
+ACCEPT_ENCODING = 'gzip, deflate'
+
+# Compressed bytes read from the wire per decompression step
+DEFAULT_READ_SIZE = 64 * 1024
+
+
+def content_encoding(headers):
+    """Return the lower-cased Content-Encoding from a fetch_url info dict or a header dict."""
+    return (headers.get('content-encoding') or 'identity').strip().lower()
+
+
+class _Decoder:
+    """Incremental gzip/deflate decoder.
+
+    'deflate' is meant to be zlib-wrapped, but some servers send a raw deflate
+    stream; the first chunk tells which one it is.
+    """
+
+    def __init__(self, encoding):
+        self._encoding = encoding
+        self._zlib = None
+        self._first = b''
+        if encoding in ('gzip', 'x-gzip'):
+            self._zlib = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def decode(self, chunk):
+        if self._zlib is not None:
+            return self._zlib.decompress(chunk)
+        # Wait for the two header bytes before choosing between zlib and raw deflate
+        self._first += chunk
+        if len(self._first) < 2:
+            return b''
+        data, self._first = self._first, b''
+        self._zlib = zlib.decompressobj(zlib.MAX_WBITS)
+        try:
+            return self._zlib.decompress(data)
+        except zlib.error:
+            self._zlib = zlib.decompressobj(-zlib.MAX_WBITS)
+            return self._zlib.decompress(data)
+
+    def flush(self):
+        if self._zlib is None:
+            return self.decode(b'') if self._first else b''
+        return self._zlib.flush()
+
+
+def is_supported(encoding):
+    """Return True if the Content-Encoding can be decoded (or needs no decoding)."""
+    return encoding in ('identity', 'gzip', 'x-gzip', 'deflate')
+
+
+def decode_body(body, encoding):
+    """Decode a complete response body; str bodies (already decoded) and corrupt bodies pass through."""
+    if not body or not isinstance(body, bytes) or encoding == 'identity' or not is_supported(encoding):
+        return body
+    decoder = _Decoder(encoding)
+    try:
+        return decoder.decode(body) + decoder.flush()
+    except zlib.error:
+        return body
+
+
+class DecodingResponse:
+    """Read-side wrapper that decompresses a response as it is read.
+
+    Exposes read(size) like the objects fetch_url returns, so the JSON
+    decoders read decompressed bytes without knowing about the encoding.
+    Only about one compressed chunk and its decompressed output are held
+    in memory at a time. on_read(wire_bytes, decoded_bytes) is called
+    for every chunk read from the underlying response.
+    """
+
+    def __init__(self, response, encoding, on_read=None, read_size=DEFAULT_READ_SIZE):
+        self._response = response
+        self._on_read = on_read
+        self._read_size = read_size
+        self._decoder = _Decoder(encoding) if encoding != 'identity' else None
+        self._pending = b''
+        self._eof = False
+        self.status = getattr(response, 'status', None)
+        self.code = getattr(response, 'code', self.status)
+
+    def _count(self, wire, decoded):
+        if self._on_read is not None and (wire or decoded):
+            self._on_read(wire, decoded)
+
+    def _fill(self):
+        chunk = self._response.read(self._read_size)
+        try:
+            if not chunk:
+                self._eof = True
+                data = self._decoder.flush()
+            else:
+                data = self._decoder.decode(chunk)
+        except zlib.error as e:
+            raise IOError("Corrupt compressed response: {0}".format(e))
+        self._count(len(chunk or b''), len(data))
+        self._pending += data
+
+    def read(self, size=-1):
+        if self._decoder is None:
+            data = self._response.read() if size is None or size < 0 else self._response.read(size)
+            self._count(len(data or b''), len(data or b''))
+            return data
+
+        if size is None or size < 0:
+            while not self._eof:
+                self._fill()
+            data, self._pending = self._pending, b''
+            return data
+
+        while len(self._pending) < size and not self._eof:
+            self._fill()
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def close(self):
+        close = getattr(self._response, 'close', None)
+        if close is not None:
+            close()
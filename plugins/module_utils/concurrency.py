@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = 32
+
+# Consecutive successful calls after which the adaptive limit grows by one
+DEFAULT_INCREASE_AFTER = 10
+
+
+def concurrency_argument_spec():
+    """Return the argument spec for the bounded worker pool used by bulk operations."""
+    return dict(
+        concurrency=dict(type='int', default=DEFAULT_CONCURRENCY),
+        adaptive_concurrency=dict(type='bool', default=False),
+    )
+
+
+def validate_concurrency(module):
+    """Fail the module unless 'concurrency' is within 1..MAX_CONCURRENCY.
+
+    Returns:
+        The number of worker threads to use. With 'adaptive_concurrency' this
+        is MAX_CONCURRENCY; the client's AdaptiveLimiter decides how many of
+        them may call the API at once.
+    """
+    concurrency = module.params.get('concurrency') or DEFAULT_CONCURRENCY
+    if not (1 <= concurrency <= MAX_CONCURRENCY):
+        module.fail_json(msg="concurrency must be between 1 and {0}.".format(MAX_CONCURRENCY))
+    if module.params.get('adaptive_concurrency'):
+        return MAX_CONCURRENCY
+    return concurrency
+
+
+class AdaptiveLimiter:
+    """Limit on concurrent API calls that follows an AIMD policy.
+
+    The limit starts at 'initial', grows by one after 'increase_after'
+    consecutive successful calls (additive increase) and is halved when a
+    call is throttled (HTTP 429) or the server fails (5xx) (multiplicative
+    decrease), staying within minimum..maximum. Calls that were already in
+    flight when the limit was halved do not halve it again, so one burst of
+    429s counts as a single congestion signal. Transport errors leave the
+    limit unchanged.
+    """
+
+    def __init__(self, initial=DEFAULT_CONCURRENCY, maximum=MAX_CONCURRENCY, minimum=1,
+                 increase_after=DEFAULT_INCREASE_AFTER):
+        self.limit = max(minimum, min(initial, maximum))
+        self.maximum = maximum
+        self.minimum = minimum
+        self.increase_after = increase_after
+        self.peak = self.limit
+        self.lowest = self.limit
+        self.throttle_events = 0
+        self._in_flight = 0
+        self._streak = 0
+        self._epoch = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, blocking=True, timeout=None):
+        """Block until a call may start; returns a token to pass to release().
+
+        With blocking=False, returns None at once instead of waiting; with a
+        timeout, returns None once timeout seconds passed without a free slot.
+        """
+        expires_at = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while self._in_flight >= self.limit:
+                remaining = None if expires_at is None else expires_at - time.time()
+                if not blocking or (remaining is not None and remaining <= 0):
+                    return None
+                self._cond.wait(remaining)
+            self._in_flight += 1
+            return self._epoch
+
+    def release(self, token, throttled=None):
+        """End a call started with acquire().
+
+        Args:
+            token: The value returned by acquire().
+            throttled: True for 429/5xx, False for any other answer, None when
+                       the call got no answer at all.
+        """
+        with self._cond:
+            self._in_flight -= 1
+            if throttled:
+                self.throttle_events += 1
+                self._streak = 0
+                if token == self._epoch:
+                    self._epoch += 1
+                    self.limit = max(self.minimum, self.limit // 2)
+                    self.lowest = min(self.lowest, self.limit)
+            elif throttled is False:
+                self._streak += 1
+                if self._streak >= self.increase_after and self.limit < self.maximum:
+                    self._streak = 0
+                    self.limit += 1
+                    self.peak = max(self.peak, self.limit)
+            self._cond.notify_all()
+
+    def stats(self):
+        """Return the current limit, its range over the run, and the number of throttled calls."""
+        with self._cond:
+            return dict(concurrency=self.limit, peak_concurrency=self.peak,
+                        lowest_concurrency=self.lowest, throttle_events=self.throttle_events)
+
+
+def adaptive_limiter(module):
+    """Return the AdaptiveLimiter configured by 'adaptive_concurrency', or None."""
+    if not module.params.get('adaptive_concurrency'):
+        return None
+    return AdaptiveLimiter(initial=module.params.get('concurrency') or DEFAULT_CONCURRENCY)
+
+
+def run_concurrently(func, items, max_workers=DEFAULT_CONCURRENCY):
+    """Apply func to every item on a bounded thread pool.
+
+    Exceptions raised by func are captured per item rather than aborting
+    the batch, so callers can report partial failures.
+
+    Returns:
+        A list of (item, result, error) tuples in input order; error is None
+        on success and result is None on failure.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def _run(item):
+        try:
+            return item, func(item), None
+        except Exception as e:
+            return item, None, e
+
+    if max_workers <= 1 or len(items) == 1:
+        return [_run(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(_run, items))
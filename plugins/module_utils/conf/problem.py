@@ -13,6 +13,15 @@ PROBLEM_CONFIG = {
         'reported_time', 'due_by_time', 'closed_time', 'created_time',
         'id', 'title', 'priority', 'status',
     ],
+    # Lookup field -> list endpoint holding its reference data (used for pre-validation)
+    'reference_endpoints': {
+        'priority': 'priorities',
+        'urgency': 'urgencies',
+        'impact': 'impacts',
+        'site': 'sites',
+        'group': 'groups',
+        'category': 'categories',
+    },
     'supported_system_field_meta': {
         'title': {'type': 'string'},
         'description': {'type': 'string'},
@@ -13,6 +13,19 @@ RELEASE_CONFIG = {
         'created_time', 'completed_time', 'scheduled_start_time',
         'scheduled_end_time', 'id', 'title', 'priority', 'status', 'stage',
     ],
+    # Lookup field -> list endpoint holding its reference data (used for pre-validation)
+    'reference_endpoints': {
+        'priority': 'priorities',
+        'urgency': 'urgencies',
+        'impact': 'impacts',
+        'site': 'sites',
+        'group': 'groups',
+        'category': 'categories',
+        'status': 'release_statuses',
+        'stage': 'release_stages',
+        'release_type': 'release_types',
+        'risk': 'risks',
+    },
     'supported_system_field_meta': {
         'title': {'type': 'string'},
         'description': {'type': 'string'},
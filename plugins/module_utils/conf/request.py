@@ -13,6 +13,20 @@ REQUEST_CONFIG = {
         'created_time', 'due_by_time', 'first_response_due_by_time', 'last_updated_time',
         'scheduled_start_time', 'scheduled_end_time', 'subject', 'id', 'priority', 'status',
     ],
+    # Maximum ids per multi-id delete (DELETE requests?ids=...); entities without it delete one id per call
+    'bulk_delete_batch_size': 100,
+    # Lookup field -> list endpoint holding its reference data (used for pre-validation)
+    'reference_endpoints': {
+        'priority': 'priorities',
+        'urgency': 'urgencies',
+        'impact': 'impacts',
+        'site': 'sites',
+        'group': 'groups',
+        'category': 'categories',
+        'status': 'statuses',
+        'level': 'levels',
+        'mode': 'modes',
+    },
     'supported_system_field_meta': {
         'subject': {'type': 'string'},
         'description': {'type': 'string'},
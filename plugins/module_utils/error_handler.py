@@ -8,9 +8,12 @@ __metaclass__ = type
 import json
 
 
-def handle_error(module, info, default_msg):
+def parse_error_info(info, default_msg):
     """
-    Parses SDP Cloud API error responses and fails the module with a descriptive message.
+    Parses SDP Cloud API error responses into the keyword arguments used to fail a module.
+
+    Returns:
+        A dict with keys: msg, status, error_details.
     """
     error_msg = info.get('msg', default_msg)
     response_body = info.get('body')
@@ -38,4 +41,11 @@ def handle_error(module, info, default_msg):
         except (ValueError, TypeError):
             pass
 
-    module.fail_json(msg=error_msg, status=info.get('status'), error_details=error_details)
+    return dict(msg=error_msg, status=info.get('status'), error_details=error_details)
+
+
+def handle_error(module, info, default_msg):
+    """
+    Parses SDP Cloud API error responses and fails the module with a descriptive message.
+    """
+    module.fail_json(**parse_error_info(info, default_msg))
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.udf_utils import resolve_udf_type
+
+
+class FieldValidationError(ValueError):
+    """Raised when a payload value cannot be converted for its field type."""
+
+
+def _is_valid_email(value):
+    """Return True if value looks like an email (local@domain.tld). Rejects e.g. 'hell@hi'."""
+    if not isinstance(value, str) or not value:
+        return False
+    parts = value.split('@')
+    if len(parts) != 2:
+        return False
+    local, domain = parts
+    if not local or not domain:
+        return False
+    if '.' not in domain:
+        return False
+    return True
+
+
+def _convert_passthrough(field_name, value):
+    return value
+
+
+def _convert_num(field_name, value):
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    raise FieldValidationError(
+        "Numeric field '{0}' requires an integer or decimal value. Got: {1}".format(field_name, value)
+    )
+
+
+def _convert_bool(field_name, value):
+    if isinstance(value, str):
+        return value.lower() == 'true'
+    return bool(value)
+
+
+def _convert_datetime(field_name, value):
+    if not isinstance(value, (int, float)):
+        raise FieldValidationError(
+            "Invalid datetime format for field '{0}'. value must be a timestamp (int/float).".format(field_name)
+        )
+    return {'value': value}
+
+
+def _convert_lookup(field_name, value):
+    return {'name': value}
+
+
+def _convert_user(field_name, value):
+    if not _is_valid_email(value):
+        raise FieldValidationError(
+            "User field '{0}' accepts only a valid email address (e.g. user@example.com). Got: {1}".format(field_name, value)
+        )
+    return {'email_id': value}
+
+
+# Field type -> converter(field_name, value). Unknown types pass values through unchanged.
+FIELD_CONVERTERS = {
+    'string': _convert_passthrough,
+    'num': _convert_num,
+    'bool': _convert_bool,
+    'datetime': _convert_datetime,
+    'lookup': _convert_lookup,
+    'user': _convert_user,
+}
+
+
+def get_converter(ftype):
+    """Return the converter for a field type."""
+    return FIELD_CONVERTERS.get(ftype, _convert_passthrough)
+
+
+class FieldSpec:
+    """Compiled metadata for one payload field."""
+
+    __slots__ = ('name', 'ftype', 'category', 'group_name', 'convert')
+
+    def __init__(self, name, ftype, category, group_name=None):
+        self.name = name
+        self.ftype = ftype
+        self.category = category
+        self.group_name = group_name
+        self.convert = get_converter(ftype)
+
+
+# Compiled UDF definition sets kept per schema (one per portal the process talks to)
+MAX_UDF_SETS = 8
+
+
+class EntitySchema:
+    """Per-entity field schema compiled once from MODULE_CONFIG and UDF metadata.
+
+    System fields map straight to a FieldSpec with its converter and group
+    target, so building a payload is one dict probe plus one call per key.
+    UDF specs are compiled from the '_metainfo' definitions the first time
+    they are needed, once per definition set: clients of different portals
+    in one process share the schema but never each other's UDF specs.
+    Schemas are shared by every thread of the process, so compiling is done
+    under a lock.
+    """
+
+    def __init__(self, module_name, module_config):
+        self.module_name = module_name
+        system_meta = module_config.get('supported_system_field_meta', {})
+        self.system_fields = dict(
+            (name, FieldSpec(name, meta.get('type'), 'system', meta.get('group_name')))
+            for name, meta in system_meta.items()
+        )
+        self.group_targets = frozenset(spec.group_name for spec in self.system_fields.values() if spec.group_name)
+        self.allowed_fields = list(system_meta.keys())
+        self._allowed_fields_text = str(self.allowed_fields)
+        # id(definitions) -> (definitions, compiled specs); the definitions are kept so their id stays unique
+        self._compiled_udfs = {}
+        self._udf_lock = threading.Lock()
+
+    def invalid_field_message(self, field_name):
+        """Return the unknown-field error message from the precomputed allowed-field index."""
+        return "Invalid field '{0}'. Allowed system fields: {1}".format(field_name, self._allowed_fields_text)
+
+    def compile_udfs(self, udf_definitions):
+        """Compile UDF definitions (keyed by lowercase field name) into FieldSpecs.
+
+        Returns:
+            The compiled {lowercase name: FieldSpec} dict of these definitions.
+        """
+        with self._udf_lock:
+            entry = self._compiled_udfs.get(id(udf_definitions))
+            if entry is None or entry[0] is not udf_definitions:
+                if len(self._compiled_udfs) >= MAX_UDF_SETS:
+                    self._compiled_udfs.pop(next(iter(self._compiled_udfs)))
+                entry = (udf_definitions, dict(
+                    (name.lower(), FieldSpec(name, resolve_udf_type(definition), 'udf'))
+                    for name, definition in (udf_definitions or {}).items()
+                ))
+                self._compiled_udfs[id(udf_definitions)] = entry
+            return entry[1]
+
+    def get_udf(self, field_name, udf_definitions):
+        """Return the UDF spec for field_name compiled from udf_definitions, or None if it is not defined."""
+        return self.compile_udfs(udf_definitions).get(field_name.lower())
+
+    def build(self, payload, resolve_unknown):
+        """Convert a flat payload dict into the nested API structure.
+
+        Args:
+            payload: Flat dict of field name to user value.
+            resolve_unknown: Callable(field_name) returning a FieldSpec for
+                fields that are not system fields (UDFs), or None if invalid.
+
+        Raises:
+            FieldValidationError: On unknown fields or unconvertible values.
+        """
+        system_fields = self.system_fields
+        constructed = {}
+        udf_values = {}
+
+        for key, value in payload.items():
+            spec = system_fields.get(key)
+            if spec is None:
+                spec = resolve_unknown(key)
+                if spec is None:
+                    raise FieldValidationError(self.invalid_field_message(key))
+
+            final_value = spec.convert(key, value)
+
+            if spec.category == 'udf':
+                udf_values[key] = final_value
+            elif spec.group_name:
+                constructed.setdefault(spec.group_name, {})[key] = final_value
+            else:
+                constructed[key] = final_value
+
+        if udf_values:
+            constructed['udf_fields'] = udf_values
+
+        return {self.module_name: constructed}
+
+
+# Compiled schemas, one per entity; MODULE_CONFIG is static for the process lifetime
+SCHEMA_CACHE = {}
+_SCHEMA_CACHE_LOCK = threading.Lock()
+
+
+def get_entity_schema(module_name):
+    """Return the compiled EntitySchema for an entity, building it on first use."""
+    schema = SCHEMA_CACHE.get(module_name)
+    if schema is None:
+        with _SCHEMA_CACHE_LOCK:
+            schema = SCHEMA_CACHE.get(module_name)
+            if schema is None:
+                schema = EntitySchema(module_name, MODULE_CONFIG[module_name])
+                SCHEMA_CACHE[module_name] = schema
+    return schema
@@ -0,0 +1,513 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import fcntl
+import hashlib
+import http.client
+import json
+import os
+import socket
+import socketserver
+import ssl
+import struct
+import threading
+import time
+from urllib.parse import urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.concurrency import (
+    MAX_CONCURRENCY, AdaptiveLimiter,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.local_cache import get_cache_dir
+
+
+# Environment variables configuring the gateway; it is off unless SDP_CLOUD_GATEWAY is true
+ENV_GATEWAY = 'SDP_CLOUD_GATEWAY'
+ENV_GATEWAY_IDLE_TIMEOUT = 'SDP_CLOUD_GATEWAY_IDLE_TIMEOUT'
+ENV_GATEWAY_CONCURRENCY = 'SDP_CLOUD_GATEWAY_CONCURRENCY'
+
+# Seconds without a call after which the daemon exits
+DEFAULT_IDLE_TIMEOUT = 300
+
+# Seconds a module waits for a daemon it started to accept connections
+START_TIMEOUT = 5
+
+# Idle keep-alive connections the daemon keeps per host
+MAX_IDLE_PER_HOST = 16
+
+# An access token is handed out until this many seconds before it expires
+TOKEN_MARGIN = 300
+
+READ_SIZE = 64 * 1024
+
+_LENGTH = struct.Struct('>I')
+
+
+class GatewayUnavailable(Exception):
+    """Raised when the gateway cannot be reached before a call was handed to it; the call can be sent directly."""
+
+
+def _send_frame(sock, payload):
+    sock.sendall(_LENGTH.pack(len(payload)) + payload)
+
+
+def _recv_exact(stream, size):
+    data = stream.read(size)
+    if len(data) != size:
+        raise EOFError("Gateway connection closed")
+    return data
+
+
+def _recv_frame(stream):
+    size = _LENGTH.unpack(_recv_exact(stream, _LENGTH.size))[0]
+    return _recv_exact(stream, size) if size else b''
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections, reused across calls from every module process."""
+
+    def __init__(self, max_idle=MAX_IDLE_PER_HOST):
+        self.max_idle = max_idle
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._context = ssl.create_default_context()
+
+    def _connect(self, scheme, host, port, timeout):
+        proxy = getproxies().get(scheme)
+        if proxy and not proxy_bypass(host):
+            proxy = urlsplit(proxy if '://' in proxy else 'http://' + proxy)
+            target = (proxy.hostname, proxy.port or 8080)
+        else:
+            proxy, target = None, (host, port)
+
+        if scheme == 'https':
+            connection = http.client.HTTPSConnection(target[0], target[1], timeout=timeout, context=self._context)
+        else:
+            connection = http.client.HTTPConnection(target[0], target[1], timeout=timeout)
+        if proxy:
+            connection.set_tunnel(host, port)
+        return connection
+
+    def _take(self, key, timeout):
+        with self._lock:
+            idle = self._idle.get(key)
+            connection = idle.pop() if idle else None
+        if connection is None:
+            return self._connect(key[0], key[1], key[2], timeout), False
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        connection.timeout = timeout
+        return connection, True
+
+    def release(self, key, connection):
+        """Return a connection whose response was read completely, or close it if the pool is full."""
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def request(self, method, url, headers, body, timeout):
+        """Send one HTTP request on a pooled connection.
+
+        Returns:
+            A (key, connection, response) tuple; once response is read to the
+            end, pass key and connection to release() unless response.will_close.
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+        target = parts.path + ('?' + parts.query if parts.query else '')
+        while True:
+            connection, reused = self._take(key, timeout)
+            try:
+                connection.request(method, target, body=body or None, headers=headers)
+                return key, connection, connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                # The server closed an idle keep-alive connection; resend once on a new one
+                if not reused:
+                    raise
+            except Exception:
+                connection.close()
+                raise
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        server = self.server
+        server.activity(1)
+        try:
+            header = json.loads(_recv_frame(self.rfile).decode('utf-8'))
+            body = _recv_frame(self.rfile)
+            if header.get('op') == 'stop':
+                threading.Thread(target=server.shutdown).start()
+                return
+            if header.get('op') == 'token':
+                server.send_token(self.connection, header, body)
+            else:
+                server.send_fetch(self.connection, header, body)
+        except (EOFError, ValueError, OSError):
+            # The module went away (e.g. a hedged request that lost); nothing to answer
+            return
+        finally:
+            server.activity(-1)
+
+
+class GatewayServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Daemon side of the gateway: forwards calls from module processes over one connection pool.
+
+    Each call arrives on its own Unix socket connection as a JSON header
+    frame and a body frame, and is answered with a JSON header frame (the
+    status, message and lowercased headers that fetch_url reports) followed
+    by the response body in frames, ending with an empty frame. Bodies are
+    relayed undecoded and in chunks, so compression and incremental
+    decoding work as with a direct call.
+
+    Token requests are answered from memory while the access token they
+    returned is valid, so forks and later tasks do not each exchange the
+    refresh token.
+
+    API calls to each host share one AdaptiveLimiter, starting at
+    'concurrency', so all tasks on the controller stay within one AIMD
+    concurrency limit. A call that finds no free slot within its timeout is
+    not sent; it is answered with status -1 and 'gateway_busy', which the
+    module retries without counting it against the portal in its circuit
+    breaker or limiter.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path, idle_timeout=DEFAULT_IDLE_TIMEOUT, pool=None, concurrency=MAX_CONCURRENCY):
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.pool = pool or ConnectionPool()
+        self.concurrency = concurrency
+        self._limiters = {}
+        self._limiters_lock = threading.Lock()
+        self._tokens = {}
+        self._token_lock = threading.Lock()
+        self._active = 0
+        self._last_activity = time.time()
+        self._activity_lock = threading.Lock()
+        if os.path.exists(path):
+            os.unlink(path)
+        umask = os.umask(0o077)
+        try:
+            socketserver.UnixStreamServer.__init__(self, path, _Handler)
+        finally:
+            os.umask(umask)
+
+    def activity(self, delta):
+        with self._activity_lock:
+            self._active += delta
+            self._last_activity = time.time()
+
+    def idle_for(self):
+        """Return the seconds since the last call finished, or 0 while calls are running."""
+        with self._activity_lock:
+            return 0 if self._active else time.time() - self._last_activity
+
+    def watch_idle(self):
+        """Shut the server down once no call was made for idle_timeout seconds."""
+        while True:
+            time.sleep(min(self.idle_timeout, 5))
+            if self.idle_for() >= self.idle_timeout:
+                self.shutdown()
+                return
+
+    def limiter(self, url):
+        """Return the AdaptiveLimiter shared by every call to the host of url."""
+        host = urlsplit(url).netloc
+        with self._limiters_lock:
+            if host not in self._limiters:
+                self._limiters[host] = AdaptiveLimiter(initial=self.concurrency)
+            return self._limiters[host]
+
+    def _forward(self, header, body):
+        """Send a call upstream; returns (info, key, connection, response), response None on transport errors."""
+        try:
+            key, connection, response = self.pool.request(
+                header['method'], header['url'], header.get('headers') or {}, body, header.get('timeout'))
+        except Exception as e:
+            return {'status': -1, 'msg': 'Request failed: {0}'.format(e)}, None, None, None
+        info = dict((name.lower(), value) for name, value in response.getheaders())
+        msg = 'OK' if response.status < 400 else 'HTTP Error {0}: {1}'.format(response.status, response.reason)
+        info.update(status=response.status, msg=msg, url=header['url'])
+        return info, key, connection, response
+
+    def send_fetch(self, sock, header, body):
+        """Relay a call once a slot of its host's limiter is free; the slot is held until the body is relayed."""
+        limiter = self.limiter(header['url'])
+        slot = limiter.acquire(timeout=header.get('timeout'))
+        if slot is None:
+            info = {'status': -1, 'msg': 'Request failed: SDP gateway busy, no free slot within the timeout',
+                    'url': header['url'], 'gateway_busy': True}
+            _send_frame(sock, json.dumps(info).encode('utf-8'))
+            _send_frame(sock, b'')
+            return
+        status_code = -1
+        try:
+            status_code = self._relay(sock, header, body)
+        finally:
+            limiter.release(slot, None if status_code == -1 else (status_code == 429 or status_code >= 500))
+
+    def _relay(self, sock, header, body):
+        """Forward a call and stream its answer to sock; returns the upstream status (-1 on transport errors)."""
+        info, key, connection, response = self._forward(header, body)
+        _send_frame(sock, json.dumps(info).encode('utf-8'))
+        if response is None:
+            _send_frame(sock, b'')
+            return info['status']
+        try:
+            while True:
+                chunk = response.read(READ_SIZE)
+                if not chunk:
+                    break
+                _send_frame(sock, chunk)
+        except Exception:
+            connection.close()
+            raise
+        # Pool the connection before ending the body, so the module's next call can reuse it
+        if response.will_close:
+            connection.close()
+        else:
+            self.pool.release(key, connection)
+        _send_frame(sock, b'')
+        return info['status']
+
+    def send_token(self, sock, header, body):
+        """Answer a token request from memory, or forward it and keep a successful answer until it expires."""
+        cache_key = hashlib.sha256(header['url'].encode('utf-8') + b'\x00' + body).hexdigest()
+        with self._token_lock:
+            cached = self._tokens.get(cache_key)
+            if cached and (cached['expires_at'] <= time.time() or cached['token'] == header.get('stale_token')):
+                del self._tokens[cache_key]
+                cached = None
+            if cached is None:
+                info, key, connection, response = self._forward(header, body)
+                content = b''
+                if response is not None:
+                    content = response.read()
+                    if response.will_close:
+                        connection.close()
+                    else:
+                        self.pool.release(key, connection)
+                cached = dict(info=info, body=content, token=None, expires_at=0)
+                try:
+                    data = json.loads(content)
+                except ValueError:
+                    data = None
+                if info['status'] == 200 and isinstance(data, dict) and data.get('access_token'):
+                    cached.update(token=data['access_token'],
+                                  expires_at=time.time() + int(data.get('expires_in') or 3600) - TOKEN_MARGIN)
+                    self._tokens[cache_key] = cached
+
+        _send_frame(sock, json.dumps(cached['info']).encode('utf-8'))
+        if cached['body']:
+            _send_frame(sock, cached['body'])
+        _send_frame(sock, b'')
+
+
+def run_daemon(path, idle_timeout, concurrency=MAX_CONCURRENCY):
+    """Fork a detached gateway daemon serving on path; returns in the calling process.
+
+    The daemon is a double-forked child of the module, so it already holds
+    every module it needs in memory and outlives the task. Its standard
+    streams are redirected to /dev/null so Ansible does not wait for them.
+    """
+    pid = os.fork()
+    if pid:
+        os.waitpid(pid, 0)
+        return
+
+    try:
+        os.setsid()
+        if os.fork():
+            os._exit(0)
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        os.closerange(3, 256)
+        server = GatewayServer(path, idle_timeout, concurrency=concurrency)
+        watcher = threading.Thread(target=server.watch_idle)
+        watcher.daemon = True
+        watcher.start()
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if os.path.exists(path):
+                os.unlink(path)
+    finally:
+        os._exit(0)
+
+
+class GatewayResponse:
+    """Body of a call answered by the gateway, read from the socket frame by frame."""
+
+    def __init__(self, sock, stream, status):
+        self._sock = sock
+        self._stream = stream
+        self._pending = b''
+        self._eof = False
+        self.status = self.code = status
+
+    def _fill(self):
+        chunk = _recv_frame(self._stream)
+        if not chunk:
+            self._eof = True
+            self.close()
+        self._pending += chunk
+
+    def read(self, size=-1):
+        try:
+            if size is None or size < 0:
+                while not self._eof:
+                    self._fill()
+            else:
+                while len(self._pending) < size and not self._eof:
+                    self._fill()
+        except EOFError as e:
+            raise IOError(str(e))
+        if size is None or size < 0:
+            size = len(self._pending)
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def close(self):
+        self._stream.close()
+        self._sock.close()
+
+
+class Gateway:
+    """Module side of the gateway: sends calls through the daemon, starting it on demand."""
+
+    def __init__(self, path=None, idle_timeout=DEFAULT_IDLE_TIMEOUT, concurrency=MAX_CONCURRENCY):
+        self.path = path or os.path.join(get_cache_dir(), 'gateway.sock')
+        self.idle_timeout = idle_timeout
+        self.concurrency = concurrency
+
+    @classmethod
+    def from_env(cls):
+        """Build a Gateway from SDP_CLOUD_GATEWAY* env vars, or return None when disabled.
+
+        Raises:
+            ValueError: If the idle timeout is not a positive number, or the
+                concurrency not an integer within 1..MAX_CONCURRENCY.
+        """
+        if os.environ.get(ENV_GATEWAY, '').lower() not in ('1', 'true', 'yes'):
+            return None
+        idle_timeout = float(os.environ.get(ENV_GATEWAY_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT))
+        if idle_timeout <= 0:
+            raise ValueError("{0} must be a positive number of seconds.".format(ENV_GATEWAY_IDLE_TIMEOUT))
+        concurrency = int(os.environ.get(ENV_GATEWAY_CONCURRENCY, MAX_CONCURRENCY))
+        if not (1 <= concurrency <= MAX_CONCURRENCY):
+            raise ValueError("{0} must be between 1 and {1}.".format(ENV_GATEWAY_CONCURRENCY, MAX_CONCURRENCY))
+        return cls(idle_timeout=idle_timeout, concurrency=concurrency)
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def is_running(self):
+        try:
+            self._connect().close()
+        except OSError:
+            return False
+        return True
+
+    def ensure_running(self):
+        """Return True once a daemon accepts connections, starting one if none does.
+
+        Only one process starts the daemon; the others wait for it under the
+        same lock.
+        """
+        if self.is_running():
+            return True
+        with open(self.path + '.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                if self.is_running():
+                    return True
+                run_daemon(self.path, self.idle_timeout, self.concurrency)
+                waited = 0
+                while waited < START_TIMEOUT:
+                    if self.is_running():
+                        return True
+                    time.sleep(0.05)
+                    waited += 0.05
+                return False
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _exchange(self, header, body, timeout):
+        """Hand a call to the daemon and read the header of its answer.
+
+        Raises:
+            GatewayUnavailable: If the daemon could not be reached; the call
+                was not sent and can safely be sent directly.
+        """
+        try:
+            sock = self._connect()
+            _send_frame(sock, json.dumps(header).encode('utf-8'))
+            _send_frame(sock, body or b'')
+        except OSError as e:
+            raise GatewayUnavailable("SDP gateway at {0} is unavailable: {1}".format(self.path, e))
+
+        # The daemon waits up to timeout for a slot, bounds connecting and reading upstream by timeout each, and
+        # may resend once on a stale connection
+        sock.settimeout(None if timeout is None else 3 * timeout + 5)
+        stream = sock.makefile('rb')
+        try:
+            info = json.loads(_recv_frame(stream).decode('utf-8'))
+        except (OSError, EOFError, ValueError) as e:
+            stream.close()
+            sock.close()
+            return None, {'status': -1, 'msg': 'Request failed: SDP gateway did not answer: {0}'.format(e)}
+
+        response = GatewayResponse(sock, stream, info.get('status'))
+        if info.get('status', -1) < 400 and info.get('status', -1) != -1:
+            return response, info
+        try:
+            body = response.read()
+        except IOError:
+            body = b''
+        response.close()
+        if body:
+            info['body'] = body
+        return None, info
+
+    def fetch(self, url, data=None, method='GET', headers=None, timeout=None):
+        """Send a call through the daemon; returns (response, info) as fetch_url does."""
+        header = dict(op='fetch', url=url, method=method, headers=headers or {}, timeout=timeout)
+        return self._exchange(header, data.encode('utf-8') if isinstance(data, str) else data, timeout)
+
+    def fetch_token(self, url, data, headers=None, timeout=None, stale_token=None):
+        """Exchange a refresh token through the daemon, which reuses a valid access token it already holds.
+
+        stale_token is an access token the API rejected; the daemon never hands it out again.
+        """
+        header = dict(op='token', url=url, method='POST', headers=headers or {}, timeout=timeout,
+                      stale_token=stale_token)
+        return self._exchange(header, data.encode('utf-8') if isinstance(data, str) else data, timeout)
+
+    def stop(self):
+        """Ask a running daemon to exit."""
+        try:
+            sock = self._connect()
+            _send_frame(sock, json.dumps({'op': 'stop'}).encode('utf-8'))
+            _send_frame(sock, b'')
+            sock.close()
+        except OSError:
+            pass
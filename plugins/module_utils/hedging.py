@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import atexit
+import math
+import os
+import threading
+import time
+import weakref
+from queue import Empty, Queue
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.local_cache import (
+    cache_key, get_cache_dir, load_json, update_json,
+)
+
+
+# Environment variables configuring hedging; it is off unless SDP_CLOUD_HEDGE is true
+ENV_HEDGE = 'SDP_CLOUD_HEDGE'
+ENV_HEDGE_PERCENTILE = 'SDP_CLOUD_HEDGE_PERCENTILE'
+ENV_HEDGE_MAX_EXTRA = 'SDP_CLOUD_HEDGE_MAX_EXTRA'
+
+DEFAULT_PERCENTILE = 95
+DEFAULT_MAX_EXTRA = 0.05
+
+# GET latencies kept per portal, and how many are needed before hedging starts
+LATENCY_WINDOW = 200
+MIN_SAMPLES = 20
+
+# Request/hedge counters are halved past this many requests, so the budget follows recent load
+COUNTER_DECAY_AT = 10000
+
+# Local counters and latencies are merged into the shared file after this many GETs or seconds, and at exit
+FLUSH_EVERY = 50
+FLUSH_INTERVAL = 30
+
+
+# Hedgers flushed at exit; held weakly so clients dropped before then are freed
+_HEDGERS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    for hedger in list(_HEDGERS):
+        hedger.flush()
+
+
+def _merge(stats, delta):
+    """Add a delta of requests, hedges and latencies to a stats dict."""
+    stats['requests'] = stats.get('requests', 0) + delta['requests']
+    stats['hedged'] = stats.get('hedged', 0) + delta['hedged']
+    if stats['requests'] > COUNTER_DECAY_AT:
+        stats['requests'] //= 2
+        stats['hedged'] //= 2
+    stats['latencies'] = (stats.get('latencies', []) + delta['latencies'])[-LATENCY_WINDOW:]
+    return stats
+
+
+def _empty_delta():
+    return dict(requests=0, hedged=0, latencies=[])
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile (nearest rank) of a non-empty list of numbers."""
+    ordered = sorted(samples)
+    rank = max(1, int(math.ceil(pct / 100.0 * len(ordered))))
+    return ordered[rank - 1]
+
+
+class Hedger:
+    """Hedged execution of idempotent GETs.
+
+    When a GET has not answered within the 'percentile' latency of recent
+    GETs to the same portal, an identical second request is sent and the
+    first answer wins; the slower response is closed unread as soon as it
+    arrives. Hedges are capped at 'max_extra' times the number of GETs, so
+    hedging never adds more than that share of load.
+
+    Latencies and counters live in a JSON file in the cache directory,
+    shared by all forks on the controller: a module that sends a single GET
+    still hedges on what earlier tasks observed. The file is read once;
+    after that the stats are kept in memory and what this process saw is
+    merged back every FLUSH_EVERY GETs or FLUSH_INTERVAL seconds, and at exit.
+    """
+
+    def __init__(self, key, percentile=DEFAULT_PERCENTILE, max_extra=DEFAULT_MAX_EXTRA, directory=None):
+        self.key = key
+        self.percentile = percentile
+        self.max_extra = max_extra
+        directory = directory or get_cache_dir('hedging')
+        self.path = os.path.join(directory, '{0}.json'.format(cache_key(key)))
+        self._lock = threading.Lock()
+        self._stats = None
+        self._pending = _empty_delta()
+        self._flushed_at = time.time()
+        _HEDGERS.add(self)
+
+    @classmethod
+    def from_env(cls, key):
+        """Build a Hedger from SDP_CLOUD_HEDGE* env vars, or return None when disabled.
+
+        Raises:
+            ValueError: If a setting is not a number or out of range.
+        """
+        if os.environ.get(ENV_HEDGE, '').lower() not in ('1', 'true', 'yes'):
+            return None
+        pct = float(os.environ.get(ENV_HEDGE_PERCENTILE, DEFAULT_PERCENTILE))
+        max_extra = float(os.environ.get(ENV_HEDGE_MAX_EXTRA, DEFAULT_MAX_EXTRA))
+        if not (0 < pct < 100) or not (0 <= max_extra <= 1):
+            raise ValueError("{0} must be between 0 and 100 and {1} between 0 and 1.".format(
+                ENV_HEDGE_PERCENTILE, ENV_HEDGE_MAX_EXTRA))
+        return cls(key, percentile=pct, max_extra=max_extra)
+
+    def _note(self, requests=0, hedged=0, latency=None):
+        """Apply a change to the in-memory stats and remember it for the next flush. Caller holds _lock."""
+        if self._stats is None:
+            self._stats = _merge(load_json(self.path) or {}, _empty_delta())
+        delta = dict(requests=requests, hedged=hedged, latencies=[] if latency is None else [round(latency, 4)])
+        _merge(self._stats, delta)
+        self._pending['requests'] += requests
+        self._pending['hedged'] += hedged
+        self._pending['latencies'] = (self._pending['latencies'] + delta['latencies'])[-LATENCY_WINDOW:]
+
+    def _start(self):
+        """Count a GET and return the hedge delay, or None while too few latencies are known."""
+        with self._lock:
+            self._note(requests=1)
+            samples = self._stats['latencies']
+            if len(samples) < MIN_SAMPLES:
+                return None
+            return percentile(samples, self.percentile)
+
+    def _take_budget(self):
+        """Return True and count a hedge if it stays within max_extra of the GETs sent. Caller holds _lock."""
+        if self._stats['hedged'] + 1 > self.max_extra * self._stats['requests']:
+            return False
+        self._note(hedged=1)
+        return True
+
+    def _record(self, latency):
+        with self._lock:
+            self._note(latency=latency)
+
+    def flush(self):
+        """Merge what this process saw since the last flush into the shared file, and reload it."""
+        with self._lock:
+            pending, self._pending = self._pending, _empty_delta()
+            self._flushed_at = time.time()
+        if not (pending['requests'] or pending['latencies']):
+            return
+
+        try:
+            merged = update_json(self.path, lambda stats: dict(_merge(stats, pending)))
+        except (IOError, OSError):
+            return
+        with self._lock:
+            # Keep what other threads noted while the file was being written
+            self._stats = _merge(merged, self._pending)
+
+    def _maybe_flush(self):
+        with self._lock:
+            due = self._pending['requests'] >= FLUSH_EVERY or time.time() - self._flushed_at >= FLUSH_INTERVAL
+        if due:
+            self.flush()
+
+    def run(self, send):
+        """Call send() (which returns a fetch_url style (response, info) tuple), hedged if slow.
+
+        Returns:
+            A (response, info, hedged) tuple; hedged is 'won' or 'lost' when
+            a second request was sent, None otherwise.
+        """
+        delay = self._start()
+        answers = Queue()
+        lock = threading.Lock()
+        state = dict(winner=None, launched=0)
+
+        def _attempt(index):
+            started = time.time()
+            try:
+                outcome = (send(), None)
+            except Exception as e:
+                outcome = (None, e)
+            with lock:
+                won = state['winner'] is None
+                if won:
+                    state['winner'] = index
+            if won:
+                answers.put(outcome)
+            elif outcome[0] is not None and hasattr(outcome[0][0], 'close'):
+                # The other request already answered; discard this response unread
+                outcome[0][0].close()
+            self._record(time.time() - started)
+
+        def _launch(index):
+            state['launched'] += 1
+            worker = threading.Thread(target=_attempt, args=(index,), name='sdp-hedge-{0}'.format(index))
+            worker.daemon = True
+            worker.start()
+
+        if delay is None:
+            state['launched'] = 1
+            _attempt(0)
+            result, error = answers.get()
+        else:
+            _launch(0)
+            try:
+                result, error = answers.get(timeout=delay)
+            except Empty:
+                # The budget is only spent on a hedge that is actually sent
+                with lock, self._lock:
+                    fire = state['winner'] is None and self._take_budget()
+                if fire:
+                    _launch(1)
+                result, error = answers.get()
+
+        self._maybe_flush()
+        if error is not None:
+            raise error
+        hedged = None
+        if state['launched'] > 1:
+            hedged = 'won' if state['winner'] == 1 else 'lost'
+        response, info = result
+        return response, info, hedged
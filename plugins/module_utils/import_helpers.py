@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import csv
+import itertools
+import json
+import os
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.field_schema import get_entity_schema
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.local_cache import load_json, save_json
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.udf_utils import is_udf_field
+
+
+SOURCE_FORMATS = ('csv', 'jsonl')
+
+
+def detect_format(path, source_format=None):
+    """Return the source format, derived from the file extension unless given."""
+    if source_format:
+        return source_format
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    return 'csv'
+
+
+def iter_source_rows(path, source_format, start_row=0):
+    """Stream the rows of a CSV or JSONL file without loading it into memory.
+
+    Rows are numbered from 1 (the CSV header does not count) and rows up to
+    start_row are skipped.
+
+    Yields:
+        (row_number, record, error) tuples; record is None when the row could
+        not be parsed and error holds the reason.
+    """
+    with open(path, newline='' if source_format == 'csv' else None) as f:
+        if source_format == 'csv':
+            rows = csv.DictReader(f)
+        else:
+            rows = (line for line in f if line.strip())
+
+        for row_number, row in enumerate(rows, 1):
+            if row_number <= start_row:
+                continue
+            if source_format == 'csv':
+                yield row_number, row, None
+                continue
+            try:
+                record = json.loads(row)
+            except ValueError as e:
+                yield row_number, None, "Invalid JSON: {0}".format(e)
+                continue
+            if not isinstance(record, dict):
+                yield row_number, None, "Expected a JSON object per line."
+                continue
+            yield row_number, record, None
+
+
+def iter_batches(iterable, size):
+    """Yield lists of up to size items from an iterable."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def map_row(entity, record, field_map=None, from_csv=False, load_udfs=None):
+    """Turn a source row into a flat payload dict for build_payload.
+
+    Columns are renamed through field_map; columns mapped to an empty name
+    are dropped, and unmapped columns are used as field names as they are.
+    Empty values are left out. CSV values are strings, so numeric strings for
+    datetime fields are converted to timestamps. Field types come from the
+    compiled entity schema; load_udfs, if given, is called without arguments
+    to fetch the UDF definitions the first time a CSV column names a UDF.
+    """
+    field_map = field_map or {}
+    schema = get_entity_schema(entity)
+    payload = {}
+
+    for column, value in record.items():
+        field = field_map.get(column, column)
+        if not field or value is None or value == '':
+            continue
+        if from_csv and isinstance(value, str):
+            value = value.strip()
+            spec = schema.system_fields.get(field)
+            if spec is None and load_udfs is not None and is_udf_field(field):
+                spec = schema.get_udf(field, load_udfs())
+            if spec is not None and spec.ftype == 'datetime' and value.isdigit():
+                value = int(value)
+        payload[field] = value
+
+    return payload
+
+
+def load_checkpoint(module, path, src):
+    """Return the checkpoint of an earlier import of src, or a fresh one.
+
+    The checkpoint holds the number of failed rows; the failures themselves
+    are kept in a side file, see load_failures.
+    """
+    checkpoint = load_json(path) if path else None
+    if not checkpoint:
+        return dict(src=os.path.abspath(src), row=0, created=0, failed=0)
+    if checkpoint.get('src') != os.path.abspath(src):
+        module.fail_json(msg="Checkpoint {0} belongs to {1}, not {2}. Remove it or use another checkpoint file.".format(
+            path, checkpoint.get('src'), os.path.abspath(src)))
+    return checkpoint
+
+
+def failures_path(path):
+    """Return the path of the JSONL file holding the failed rows of a checkpoint."""
+    return path + '.failed'
+
+
+def load_failures(path, checkpoint):
+    """Return the failed rows recorded for the checkpoint.
+
+    Lines beyond the checkpoint's failed count belong to a batch that was
+    never committed (the import stopped between the two writes); they are
+    cut off so the batch's failures are not recorded twice when it is replayed.
+    """
+    if not path:
+        return []
+    count = checkpoint['failed']
+    failed = []
+    try:
+        with open(failures_path(path)) as f:
+            for line in itertools.islice(f, count):
+                failed.append(json.loads(line))
+            extra = f.readline()
+    except (IOError, OSError):
+        return failed
+    if extra:
+        with open(failures_path(path), 'w') as f:
+            f.writelines(json.dumps(entry) + '\n' for entry in failed)
+    return failed
+
+
+def save_checkpoint(path, checkpoint, failures=()):
+    """Persist the checkpoint once a batch is committed.
+
+    The batch's failures are appended to the side file, so each save costs
+    one batch of failures rather than all of them; the checkpoint itself is
+    replaced atomically.
+    """
+    if failures:
+        checkpoint['failed'] += len(failures)
+    if not path:
+        return
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    if failures:
+        with open(failures_path(path), 'a') as f:
+            f.writelines(json.dumps(entry) + '\n' for entry in failures)
+    save_json(os.path.abspath(path), checkpoint)
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import threading
+import time
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_core import SDPAPIError
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.local_cache import cache_key
+
+
+# Number of outcome entries written between two fsyncs
+DEFAULT_SYNC_EVERY = 50
+
+# Failures worth replaying on resume: transport errors, revoked tokens, throttling and server errors
+RETRYABLE_STATUSES = (None, -1, 401, 429, 500, 502, 503, 504)
+
+
+def journal_argument_spec():
+    """Return the argument spec for the write-ahead journal of bulk writes."""
+    return dict(
+        journal=dict(type='path'),
+        resume=dict(type='bool', default=False),
+    )
+
+
+def operation_id(operation):
+    """Return a stable identifier for a planned write operation.
+
+    The id depends only on what the operation does, so the same operation
+    planned again by a resumed run maps to the same journal entries.
+    """
+    return cache_key(operation['method'], operation['endpoint'], operation.get('key'),
+                     json.dumps(operation.get('data'), sort_keys=True))
+
+
+def read_journal(path):
+    """Return the entries of the current (not yet completed) run of a journal.
+
+    Entries written before the last 'complete' marker belong to finished runs
+    and are ignored. A truncated last line, left by a crash mid-write, is skipped.
+    """
+    entries = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get('event') == 'complete':
+                    entries = []
+                else:
+                    entries.append(entry)
+    except (IOError, OSError):
+        return []
+    return entries
+
+
+class WriteJournal:
+    """Append-only JSONL journal of the writes of one bulk run.
+
+    Every planned operation is journaled as an 'intent' (fsynced before any
+    write is sent) and then as 'done' or 'failed' once the API answered.
+    Outcomes are fsynced in batches of 'sync_every' entries. When a run ends
+    without pending or retryable operations a 'complete' marker is appended,
+    so the next run starts a fresh section of the same file.
+    """
+
+    def __init__(self, path, entity, sync_every=DEFAULT_SYNC_EVERY):
+        self.path = path
+        self.entity = entity
+        self.sync_every = sync_every
+        self._file = None
+        self._unsynced = 0
+        self._lock = threading.Lock()
+        self._outstanding = set()
+
+    def state(self):
+        """Return op id -> latest journal entry for the current run."""
+        state = {}
+        for entry in read_journal(self.path):
+            if entry.get('op'):
+                state[entry['op']] = entry
+        return state
+
+    def _write(self, entry, sync=False):
+        entry['t'] = int(time.time() * 1000)
+        self._file.write(json.dumps(entry, sort_keys=True) + '\n')
+        self._unsynced += 1
+        if sync or self._unsynced >= self.sync_every:
+            self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def begin(self, operations, resume=False):
+        """Journal the intent of every operation that still has to run.
+
+        With resume, operations already done, or failed with a
+        non-retryable error, by the interrupted run are not replayed.
+
+        Returns:
+            A (pending, settled) tuple: the operations to send, and a list of
+            (operation, response, error) results recovered from the journal.
+        """
+        previous = self.state() if resume else {}
+        pending = []
+        settled = []
+
+        for operation in operations:
+            entry = previous.get(operation_id(operation), {})
+            if entry.get('event') == 'done':
+                response = {self.entity: {'id': entry.get('id')}} if entry.get('id') else {}
+                settled.append((operation, response, None))
+            elif entry.get('event') == 'failed' and not entry.get('retryable'):
+                settled.append((operation, None, SDPAPIError(entry.get('msg'), status=entry.get('status'))))
+            else:
+                pending.append(operation)
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._file = open(self.path, 'a')
+
+        for operation in pending:
+            op_id = operation_id(operation)
+            self._outstanding.add(op_id)
+            self._write(dict(event='intent', op=op_id, action=operation['action'], key=operation.get('key'),
+                             id=operation.get('id'), method=operation['method'], endpoint=operation['endpoint']))
+        if pending:
+            self._sync()
+
+        return pending, settled
+
+    def record(self, operation, response, error):
+        """Journal the outcome of one operation. Safe to call from worker threads."""
+        op_id = operation_id(operation)
+        if error is None:
+            record_id = ((response or {}).get(self.entity) or {}).get('id') or operation.get('id')
+            entry = dict(event='done', op=op_id, id=record_id)
+        else:
+            status = getattr(error, 'status', None)
+            entry = dict(event='failed', op=op_id, status=status, msg=str(error),
+                         retryable=status in RETRYABLE_STATUSES)
+
+        with self._lock:
+            self._write(entry)
+            if not entry.get('retryable'):
+                self._outstanding.discard(op_id)
+
+    def close(self):
+        """Sync the journal and mark the run complete if nothing is left to replay."""
+        if self._file is None:
+            return
+        with self._lock:
+            if not self._outstanding:
+                self._write(dict(event='complete'))
+            self._sync()
+            self._file.close()
+            self._file = None
+
+
+def open_journal(module, entity):
+    """Return the WriteJournal configured by the 'journal' and 'resume' params, or None.
+
+    Fails the module when the journal holds an interrupted run and resume is
+    not set, so a plain re-run can never repeat its writes.
+    """
+    path = module.params.get('journal')
+    resume = module.params.get('resume')
+    if not path:
+        if resume:
+            module.fail_json(msg="resume requires journal.")
+        return None
+
+    journal = WriteJournal(path, entity)
+    if not resume and journal.state():
+        module.fail_json(msg="Journal {0} holds an interrupted run. Set resume=true to continue it, "
+                             "or remove the file to start over.".format(path))
+    return journal
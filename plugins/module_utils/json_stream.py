@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import codecs
+import json
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+
+
+class _Buffer:
+    """Decoded text read from a byte stream on demand."""
+
+    def __init__(self, stream, chunk_size):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Read one more chunk; returns False once the stream is exhausted."""
+        if self.eof:
+            return False
+        chunk = self._stream.read(self._chunk_size)
+        if not chunk:
+            self.eof = True
+            self.text = self.text[self.pos:] + self._decoder.decode(b'', final=True)
+        else:
+            self.text = self.text[self.pos:] + self._decoder.decode(chunk)
+        self.pos = 0
+        return True
+
+    def peek(self, skip=_WHITESPACE):
+        """Return the next character that is not in skip, or '' at the end of the stream."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in skip:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError("Expected '{0}' at offset {1}".format(char, self.pos))
+        self.pos += 1
+
+    def decode_value(self, decoder):
+        """Decode the JSON value at the current position, reading more input until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+            except ValueError:
+                if not self.fill():
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.text) and not self.eof:
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_list(stream, list_key, on_member=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the elements of one array member of a JSON object as they are read.
+
+    Only the element being decoded (plus one read chunk) is held in memory,
+    instead of the whole body as bytes and again as objects. Other members
+    of the top-level object are decoded whole and passed to on_member(key,
+    value) as soon as they are read, so callers can validate a status member
+    before or after the array.
+
+    Args:
+        stream: Object with read(size) returning bytes (e.g., an HTTP response).
+        list_key: Top-level member holding the array to stream.
+        on_member: Optional callback for every other top-level member.
+        chunk_size: Bytes read per chunk.
+
+    Raises:
+        ValueError: If the body is not a JSON object or is truncated.
+    """
+    decoder = json.JSONDecoder()
+    buf = _Buffer(stream, chunk_size)
+
+    # An empty body holds no records
+    if buf.peek() == '':
+        return
+    buf.expect('{')
+    while True:
+        char = buf.peek(_WHITESPACE + ',')
+        if char == '}':
+            return
+        if char != '"':
+            raise ValueError("Expected a member name at offset {0}".format(buf.pos))
+        key = buf.decode_value(decoder)
+        buf.expect(':')
+
+        if key == list_key and buf.peek() == '[':
+            buf.pos += 1
+            while True:
+                char = buf.peek(_WHITESPACE + ',')
+                if char == ']':
+                    buf.pos += 1
+                    break
+                if char == '':
+                    raise ValueError("Unterminated array '{0}'".format(list_key))
+                yield buf.decode_value(decoder)
+        else:
+            value = buf.decode_value(decoder)
+            if on_member is not None:
+                on_member(key, value)
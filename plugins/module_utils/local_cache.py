@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+
+# Environment variable overriding where controller-side caches are kept
+ENV_CACHE_DIR = 'SDP_CLOUD_CACHE_DIR'
+
+DEFAULT_CACHE_DIR = os.path.join('~', '.cache', 'manageengine.sdp_cloud')
+
+
+def cache_path(*parts):
+    """Return the path of a cache directory nested under parts, without creating it."""
+    base = os.path.expanduser(os.environ.get(ENV_CACHE_DIR) or DEFAULT_CACHE_DIR)
+    return os.path.join(base, *parts)
+
+
+def get_cache_dir(*parts):
+    """Return (and create) a cache directory, optionally nested under parts."""
+    path = cache_path(*parts)
+    if not os.path.isdir(path):
+        try:
+            os.makedirs(path, 0o700)
+        except OSError:
+            if not os.path.isdir(path):
+                raise
+    return path
+
+
+def cache_key(*parts):
+    """Return a short, filesystem-safe digest identifying the given parts."""
+    digest = hashlib.sha1('\x00'.join(str(p) for p in parts).encode('utf-8')).hexdigest()
+    return digest[:20]
+
+
+def load_json(path, max_age=None):
+    """Load a JSON cache file written by save_json.
+
+    Returns:
+        The cached data, or None if the file is missing, unreadable, or
+        older than max_age seconds.
+    """
+    try:
+        with open(path) as f:
+            document = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+    if not isinstance(document, dict) or 'data' not in document:
+        return None
+
+    if max_age is not None and time.time() - document.get('saved_at', 0) > max_age:
+        return None
+
+    return document['data']
+
+
+def save_json(path, data):
+    """Atomically write data to a JSON cache file, stamped with the save time.
+
+    The file is written next to its destination and renamed into place so
+    concurrent readers (other forks on the controller) never see a partial file.
+    """
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'saved_at': time.time(), 'data': data}, f)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def update_json(path, change):
+    """Read-modify-write a JSON cache file under an exclusive lock shared by all processes.
+
+    change(data) receives the current data (an empty dict when the file is
+    missing or unreadable) and may modify it in place; the data is saved
+    even when change() raises, and its return value is passed through.
+    """
+    with open(path + '.lock', 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            data = load_json(path)
+            if not isinstance(data, dict):
+                data = {}
+            try:
+                return change(data)
+            finally:
+                save_json(path, data)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
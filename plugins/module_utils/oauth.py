@@ -9,6 +9,7 @@ import json
 from ansible.module_utils.urls import fetch_url
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import DC_MAP
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.error_handler import handle_error
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.gateway import GatewayUnavailable
 
 
 try:
@@ -18,10 +19,15 @@ except ImportError:
     urllib_parse = urllib
 
 
-def get_access_token(module, client_id, client_secret, refresh_token, dc):
+def get_access_token(module, client_id, client_secret, refresh_token, dc, cassette=None, timeout=10,
+                     gateway=None, stale_token=None):
     """
     Generate Access Token using Refresh Token.
     Returns the full JSON response from the token endpoint.
+    When a cassette is given, the token exchange is recorded or replayed through it.
+    timeout bounds the token request in seconds.
+    When a gateway is given, the exchange goes through it so a valid token is
+    reused across tasks; stale_token is a token the API just rejected.
     """
     accounts_url = DC_MAP.get(dc)
     if not accounts_url:
@@ -37,13 +43,20 @@ def get_access_token(module, client_id, client_secret, refresh_token, dc):
     }
     payload = urllib_parse.urlencode(payload_data)
 
-    response, info = fetch_url(
-        module,
-        token_url,
-        data=payload,
-        method='POST',
-        headers={'Content-Type': 'application/x-www-form-urlencoded'}
-    )
+    headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+    if cassette:
+        response, info = cassette.fetch(module, fetch_url, token_url, data=payload, method='POST', headers=headers,
+                                        timeout=timeout)
+    else:
+        response = info = None
+        if gateway:
+            try:
+                response, info = gateway.fetch_token(token_url, payload, headers=headers, timeout=timeout,
+                                                     stale_token=stale_token)
+            except GatewayUnavailable:
+                pass
+        if info is None:
+            response, info = fetch_url(module, token_url, data=payload, method='POST', headers=headers, timeout=timeout)
 
     if not response:
         handle_error(module, info, "Failed to generate Access Token")
@@ -5,9 +5,17 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_core import SDPAPIError
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.concurrency import (
+    DEFAULT_CONCURRENCY, run_concurrently,
+)
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
 
 
+# Maximum number of ids resolved by one search_criteria list call (the API's row_count limit)
+ID_CHUNK_SIZE = 100
+
+
 def list_info_argument_spec():
     """Return the argument spec for list/pagination options.
 
@@ -22,6 +30,21 @@ def list_info_argument_spec():
     )
 
 
+def cache_argument_spec():
+    """Return the argument spec for the response cache used by the read modules."""
+    return dict(
+        cache_ttl=dict(type='int', default=0),
+    )
+
+
+def validate_cache_ttl(module):
+    """Fail the module if 'cache_ttl' is negative; return it (0 disables the cache)."""
+    cache_ttl = module.params.get('cache_ttl') or 0
+    if cache_ttl < 0:
+        module.fail_json(msg="cache_ttl must not be negative.")
+    return cache_ttl
+
+
 def construct_list_payload(module):
     """Validate and construct the list_info payload for GET list operations.
 
@@ -60,3 +83,90 @@ def construct_list_payload(module):
         validated_payload['start_index'] = start_index
 
     return {"list_info": validated_payload}
+
+
+def unique_ids(ids):
+    """Return ids as stripped strings, without blanks or duplicates, in input order."""
+    unique = []
+    seen = set()
+    for record_id in ids:
+        record_id = str(record_id).strip()
+        if record_id and record_id not in seen:
+            seen.add(record_id)
+            unique.append(record_id)
+    return unique
+
+
+def fetch_records_by_ids(module, client, entity, ids, max_workers=DEFAULT_CONCURRENCY, fields_required=None,
+                         cache_ttl=None):
+    """Fetch many records of one entity by id in as few API calls as possible.
+
+    Ids are resolved in chunks of ID_CHUNK_SIZE with a search_criteria list
+    call each. Chunks whose search is rejected by the API fall back to
+    individual GETs on a bounded worker pool. Ids that do not exist are
+    reported in the missing list rather than failing the module.
+
+    Args:
+        module: AnsibleModule instance.
+        client: SDPClient instance.
+        entity: Entity name (e.g., 'request').
+        ids: Iterable of record ids; duplicates are ignored.
+        max_workers: Maximum number of concurrent API calls.
+        fields_required: Optional list_info 'fields_required' for the id searches.
+        cache_ttl: Reuse cached responses up to this many seconds old (see SDPClient.call()).
+
+    Returns:
+        A (records, missing) tuple: records maps id -> record in input order,
+        missing lists the ids that were not found.
+    """
+    endpoint = MODULE_CONFIG[entity]['endpoint']
+    ids = unique_ids(ids)
+    if not ids:
+        return {}, []
+
+    # Authenticate once up front so workers never need to fail the module
+    client.ensure_auth()
+
+    def _search(chunk):
+        list_info = {
+            'row_count': len(chunk),
+            'search_criteria': {'field': 'id', 'condition': 'is', 'values': chunk},
+        }
+        if fields_required:
+            list_info['fields_required'] = fields_required
+        response = client.call(endpoint, method='GET', data={'list_info': list_info}, cache_ttl=cache_ttl)
+        return response.get(endpoint) or []
+
+    def _get(record_id):
+        try:
+            response = client.call('{0}/{1}'.format(endpoint, record_id), method='GET', cache_ttl=cache_ttl)
+        except SDPAPIError as e:
+            if e.status == 404:
+                return None
+            raise
+        return response.get(entity)
+
+    chunks = [ids[start:start + ID_CHUNK_SIZE] for start in range(0, len(ids), ID_CHUNK_SIZE)]
+    found = {}
+    fallback = []
+    for chunk, records, error in run_concurrently(_search, chunks, max_workers):
+        if error is not None:
+            fallback.extend(chunk)
+            continue
+        for record in records:
+            found[str(record.get('id'))] = record
+
+    if fallback:
+        module.warn("Searching {0} by id failed; fetching {1} records individually.".format(endpoint, len(fallback)))
+        errors = []
+        for record_id, record, error in run_concurrently(_get, fallback, max_workers):
+            if error is not None:
+                errors.append("{0}: {1}".format(record_id, error))
+            elif record:
+                found[record_id] = record
+        if errors:
+            module.fail_json(msg="Failed to fetch {0}: {1}".format(endpoint, '; '.join(errors)), errors=errors)
+
+    records = dict((record_id, found[record_id]) for record_id in ids if record_id in found)
+    missing = [record_id for record_id in ids if record_id not in found]
+    return records, missing
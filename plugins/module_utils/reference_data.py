@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.field_schema import get_entity_schema
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.local_cache import (
+    cache_key, get_cache_dir, load_json, save_json,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
+
+
+DEFAULT_REFERENCE_TTL = 3600
+
+
+def build_name_index(records):
+    """Index reference records by lowercase name -> {'id': ..., 'name': ...}."""
+    index = {}
+    for record in records:
+        name = record.get('name')
+        if isinstance(name, str) and name:
+            index[name.lower()] = {'id': record.get('id'), 'name': name}
+    return index
+
+
+class ReferenceDataCache:
+    """Portal reference data (priorities, statuses, groups, ...) indexed by name.
+
+    Each list endpoint is fetched once, kept in memory for the process and
+    on disk for 'ttl' seconds so that every task on the controller using the
+    same credentials (client.cache_identity) shares it.
+    """
+
+    def __init__(self, client, ttl=DEFAULT_REFERENCE_TTL):
+        self.client = client
+        self.ttl = ttl
+        self._indexes = {}
+        self._cache_dir = get_cache_dir('reference', cache_key(client.base_url, client.cache_identity))
+
+    def _cache_path(self, endpoint):
+        return os.path.join(self._cache_dir, '{0}.json'.format(endpoint.replace('/', '_')))
+
+    def get_index(self, endpoint):
+        """Return the name index for a reference list endpoint, fetching it if stale."""
+        index = self._indexes.get(endpoint)
+        if index is not None:
+            return index
+
+        path = self._cache_path(endpoint)
+        index = load_json(path, max_age=self.ttl) if self.ttl > 0 else None
+        if index is None:
+            index = build_name_index(self.client.iter_records(endpoint, endpoint, prefetch=self.client.prefetch_depth))
+            save_json(path, index)
+
+        self._indexes[endpoint] = index
+        return index
+
+    def resolve(self, endpoint, name):
+        """Return the {'id', 'name'} entry for a name (case-insensitive), or None."""
+        if not isinstance(name, str):
+            return None
+        return self.get_index(endpoint).get(name.lower())
+
+
+def check_lookup_values(cache, entity, data, use_ids=False):
+    """Validate lookup values of a constructed payload against reference data.
+
+    Valid values are rewritten to the portal's canonical name, or to
+    {'id': ...} when use_ids is set. Lookups without a configured reference
+    endpoint (e.g., subcategory, item) are left untouched.
+
+    Args:
+        cache: ReferenceDataCache for the portal.
+        entity: Entity name (e.g., 'request').
+        data: Payload built by construct_payload ({'request': {...}}); updated in place.
+        use_ids: Send lookup ids instead of names.
+
+    Returns:
+        A list of error messages, empty if every lookup value is valid.
+    """
+    record = (data or {}).get(entity)
+    if not record:
+        return []
+
+    endpoints = MODULE_CONFIG[entity].get('reference_endpoints', {})
+    schema = get_entity_schema(entity)
+    errors = []
+
+    for field, endpoint in endpoints.items():
+        group_name = schema.system_fields[field].group_name
+        container = record.get(group_name) if group_name else record
+        if not container or not isinstance(container.get(field), dict):
+            continue
+
+        name = container[field].get('name')
+        if name is None:
+            continue
+
+        entry = cache.resolve(endpoint, name)
+        if entry is None:
+            allowed = sorted(item['name'] for item in cache.get_index(endpoint).values())
+            errors.append("Invalid value '{0}' for field '{1}'. Allowed values: {2}".format(name, field, allowed))
+        elif use_ids and entry.get('id'):
+            container[field] = {'id': entry['id']}
+        else:
+            container[field] = {'name': entry['name']}
+
+    return errors
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import copy
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.local_cache import (
+    cache_key, cache_path, load_json, save_json,
+)
+
+
+# Responses kept in memory per client, and on disk per portal and identity, before the least recently used are dropped
+DEFAULT_MEMORY_ENTRIES = 128
+DEFAULT_DISK_ENTRIES = 1024
+
+# Share of disk_entries the disk tier may grow past before it is pruned, so the tree is not walked on every put
+PRUNE_SLACK = 0.1
+
+
+def _endpoint_path(endpoint):
+    """Return the path of an endpoint without its query string (e.g., 'requests' for 'requests?ids=1,2')."""
+    return endpoint.partition('?')[0].strip('/')
+
+
+def _endpoint_parts(endpoint):
+    """Split the path of an endpoint into segments that are safe as directory names."""
+    parts = []
+    for segment in _endpoint_path(endpoint).split('/'):
+        segment = re.sub(r'[^\w.-]', '_', segment)
+        parts.append('_' if segment in ('', '.', '..') else segment)
+    return parts
+
+
+def _is_related(cached, written):
+    """Return True if a response cached for one endpoint may be stale after a write to another.
+
+    That is the written endpoint itself, anything below it (sub-resources),
+    and every endpoint above it (the lists and parent records containing it).
+    """
+    cached, written = _endpoint_path(cached), _endpoint_path(written)
+    return (cached == written or cached.startswith(written + '/') or written.startswith(cached + '/'))
+
+
+class ResponseCache:
+    """Time-bounded cache of parsed GET responses, in memory and on disk.
+
+    Entries are keyed by endpoint plus input_data. The memory tier is an LRU
+    of 'memory_entries' responses for the process; the disk tier keeps up to
+    'disk_entries' responses per portal and identity in the cache directory,
+    so every task on the controller shares them. A lookup passes the maximum
+    age the caller accepts, so each call chooses its own TTL. A memory entry
+    is only used while its disk entry exists, so a write invalidating it in
+    another process is seen at once.
+
+    The disk tier is also keyed by 'identity' (a digest of the OAuth client
+    id and refresh token, or the access token of the caller), so responses
+    fetched with one user's credentials are never served to another user
+    that may not see them, even through a shared OAuth client. A write still
+    drops the stale entries of every identity on the portal.
+
+    On disk, responses are filed in a directory tree mirroring the endpoint
+    (requests/100/<digest>.json), which lets a write drop the entries of a
+    record, its sub-resources and the lists above it without scanning the
+    whole cache.
+
+    Each process counts the entries it adds since it last walked the tree
+    and prunes once the count exceeds disk_entries by PRUNE_SLACK, so a
+    put walks the tree only about once per PRUNE_SLACK * disk_entries puts.
+    """
+
+    def __init__(self, key, memory_entries=DEFAULT_MEMORY_ENTRIES, disk_entries=DEFAULT_DISK_ENTRIES, directory=None,
+                 identity=None):
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        # One directory per portal, holding one sub-directory per identity
+        self.root = directory or cache_path('responses', cache_key(key))
+        self.directory = os.path.join(self.root, cache_key(identity))
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        # Estimated number of disk entries of this identity, None until the tree is first walked
+        self._disk_count = None
+
+    @staticmethod
+    def _key(endpoint, data):
+        return (endpoint.strip('/'), json.dumps(data, sort_keys=True) if data else None)
+
+    def _path(self, key):
+        endpoint, data = key
+        return os.path.join(self.directory, *(_endpoint_parts(endpoint) + ['{0}.json'.format(cache_key(endpoint, data))]))
+
+    def get(self, endpoint, data, ttl):
+        """Return a copy of the cached response if it is at most ttl seconds old, else None."""
+        key = self._key(endpoint, data)
+        path = self._path(key)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            # A write from another process removes the disk entry; the memory copy must not outlive it
+            if entry is not None and now - entry[0] <= ttl and os.path.exists(path):
+                self._memory.move_to_end(key)
+                return copy.deepcopy(entry[1])
+
+        value = load_json(path, max_age=ttl)
+        if value is None:
+            return None
+        try:
+            # Disk entries are evicted by least recent use, tracked by mtime
+            os.utime(path, None)
+        except OSError:
+            pass
+        self._remember(key, value, now)
+        return copy.deepcopy(value)
+
+    def put(self, endpoint, data, value):
+        """Cache a parsed response in both tiers."""
+        key = self._key(endpoint, data)
+        value = copy.deepcopy(value)
+        self._remember(key, value, time.time())
+
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory, 0o700)
+            save_json(path, value)
+        except (IOError, OSError):
+            # The disk tier is best effort; a racing invalidation may remove the directory
+            return
+        with self._lock:
+            if self._disk_count is not None:
+                self._disk_count += 1
+            due = self._disk_count is None or self._disk_count > self.disk_entries * (1 + PRUNE_SLACK)
+        if due:
+            self._prune()
+
+    def _remember(self, key, value, saved_at):
+        with self._lock:
+            self._memory[key] = (saved_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _prune(self):
+        """Remove the least recently used disk entries beyond disk_entries."""
+        entries = []
+        for root, _dirs, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.json'):
+                    path = os.path.join(root, name)
+                    try:
+                        entries.append((os.path.getmtime(path), path))
+                    except OSError:
+                        continue
+        with self._lock:
+            self._disk_count = min(len(entries), self.disk_entries)
+        if len(entries) <= self.disk_entries:
+            return
+        entries.sort()
+        for _mtime, path in entries[:len(entries) - self.disk_entries]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def invalidate(self, endpoint, subtree=True):
+        """Drop the cached responses a write to endpoint may have made stale.
+
+        The query string is ignored, except for the ids of a multi-record
+        write ('requests?ids=1,2'), which drops the lists and the entries of
+        every record named.
+
+        Args:
+            endpoint: The endpoint written to (e.g., 'requests/100').
+            subtree: Also drop entries below endpoint; creating a record
+                (a POST to the list endpoint) only makes lists stale.
+        """
+        path, _sep, query = endpoint.partition('?')
+        path = path.strip('/')
+        ids = [record_id.strip() for value in parse_qs(query).get('ids', []) for record_id in value.split(',')]
+        ids = [record_id for record_id in ids if record_id]
+        if not ids:
+            self._invalidate(path, subtree)
+            return
+        self._invalidate(path, False)
+        for record_id in ids:
+            self._invalidate('{0}/{1}'.format(path, record_id), True)
+
+    def _invalidate(self, endpoint, subtree):
+        with self._lock:
+            for key in list(self._memory):
+                cached = _endpoint_path(key[0])
+                if not subtree and cached.startswith(endpoint + '/'):
+                    continue
+                if _is_related(cached, endpoint):
+                    del self._memory[key]
+
+        try:
+            identities = os.listdir(self.root)
+        except OSError:
+            return
+        parts = _endpoint_parts(endpoint)
+        for identity in identities:
+            directory = os.path.join(self.root, identity)
+            if not os.path.isdir(directory):
+                continue
+            for depth in range(len(parts) + 1):
+                self._remove_files(os.path.join(directory, *parts[:depth]))
+            if subtree:
+                shutil.rmtree(os.path.join(directory, *parts), ignore_errors=True)
+
+    @staticmethod
+    def _remove_files(directory):
+        """Remove the cached responses directly inside directory (not its sub-directories)."""
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(directory, name)
+            if name.endswith('.json') and os.path.isfile(path):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
@@ -0,0 +1,582 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Command-line tool for bulk jobs, run without ansible-playbook::
+
+    python -m ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_cli \\
+        --domain sdpondemand.manageengine.com --portal-name ithelpdesk --dc US \\
+        export request --output requests.jsonl --checkpoint requests.checkpoint
+
+Subcommands: export, import, bulk-update and bulk-delete. They use
+SDPCoreClient and the helpers behind the sdp_import and bulk write modules,
+so payloads, validation, journals and checkpoints behave as in playbooks.
+Credentials come from the options or the SDP_CLOUD_* environment variables.
+Progress goes to stderr and the result is printed to stdout as JSON.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.bulk_helpers import (
+    apply_operations, bulk_delete, bulk_update, summarize_operations,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.concurrency import (
+    DEFAULT_CONCURRENCY, adaptive_limiter, validate_concurrency,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.field_schema import FieldValidationError
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.import_helpers import (
+    SOURCE_FORMATS, detect_format, iter_batches, iter_source_rows, load_checkpoint, load_failures, map_row,
+    save_checkpoint,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.journal import RETRYABLE_STATUSES, open_journal
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.local_cache import load_json
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import DC_CHOICES, MODULE_CONFIG
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_core import (
+    DEFAULT_TIMEOUT, ENV_AUTH_TOKEN, ENV_CLIENT_ID, ENV_CLIENT_SECRET, ENV_REFRESH_TOKEN, SDPAPIError, SDPCoreClient,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.time_windows import (
+    DEFAULT_WINDOW_RECORDS, PARTITION_FIELDS, fetch_windows, plan_windows, time_bounds, window_criteria, window_key,
+)
+
+
+# Seconds between two progress lines
+PROGRESS_INTERVAL = 2.0
+
+
+class CommandError(Exception):
+    """Raised when a command cannot run or finish; result holds the partial result to report."""
+
+    def __init__(self, msg, **result):
+        super(CommandError, self).__init__(msg)
+        self.msg = msg
+        self.result = result
+
+
+class CommandContext:
+    """Stands in for the AnsibleModule that the shared helpers take.
+
+    params holds the module options matching the command line, warnings are
+    printed to stderr and fail_json() raises CommandError.
+    """
+
+    def __init__(self, params, check_mode=False, stream=None):
+        self.params = params
+        self.check_mode = check_mode
+        self.stream = stream or sys.stderr
+
+    def warn(self, msg):
+        print("warning: {0}".format(msg), file=self.stream)
+
+    def fail_json(self, msg, **kwargs):
+        raise CommandError(msg, **kwargs)
+
+
+class Progress:
+    """Counts units of work and prints the count and rate to stderr every 'interval' seconds."""
+
+    def __init__(self, label, unit, stream=None, interval=PROGRESS_INTERVAL, enabled=True):
+        self.label = label
+        self.unit = unit
+        self.stream = stream or sys.stderr
+        self.interval = interval
+        self.enabled = enabled
+        self.count = 0
+        self.started = time.time()
+        self._reported = self.started
+        self._lock = threading.Lock()
+
+    def add(self, count=1):
+        with self._lock:
+            self.count += count
+            now = time.time()
+            if self.enabled and now - self._reported >= self.interval:
+                self._reported = now
+                self._print(now)
+
+    def finish(self):
+        if self.enabled:
+            with self._lock:
+                self._print(time.time())
+
+    def _print(self, now):
+        elapsed = max(now - self.started, 1e-6)
+        print("{0}: {1} {2}, {3:.1f}/s".format(self.label, self.count, self.unit, self.count / elapsed), file=self.stream)
+
+
+class CLIClient(SDPCoreClient):
+    """SDPCoreClient that counts its write calls in a Progress, if one is set."""
+
+    progress = None
+
+    def call(self, endpoint, method='GET', data=None, max_retries=3, retry_delay=2, cache_ttl=None):
+        try:
+            return super(CLIClient, self).call(endpoint, method=method, data=data, max_retries=max_retries,
+                                               retry_delay=retry_delay, cache_ttl=cache_ttl)
+        finally:
+            if self.progress is not None and method != 'GET':
+                self.progress.add()
+
+
+def _parse_pairs(pairs, option):
+    """Turn repeated KEY=VALUE options into a dict."""
+    result = {}
+    for pair in pairs or []:
+        key, sep, value = pair.partition('=')
+        if not sep:
+            raise CommandError("{0} expects KEY=VALUE, got '{1}'.".format(option, pair))
+        result[key.strip()] = value
+    return result
+
+
+def _parse_json(text, option):
+    try:
+        return json.loads(text)
+    except ValueError as e:
+        raise CommandError("{0} is not valid JSON: {1}".format(option, e))
+
+
+def _read_ids(args):
+    """Return the record ids given with --ids and --ids-file ('-' reads stdin)."""
+    ids = [record_id for value in args.ids or [] for record_id in value.split(',')]
+    if args.ids_file:
+        try:
+            if args.ids_file == '-':
+                ids.extend(line.strip() for line in sys.stdin)
+            else:
+                with open(args.ids_file) as f:
+                    ids.extend(line.strip() for line in f)
+        except (IOError, OSError) as e:
+            raise CommandError("Failed to read {0}: {1}".format(args.ids_file, e))
+    ids = [record_id for record_id in ids if record_id.strip()]
+    if not ids:
+        raise CommandError("No record ids given; use --ids or --ids-file.")
+    return ids
+
+
+def _command_params(args):
+    """Return the module-style params of the command, as read by the shared helpers."""
+    return dict(
+        parent_module_name=args.entity,
+        parent_id=None,
+        concurrency=args.concurrency,
+        adaptive_concurrency=args.adaptive_concurrency,
+        journal=getattr(args, 'journal', None),
+        resume=getattr(args, 'resume', False),
+        skip_existence_check=getattr(args, 'skip_existence_check', False),
+    )
+
+
+def connect(args, context):
+    """Build the client from the connection options, falling back to the SDP_CLOUD_* credential variables."""
+    auth_token = args.auth_token or os.environ.get(ENV_AUTH_TOKEN)
+    client_id = args.client_id or os.environ.get(ENV_CLIENT_ID)
+    client_secret = args.client_secret or os.environ.get(ENV_CLIENT_SECRET)
+    refresh_token = args.refresh_token or os.environ.get(ENV_REFRESH_TOKEN)
+
+    # The same rules as AUTH_MUTUALLY_EXCLUSIVE and AUTH_REQUIRED_TOGETHER in the modules
+    refresh = (client_id, client_secret, refresh_token)
+    if auth_token and any(refresh):
+        raise CommandError("auth_token cannot be combined with client_id, client_secret or refresh_token.")
+    if any(refresh) and not all(refresh):
+        raise CommandError("client_id, client_secret and refresh_token must be given together.")
+
+    try:
+        return CLIClient(args.domain, args.portal_name, dc=args.dc, auth_token=auth_token, client_id=client_id,
+                         client_secret=client_secret, refresh_token=refresh_token, timeout=args.timeout,
+                         deadline=args.deadline, warn=context.warn, limiter=adaptive_limiter(context))
+    except ValueError as e:
+        raise CommandError(str(e))
+
+
+def _load_export_checkpoint(path, output, query, **state):
+    """Return the checkpoint of an earlier export of the same query to output, or a fresh one with state."""
+    fresh = dict(state, output=os.path.abspath(output), query=query)
+    checkpoint = load_json(path) if path else None
+    if not checkpoint:
+        return fresh
+    if checkpoint.get('output') != fresh['output'] or checkpoint.get('query') != query:
+        raise CommandError("Checkpoint {0} belongs to another export ({1}). Remove it or use another checkpoint file.".format(
+            path, checkpoint.get('output')))
+    if 'offset' in checkpoint and (not os.path.exists(output) or os.path.getsize(output) < checkpoint['offset']):
+        raise CommandError("{0} is shorter than checkpoint {1} records; remove the checkpoint to export again.".format(
+            output, path))
+    return checkpoint
+
+
+def run_export(args, context, client, progress):
+    """Write every record matching the query to a JSONL file, resuming from the checkpoint."""
+    endpoint = MODULE_CONFIG[args.entity]['endpoint']
+    query = dict(row_count=args.row_count, sort_field=args.sort_field, sort_order=args.sort_order)
+    if args.search_criteria:
+        query['search_criteria'] = _parse_json(args.search_criteria, '--search-criteria')
+    if args.fields:
+        query['fields_required'] = [field.strip() for field in args.fields.split(',') if field.strip()]
+    if args.partition_by:
+        return run_partitioned_export(args, context, client, progress, endpoint, query)
+    if args.since is not None or args.until is not None:
+        raise CommandError("--since and --until require --partition-by.")
+
+    checkpoint = _load_export_checkpoint(args.checkpoint, args.output, query, records=0, offset=0)
+    exported = skipped = checkpoint['records']
+    list_info = dict(query, start_index=exported + 1)
+
+    def _commit(f):
+        f.flush()
+        os.fsync(f.fileno())
+        checkpoint.update(records=exported, offset=f.tell())
+        save_checkpoint(args.checkpoint, checkpoint)
+
+    try:
+        with open(args.output, 'r+b' if checkpoint['offset'] else 'wb') as f:
+            # Records written after the last checkpoint are fetched again
+            f.seek(checkpoint['offset'])
+            f.truncate()
+            try:
+                for record in client.iter_records(endpoint, endpoint, list_info):
+                    f.write(json.dumps(record, sort_keys=True).encode('utf-8') + b'\n')
+                    exported += 1
+                    progress.add()
+                    if exported % args.row_count == 0:
+                        _commit(f)
+            except SDPAPIError as e:
+                # Only whole pages are committed, so the next run continues at a page boundary
+                raise CommandError(e.msg, records=checkpoint['records'], **dict(
+                    (key, value) for key, value in e.fail_kwargs.items() if key != 'msg'))
+            _commit(f)
+    except (IOError, OSError) as e:
+        raise CommandError("Failed to write {0}: {1}".format(args.output, e))
+
+    return dict(output=args.output, records=exported, skipped=skipped)
+
+
+def _plan_export_windows(args, context, client, endpoint, search_criteria):
+    """Plan the time windows of a partitioned export between --since and --until (default: all records)."""
+    field = args.partition_by
+    start, end = args.since, args.until
+    if start is None or end is None:
+        bounds = time_bounds(client, endpoint, field, search_criteria)
+        if bounds is None:
+            return []
+        start = bounds[0] if start is None else start
+        end = bounds[1] if end is None else end
+    if start >= end:
+        return []
+    return plan_windows(client, endpoint, field, start, end, args.window_records, validate_concurrency(context),
+                        search_criteria)
+
+
+def run_partitioned_export(args, context, client, progress, endpoint, query):
+    """Export in time windows of the --partition-by field, fetched concurrently.
+
+    Windows are planned from count probes, and each one is read with its own
+    range condition instead of offset paging. A window is written to its own
+    part file and retried on its own when it fails. With --checkpoint, the
+    plan and the finished windows are saved, so a rerun only fetches the
+    windows that are missing. The part files are joined in time order once
+    every window is done.
+    """
+    if args.window_records < 1:
+        raise CommandError("--window-records must be at least 1.")
+    field = args.partition_by
+    search_criteria = query.pop('search_criteria', None)
+    query.update(partition_by=field, since=args.since, until=args.until, window_records=args.window_records,
+                 search_criteria=search_criteria)
+    checkpoint = _load_export_checkpoint(args.checkpoint, args.output, query, windows=None, done={})
+    if checkpoint.get('assembled'):
+        return dict(output=args.output, records=sum(checkpoint['done'].values()), windows=len(checkpoint['windows']),
+                    skipped=len(checkpoint['windows']))
+
+    if checkpoint['windows'] is None:
+        checkpoint['windows'] = _plan_export_windows(args, context, client, endpoint, search_criteria)
+        save_checkpoint(args.checkpoint, checkpoint)
+    windows = checkpoint['windows']
+    done = checkpoint['done']
+    skipped = len(done)
+    list_info = dict(row_count=args.row_count, sort_field=field, sort_order='asc')
+    if query.get('fields_required'):
+        list_info['fields_required'] = query['fields_required']
+    parts = args.output + '.parts'
+    lock = threading.Lock()
+
+    def _part(window):
+        return os.path.join(parts, window_key(window) + '.jsonl')
+
+    def _fetch(window):
+        count = 0
+        try:
+            with open(_part(window), 'wb') as f:
+                criteria = window_criteria(field, window['start'], window['end'], search_criteria)
+                for record in client.iter_records(endpoint, endpoint, dict(list_info, search_criteria=criteria)):
+                    f.write(json.dumps(record, sort_keys=True).encode('utf-8') + b'\n')
+                    count += 1
+                    progress.add()
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception:
+            # A retried window starts over
+            progress.add(-count)
+            raise
+        with lock:
+            done[window_key(window)] = count
+            save_checkpoint(args.checkpoint, checkpoint)
+        return count
+
+    try:
+        try:
+            if not os.path.isdir(parts):
+                os.makedirs(parts)
+            pending = [window for window in windows if window_key(window) not in done]
+            results = fetch_windows(_fetch, pending, validate_concurrency(context), remaining_time=client.remaining_time)
+            failed = [dict(start=window['start'], end=window['end'], msg=str(error), status=getattr(error, 'status', None))
+                      for window, _count, error in results if error is not None]
+            if failed:
+                raise CommandError("{0} of {1} windows failed.{2}".format(
+                    len(failed), len(windows), " Run the command again to fetch only those." if args.checkpoint else ''),
+                    records=sum(done.values()), windows=len(windows), failed=failed)
+
+            with open(args.output, 'wb') as output:
+                for window in windows:
+                    with open(_part(window), 'rb') as part:
+                        shutil.copyfileobj(part, output)
+                output.flush()
+                os.fsync(output.fileno())
+        except (IOError, OSError) as e:
+            raise CommandError("Failed to write {0}: {1}".format(args.output, e))
+        checkpoint['assembled'] = True
+        save_checkpoint(args.checkpoint, checkpoint)
+        shutil.rmtree(parts, ignore_errors=True)
+    finally:
+        if not args.checkpoint:
+            # Without a checkpoint an interrupted export cannot be resumed, so its part files are useless
+            shutil.rmtree(parts, ignore_errors=True)
+
+    return dict(output=args.output, records=sum(done.values()), windows=len(windows), skipped=skipped)
+
+
+def _plan_import_batch(client, entity, batch, field_map, from_csv):
+    """Validate one batch of source rows like sdp_import, with the core client's payload builder."""
+    entity_config = MODULE_CONFIG[entity]
+    mandatory_field = entity_config.get('mandatory_field')
+    operations = []
+    failed = []
+
+    for row_number, record, error in batch:
+        data = None
+        if error is None:
+            payload = map_row(entity, record, field_map, from_csv, lambda: client.udf_metadata(entity))
+            if mandatory_field and not payload.get(mandatory_field):
+                error = "'{0}' is required when creating a new {1}.".format(mandatory_field, entity)
+        if error is None:
+            try:
+                data = client.build_payload(entity, payload)
+            except FieldValidationError as e:
+                error = str(e)
+        if data is None:
+            failed.append(dict(row=row_number, msg=error, status=None))
+            continue
+        operations.append(dict(action='create', key='row:{0}'.format(row_number), id=None, row=row_number,
+                               method='POST', endpoint=entity_config['endpoint'], data=data))
+
+    return operations, failed
+
+
+def run_import(args, context, client, progress):
+    """Create one record per row of a CSV or JSONL file, batch by batch, like the sdp_import module."""
+    if not (1 <= args.batch_size <= 1000):
+        raise CommandError("batch_size must be between 1 and 1000.")
+    concurrency = validate_concurrency(context)
+    field_map = _parse_pairs(args.map, '--map')
+    source_format = detect_format(args.src, args.format)
+    checkpoint = load_checkpoint(context, args.checkpoint, args.src)
+    journal = None if args.dry_run else open_journal(context, args.entity)
+
+    skipped = checkpoint['row']
+    created = created_before = checkpoint['created']
+    failed = load_failures(args.checkpoint, checkpoint)
+    rows = 0
+
+    def _partial():
+        return dict(rows=rows, skipped=skipped, created=created, last_row=checkpoint['row'], failed=failed)
+
+    try:
+        for batch in iter_batches(iter_source_rows(args.src, source_format, skipped), args.batch_size):
+            try:
+                client.check_deadline("Rows up to {0} are committed.".format(checkpoint['row']))
+            except SDPAPIError as e:
+                raise CommandError(e.msg, **_partial())
+            rows += len(batch)
+            committed_failures = len(failed)
+            operations, invalid = _plan_import_batch(client, args.entity, batch, field_map, source_format == 'csv')
+            failed.extend(invalid)
+
+            if args.dry_run:
+                created += len(operations)
+                checkpoint['row'] = batch[-1][0]
+                progress.add(len(batch))
+                continue
+
+            summary = summarize_operations(args.entity, apply_operations(
+                client, operations, concurrency, journal, args.resume))
+            created += len(summary['created'])
+            rows_by_key = dict((op['key'], op['row']) for op in operations)
+            failed.extend(dict(row=rows_by_key[entry['key']], msg=entry['msg'], status=entry['status'])
+                          for entry in summary['failed'])
+            progress.add(len(batch))
+
+            # A batch with retryable failures stays uncommitted so the next run retries it, and with a
+            # journal and --resume replays only its pending and retryable rows
+            if any(entry['status'] in RETRYABLE_STATUSES for entry in summary['failed']):
+                break
+
+            checkpoint.update(row=batch[-1][0], created=created)
+            save_checkpoint(args.checkpoint, checkpoint, failed[committed_failures:])
+    except (IOError, OSError) as e:
+        raise CommandError("Failed to read {0}: {1}".format(args.src, e), **_partial())
+
+    failed.sort(key=lambda entry: entry['row'])
+    return dict(_partial(), changed=created > created_before)
+
+
+def run_bulk_update(args, context, client, progress):
+    """Apply one payload to many records, updating only those that differ."""
+    if args.payload:
+        fields = _parse_json(args.payload, '--payload')
+        if not isinstance(fields, dict):
+            raise CommandError("--payload must be a JSON object.")
+    else:
+        fields = {}
+    fields.update(_parse_pairs(args.set, '--set'))
+    if not fields:
+        raise CommandError("Nothing to update; use --set or --payload.")
+    try:
+        data = client.build_payload(args.entity, fields)
+    except FieldValidationError as e:
+        raise CommandError(str(e))
+
+    journal = None if args.dry_run else open_journal(context, args.entity)
+    # Bulk writes report progress per write call, counted by the client
+    client.progress = progress
+    result = bulk_update(context, client, args.entity, _read_ids(args), data, validate_concurrency(context),
+                         args.skip_existence_check, journal)
+    return dict(result, changed=bool(result['updated']) and not args.dry_run)
+
+
+def run_bulk_delete(args, context, client, progress):
+    """Delete many records; ids that no longer exist are reported as already absent, so a re-run is safe."""
+    client.progress = progress
+    result = bulk_delete(context, client, args.entity, _read_ids(args), validate_concurrency(context),
+                         args.skip_existence_check)
+    return dict(result, changed=bool(result['deleted']) and not args.dry_run)
+
+
+def build_parser():
+    """Return the argument parser of the command line tool."""
+    parser = argparse.ArgumentParser(
+        prog='sdp_cli', description="Bulk exports, imports, updates and deletes for ServiceDesk Plus Cloud.")
+    parser.add_argument('--domain', required=True, help="Portal domain, e.g. sdpondemand.manageengine.com.")
+    parser.add_argument('--portal-name', required=True, help="Portal name, e.g. ithelpdesk.")
+    parser.add_argument('--dc', required=True, choices=DC_CHOICES, help="Data centre of the portal.")
+    parser.add_argument('--auth-token', help="OAuth access token (default: ${0}).".format(ENV_AUTH_TOKEN))
+    parser.add_argument('--client-id', help="OAuth client id (default: ${0}).".format(ENV_CLIENT_ID))
+    parser.add_argument('--client-secret', help="OAuth client secret (default: ${0}).".format(ENV_CLIENT_SECRET))
+    parser.add_argument('--refresh-token', help="OAuth refresh token (default: ${0}).".format(ENV_REFRESH_TOKEN))
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT, help="Seconds per API attempt.")
+    parser.add_argument('--deadline', type=int, help="Wall-clock budget of the whole run, in seconds.")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help="Parallel API calls of bulk writes (1-32, default %(default)s).")
+    parser.add_argument('--adaptive-concurrency', action='store_true',
+                        help="Adjust the parallel calls to the portal's throttling, starting at --concurrency.")
+    parser.add_argument('--quiet', action='store_true', help="Do not print progress to stderr.")
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    commands.required = True
+
+    def _command(name, handler, unit, help_text):
+        command = commands.add_parser(name, help=help_text, description=help_text)
+        command.add_argument('entity', choices=list(MODULE_CONFIG.keys()), help="Entity to work on.")
+        command.set_defaults(handler=handler, unit=unit)
+        return command
+
+    def _ids(command):
+        command.add_argument('--ids', action='append', help="Comma-separated record ids; repeatable.")
+        command.add_argument('--ids-file', help="File with one record id per line ('-' for stdin).")
+        command.add_argument('--skip-existence-check', action='store_true',
+                             help="Do not fetch the records first; write every id.")
+        command.add_argument('--dry-run', action='store_true', help="Report what would change without writing.")
+
+    export = _command('export', run_export, 'records', "Export records to a JSONL file.")
+    export.add_argument('--output', required=True, help="JSONL file to write, one record per line.")
+    export.add_argument('--checkpoint', help="File recording the records written; an interrupted export resumes from it.")
+    export.add_argument('--fields', help="Comma-separated fields to request (list_info fields_required).")
+    export.add_argument('--search-criteria', help="list_info search_criteria, as JSON.")
+    export.add_argument('--sort-field', default='created_time', help="Sort field (default %(default)s).")
+    export.add_argument('--sort-order', default='asc', choices=['asc', 'desc'], help="Sort order (default %(default)s).")
+    export.add_argument('--row-count', type=int, default=100, choices=range(1, 101), metavar='1-100',
+                        help="Records per page (default %(default)s).")
+    export.add_argument('--partition-by', choices=list(PARTITION_FIELDS),
+                        help="Split the export into time windows of this field, fetched concurrently (--concurrency).")
+    export.add_argument('--window-records', type=int, default=DEFAULT_WINDOW_RECORDS,
+                        help="Records aimed for per window (default %(default)s).")
+    export.add_argument('--since', type=int, help="With --partition-by, start of the export in epoch milliseconds.")
+    export.add_argument('--until', type=int, help="With --partition-by, end (exclusive) of the export in epoch milliseconds.")
+
+    importer = _command('import', run_import, 'rows', "Create one record per row of a CSV or JSONL file.")
+    importer.add_argument('src', help="CSV (with a header row) or JSONL file.")
+    importer.add_argument('--format', choices=list(SOURCE_FORMATS), help="Source format (default: from the extension).")
+    importer.add_argument('--map', action='append', metavar='COLUMN=FIELD',
+                          help="Map a source column to a field; an empty FIELD ignores the column. Repeatable.")
+    importer.add_argument('--batch-size', type=int, default=100, help="Rows per batch (1-1000, default %(default)s).")
+    importer.add_argument('--checkpoint', help="File recording the last committed row; a re-run continues after it.")
+    importer.add_argument('--journal', help="Write-ahead journal, so no row of an interrupted batch is created twice.")
+    importer.add_argument('--resume', action='store_true', help="Continue the interrupted run recorded in --journal.")
+    importer.add_argument('--dry-run', action='store_true', help="Read and validate every row without creating any.")
+
+    update = _command('bulk-update', run_bulk_update, 'writes', "Apply the same field values to many records.")
+    _ids(update)
+    update.add_argument('--set', action='append', metavar='FIELD=VALUE', help="Field value to set. Repeatable.")
+    update.add_argument('--payload', help="Field values as a JSON object, like the modules' payload option.")
+    update.add_argument('--journal', help="Write-ahead journal of the updates.")
+    update.add_argument('--resume', action='store_true', help="Continue the interrupted run recorded in --journal.")
+
+    delete = _command('bulk-delete', run_bulk_delete, 'deletes', "Delete many records.")
+    _ids(delete)
+
+    return parser
+
+
+def main(argv=None, stdout=None, stderr=None):
+    """Run the command line tool; returns the exit status (0 ok, 1 failed, 130 interrupted)."""
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    args = build_parser().parse_args(argv)
+    context = CommandContext(_command_params(args), check_mode=getattr(args, 'dry_run', False), stream=stderr)
+    progress = Progress('{0} {1}'.format(args.command, args.entity), args.unit, stream=stderr, enabled=not args.quiet)
+
+    try:
+        client = connect(args, context)
+        result = args.handler(args, context, client, progress)
+    except (CommandError, SDPAPIError) as e:
+        result = dict(e.result, msg=e.msg) if isinstance(e, CommandError) else dict(e.fail_kwargs)
+        print("error: {0}".format(e.msg), file=stderr)
+        print(json.dumps(result, indent=2, sort_keys=True, default=str), file=stdout)
+        return 1
+    except KeyboardInterrupt:
+        print("interrupted; run the same command again (with --resume if a journal is used) to continue.", file=stderr)
+        return 130
+    finally:
+        progress.finish()
+
+    print(json.dumps(result, indent=2, sort_keys=True, default=str), file=stdout)
+    return 1 if result.get('failed') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,967 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Core SDP Cloud API client, usable without Ansible.
+
+Everything here depends only on the Python standard library and reports
+failures by raising SDPAPIError. api_util.SDPClient adapts it to an
+AnsibleModule; plain Python workers use SDPCoreClient directly::
+
+    client = SDPCoreClient('sdpondemand.manageengine.com', 'ithelpdesk', dc='US',
+                           client_id=..., client_secret=..., refresh_token=...)
+    for record in client.iter_records('requests', 'requests'):
+        ...
+    changed, record = client.upsert('request', {'subject': 'Disk full'}, record_id='100')
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from queue import Full, Queue
+from urllib.parse import urlencode
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.cassette import Cassette
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.compression import (
+    ACCEPT_ENCODING, DecodingResponse, content_encoding, decode_body, is_supported,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.error_handler import parse_error_info
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.field_schema import FieldValidationError, get_entity_schema
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.gateway import ConnectionPool, Gateway, GatewayUnavailable
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.hedging import Hedger
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.json_stream import iter_json_list
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.local_cache import cache_key
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.response_cache import ResponseCache
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import DC_MAP, MODULE_CONFIG
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.udf_utils import UDF_METADATA_TTL, is_udf_field
+
+
+# Environment variable names for credential fallback
+ENV_AUTH_TOKEN = 'SDP_CLOUD_AUTH_TOKEN'
+ENV_CLIENT_ID = 'SDP_CLOUD_CLIENT_ID'
+ENV_CLIENT_SECRET = 'SDP_CLOUD_CLIENT_SECRET'
+ENV_REFRESH_TOKEN = 'SDP_CLOUD_REFRESH_TOKEN'
+
+# Number of list pages kept in flight ahead of callers that keep every record anyway (0 disables prefetching)
+ENV_PREFETCH_DEPTH = 'SDP_CLOUD_PREFETCH_DEPTH'
+DEFAULT_PREFETCH_DEPTH = 1
+
+# Seconds to wait to connect or for data, per attempt (fetch_url's own default)
+DEFAULT_TIMEOUT = 10
+
+_LOG = logging.getLogger(__name__)
+
+
+class SDPAPIError(Exception):
+    """Raised by SDPCoreClient.call() when an API call fails.
+
+    fail_kwargs holds the keyword arguments SDPClient.request() passes to
+    module.fail_json(), so raising and failing paths report identical errors.
+    """
+
+    def __init__(self, msg, **kwargs):
+        super(SDPAPIError, self).__init__(msg)
+        self.msg = msg
+        self.status = kwargs.get('status')
+        self.fail_kwargs = dict(kwargs, msg=msg)
+
+    @classmethod
+    def from_info(cls, info, default_msg):
+        """Build the error from a fetch_url info dict."""
+        kwargs = parse_error_info(info, default_msg)
+        return cls(kwargs.pop('msg'), **kwargs)
+
+
+class DeadlineExceeded(SDPAPIError):
+    """Raised when the client's 'deadline' is reached before a call could complete."""
+
+    def __init__(self, msg, **kwargs):
+        kwargs.setdefault('status', -1)
+        super(DeadlineExceeded, self).__init__(msg, **kwargs)
+
+
+class _Flight:
+    """One in-flight GET shared by every caller asking for the same URL and input_data."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _PooledResponse:
+    """Response of PooledTransport; its connection returns to the pool once the body is read."""
+
+    def __init__(self, pool, key, connection, response):
+        self._pool = pool
+        self._key = key
+        self._connection = connection
+        self._response = response
+        self.status = self.code = response.status
+
+    def read(self, size=-1):
+        data = self._response.read() if size is None or size < 0 else self._response.read(size)
+        if self._connection is not None and self._response.isclosed():
+            if self._response.will_close:
+                self._connection.close()
+            else:
+                self._pool.release(self._key, self._connection)
+            self._connection = None
+        return data
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class PooledTransport:
+    """Standard library HTTP transport over keep-alive connections.
+
+    Called like fetch_url without the module: transport(url, data, method,
+    headers, timeout) returns (response, info). The response is not
+    decompressed; info holds the lowercased response headers, 'status' and
+    'msg', plus 'body' for HTTP errors. Transport failures are reported as
+    status -1.
+    """
+
+    def __init__(self, pool=None):
+        self.pool = pool or ConnectionPool()
+
+    def __call__(self, url, data=None, method='GET', headers=None, timeout=DEFAULT_TIMEOUT):
+        body = data.encode('utf-8') if isinstance(data, str) else data
+        try:
+            key, connection, response = self.pool.request(method, url, headers or {}, body, timeout)
+        except Exception as e:
+            return None, {'status': -1, 'msg': 'Request failed: {0}'.format(e), 'url': url}
+
+        info = dict((name.lower(), value) for name, value in response.getheaders())
+        info.update(status=response.status, msg='OK', url=url)
+        response = _PooledResponse(self.pool, key, connection, response)
+        if info['status'] < 400:
+            return response, info
+
+        try:
+            info['body'] = response.read()
+        except Exception:
+            response.close()
+        info['msg'] = 'HTTP Error {0}: {1}'.format(info['status'], response._response.reason)
+        return None, info
+
+
+class SDPCoreClient:
+    """SDP Cloud API client: auth, transport, retries, paging, payloads and diffs.
+
+    The opt-in features configured by SDP_CLOUD_* environment variables
+    (cassette, circuit breaker, hedging, gateway, prefetch depth) apply as
+    they do in the modules. Invalid settings raise ValueError.
+
+    Args:
+        domain, portal_name, dc: Portal address and data centre, as the modules take them.
+        auth_token: An access token; or client_id, client_secret and refresh_token to generate one.
+        timeout: Seconds per attempt to connect or wait for data.
+        deadline: Optional wall-clock budget, in seconds, of every call made by the client.
+        transport: Callable sending one HTTP request (see PooledTransport, the default).
+        warn: Callable receiving warning messages; they are logged by default.
+        limiter: Optional concurrency.AdaptiveLimiter gating every call.
+    """
+
+    # HTTP status codes that are safe to retry (transient errors)
+    RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    def __init__(self, domain, portal_name, dc=None, auth_token=None, client_id=None, client_secret=None,
+                 refresh_token=None, timeout=DEFAULT_TIMEOUT, deadline=None, transport=None, warn=None, limiter=None):
+        self.domain = domain
+        self.portal = portal_name
+        self.auth_token = auth_token
+
+        # OAuth params
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.refresh_token = refresh_token
+        self.dc = dc
+
+        self.base_url = "https://{0}/app/{1}/api/v3".format(self.domain, self.portal)
+        self.transport = transport or PooledTransport()
+        self.warn = warn or _LOG.warning
+        self.limiter = limiter
+        # Passed to the cassette, which fails it on a replay miss; None raises LookupError instead
+        self.module = None
+
+        # Per-attempt timeout, and the wall-clock budget of the whole run
+        self.timeout = timeout or DEFAULT_TIMEOUT
+        self.deadline = deadline
+        if self.timeout <= 0 or (self.deadline is not None and self.deadline <= 0):
+            raise ValueError("timeout and deadline must be positive numbers of seconds.")
+        self.deadline_at = time.time() + self.deadline if self.deadline else None
+
+        try:
+            self.prefetch_depth = int(os.environ.get(ENV_PREFETCH_DEPTH, DEFAULT_PREFETCH_DEPTH))
+        except ValueError:
+            raise ValueError("{0} must be an integer.".format(ENV_PREFETCH_DEPTH))
+
+        # Opt-in record/replay of every HTTP interaction (see cassette.py)
+        try:
+            self.cassette = Cassette.from_env()
+        except ValueError as e:
+            raise ValueError("Invalid cassette configuration: {0}".format(e))
+
+        # Opt-in fail-fast breaker shared by all forks calling this portal (see circuit_breaker.py)
+        try:
+            self.breaker = CircuitBreaker.from_env(self.base_url)
+        except (ValueError, IOError, OSError) as e:
+            raise ValueError("Invalid circuit breaker configuration: {0}".format(e))
+
+        # Opt-in local daemon holding connections and tokens for every process on the host (see gateway.py)
+        try:
+            self.gateway = Gateway.from_env()
+        except ValueError as e:
+            raise ValueError("Invalid gateway configuration: {0}".format(e))
+        if self.gateway is not None and not self.gateway.ensure_running():
+            self.warn("SDP gateway could not be started; calling the API directly.")
+            self.gateway = None
+
+        # Serializes token refreshes between worker threads
+        self._auth_lock = threading.Lock()
+
+        # Bytes received on the wire versus after decompression, across all calls
+        self.metrics = dict(responses=0, bytes_wire=0, bytes_decoded=0, coalesced_requests=0, cache_hits=0)
+        self._metrics_lock = threading.Lock()
+
+        # Identical GETs in flight on other threads, by (endpoint, input_data)
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+
+        # Whose view of the portal cached data is: entries are kept per refresh token (or per access token
+        # without one), as users sharing one OAuth client may not see the same records
+        self.cache_identity = cache_key(self.client_id, self.refresh_token) if self.client_id else self.auth_token
+
+        # GET responses reused for calls passing cache_ttl; writes drop what they make stale
+        self.response_cache = ResponseCache(self.base_url, identity=self.cache_identity)
+
+        # Opt-in hedging of slow GETs (see hedging.py)
+        try:
+            self.hedger = Hedger.from_env(self.base_url)
+        except (ValueError, IOError, OSError) as e:
+            raise ValueError("Invalid hedging configuration: {0}".format(e))
+        if self.hedger is not None:
+            self.metrics.update(hedged_requests=0, hedge_wins=0)
+
+        # UDF definitions per entity, fetched once for build_payload()
+        self._udf_metadata = {}
+
+    def ensure_auth(self):
+        """Ensure we have an access token, generating one from the refresh credentials if needed.
+
+        Call it before handing the client to worker threads, so they never
+        need to authenticate (SDPClient fails the module here).
+        """
+        if self.auth_token:
+            return
+        if not self._can_refresh():
+            raise SDPAPIError("Missing authentication credentials.")
+        self.auth_token = self._request_token()['access_token']
+
+    def _request_token(self, stale_token=None):
+        """Exchange the refresh token for an access token; returns the token endpoint's JSON response.
+
+        stale_token is an access token the API just rejected, so a gateway does not hand it out again.
+        """
+        accounts_url = DC_MAP.get(self.dc)
+        if not accounts_url:
+            raise SDPAPIError("Invalid DC provided: {0}".format(self.dc))
+
+        token_url = "{0}/oauth/v2/token".format(accounts_url)
+        payload = urlencode({
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'refresh_token': self.refresh_token,
+            'grant_type': 'refresh_token'
+        })
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        timeout = self._attempt_timeout()
+
+        response = info = None
+        if self.cassette:
+            response, info = self._fetch_cassette(token_url, data=payload, method='POST', headers=headers,
+                                                  live=self._fetch_raw)
+        elif self.gateway is not None:
+            try:
+                response, info = self.gateway.fetch_token(token_url, payload, headers=headers, timeout=timeout,
+                                                          stale_token=stale_token)
+            except GatewayUnavailable:
+                pass
+        if info is None:
+            response, info = self.transport(token_url, data=payload, method='POST', headers=headers, timeout=timeout)
+
+        if not response:
+            raise SDPAPIError.from_info(info, "Failed to generate Access Token")
+        try:
+            data = json.loads(response.read())
+        except (ValueError, IOError, OSError):
+            raise SDPAPIError("Invalid JSON response from Auth Server")
+        if 'access_token' in data:
+            return data
+        if 'error' in data:
+            raise SDPAPIError("OAuth Error: {0}".format(data.get('error')), details=data)
+        raise SDPAPIError("Token response missing access_token and error", response=data)
+
+    def remaining_time(self):
+        """Return the seconds left before the deadline, or None without a deadline."""
+        if self.deadline_at is None:
+            return None
+        return self.deadline_at - time.time()
+
+    def check_deadline(self, progress=None):
+        """Raise DeadlineExceeded once the deadline has passed.
+
+        Args:
+            progress: Optional description of the work done so far, added to the message.
+        """
+        remaining = self.remaining_time()
+        if remaining is not None and remaining <= 0:
+            msg = "Deadline of {0}s exceeded.".format(self.deadline)
+            if progress:
+                msg = "{0} {1}".format(msg, progress)
+            raise DeadlineExceeded(msg)
+        return remaining
+
+    def _attempt_timeout(self):
+        """Return the timeout for the next attempt: 'timeout', capped by the time left before the deadline."""
+        remaining = self.check_deadline()
+        if remaining is None:
+            return self.timeout
+        return min(self.timeout, remaining)
+
+    def _can_refresh(self):
+        """Return True if a new access token can be generated from refresh credentials."""
+        return bool(self.client_id and self.client_secret and self.refresh_token)
+
+    def _refresh_auth(self, stale_token):
+        """Replace an expired or revoked access token with a fresh one.
+
+        Thread-safe: when several calls hit 401 with the same token, only the
+        first one generates a new token and the others reuse it.
+        """
+        with self._auth_lock:
+            if self.auth_token != stale_token:
+                return
+            self.auth_token = self._request_token(stale_token)['access_token']
+
+    def _auth_headers(self, headers=None):
+        result = {
+            'Authorization': 'Zoho-oauthtoken {0}'.format(self.auth_token),
+            'Accept': 'application/vnd.manageengine.sdp.v3+json'
+        }
+        result.update(headers or {})
+        return result
+
+    def _fetch_authorized(self, url, data=None, method='GET', headers=None):
+        """Send one authenticated call; on HTTP 401, refresh the token once and resend.
+
+        Long-running loops (paged exports, bulk writes, polling) can outlive
+        the access token. When refresh credentials are available, the call is
+        retried with a new token instead of failing, and the retry does not
+        count against the caller's retry budget.
+
+        With an adaptive limiter, the call waits for a free slot first and
+        its status feeds the limiter.
+        """
+        self.check_deadline()
+        slot = self.limiter.acquire() if self.limiter is not None else None
+        status_code = -1
+        try:
+            token = self.auth_token
+            response, info = self._fetch(url, data=data, method=method, headers=self._auth_headers(headers))
+            if info.get('status') == 401 and self._can_refresh():
+                self._refresh_auth(token)
+                response, info = self._fetch(url, data=data, method=method, headers=self._auth_headers(headers))
+            status_code = info.get('status', -1)
+        finally:
+            if self.limiter is not None:
+                self.limiter.release(slot, None if status_code == -1 else (status_code == 429 or status_code >= 500))
+        return response, info
+
+    def _metrics_snapshot(self):
+        with self._metrics_lock:
+            return dict(self.metrics)
+
+    def _count_bytes(self, wire, decoded, responses=0):
+        with self._metrics_lock:
+            self.metrics['responses'] += responses
+            self.metrics['bytes_wire'] += wire
+            self.metrics['bytes_decoded'] += decoded
+
+    def _breaker_admit(self):
+        """Raise SDPAPIError without calling the API while the circuit breaker is open.
+
+        Returns:
+            True if the call is the breaker's half-open probe.
+        """
+        if self.breaker is None:
+            return False
+        try:
+            return self.breaker.before_call()
+        except CircuitOpenError as e:
+            raise SDPAPIError(str(e), status=-1)
+
+    def _breaker_check(self, delay):
+        """Raise SDPAPIError before backing off for delay seconds if the breaker would refuse the retry."""
+        if self.breaker is None:
+            return
+        try:
+            self.breaker.check(delay)
+        except CircuitOpenError as e:
+            raise SDPAPIError(str(e), status=-1)
+
+    def _breaker_record(self, status_code, probe=False):
+        """Count transport errors and retryable statuses as failures; any other answer is a success."""
+        if self.breaker is not None:
+            self.breaker.record(status_code != -1 and status_code not in self.RETRYABLE_STATUS_CODES, probe)
+
+    def _fetch(self, url, data=None, method='GET', headers=None):
+        """Send a single HTTP call, routed through the cassette when one is active.
+
+        GETs are idempotent, so with hedging enabled a slow one is raced
+        against a second identical request. Cassette runs are never hedged.
+        """
+        if self.cassette:
+            return self._fetch_cassette(url, data=data, method=method, headers=headers, live=self._fetch_live)
+        if self.hedger is not None and method == 'GET':
+            response, info, hedged = self.hedger.run(
+                lambda: self._fetch_live(self.module, url, data=data, method=method, headers=headers))
+            if hedged:
+                with self._metrics_lock:
+                    self.metrics['hedged_requests'] += 1
+                    self.metrics['hedge_wins'] += 1 if hedged == 'won' else 0
+            return response, info
+        return self._fetch_live(self.module, url, data=data, method=method, headers=headers)
+
+    def _fetch_cassette(self, url, data=None, method='GET', headers=None, live=None):
+        """Record or replay one call through the cassette; a replay miss raises SDPAPIError."""
+        try:
+            return self.cassette.fetch(self.module, live, url, data=data, method=method, headers=headers)
+        except LookupError as e:
+            raise SDPAPIError(str(e), status=-1)
+
+    def _fetch_raw(self, module, url, data=None, method='GET', headers=None, **kwargs):
+        """Send one call on the transport as is (the cassette's live call for token exchanges)."""
+        return self.transport(url, data=data, method=method, headers=headers, timeout=self._attempt_timeout())
+
+    def _fetch_live(self, module, url, data=None, method='GET', headers=None):
+        """Send one call with gzip/deflate negotiated; the response is decompressed as it is read.
+
+        The transport never decompresses; DecodingResponse does, and also
+        counts wire and decoded bytes into self.metrics. A cassette records
+        the decoded body.
+
+        With a gateway, the call is relayed through its daemon; if the daemon
+        has gone away, this and every later call are sent directly.
+        """
+        headers = dict(headers or {}, **{'Accept-Encoding': ACCEPT_ENCODING})
+        response = info = None
+        gateway = self.gateway
+        if gateway is not None:
+            try:
+                response, info = gateway.fetch(url, data=data, method=method, headers=headers,
+                                               timeout=self._attempt_timeout())
+            except GatewayUnavailable:
+                self.gateway = None
+        if info is None:
+            response, info = self.transport(url, data=data, method=method, headers=headers,
+                                            timeout=self._attempt_timeout())
+
+        encoding = content_encoding(info)
+        if not is_supported(encoding):
+            encoding = 'identity'
+        self._count_bytes(0, 0, responses=1)
+
+        if response:
+            return DecodingResponse(response, encoding, on_read=self._count_bytes), info
+
+        body = info.get('body')
+        if isinstance(body, bytes) and body:
+            decoded = decode_body(body, encoding)
+            self._count_bytes(len(body), len(decoded))
+            info['body'] = decoded
+        return response, info
+
+    def call(self, endpoint, method='GET', data=None, max_retries=3, retry_delay=2, cache_ttl=None):
+        """Make an API call with exponential backoff for transient errors.
+
+        Args:
+            endpoint: API endpoint path (appended to base_url).
+            method: HTTP method (GET, POST, PUT, DELETE).
+            data: Request payload dict (will be JSON-encoded).
+            max_retries: Maximum number of retry attempts for transient errors.
+            retry_delay: Base delay in seconds between retries (doubles each attempt).
+            cache_ttl: For GETs, reuse a cached response up to this many seconds old.
+
+        Returns:
+            Parsed JSON response dict from the API. Raises SDPAPIError on error.
+
+        Safe to use from worker threads once authentication has been ensured.
+        Concurrent GETs for the same endpoint and input_data are coalesced:
+        the first one is sent, and the others wait for it and receive a copy
+        of its parsed result (or its error).
+
+        A GET with a positive cache_ttl is answered from the response cache
+        when the same endpoint and input_data were fetched at most cache_ttl
+        seconds ago, and its result is cached otherwise. Every other method
+        drops the cached responses of the endpoint, of what lies below it and
+        of the lists above it, whether or not the write succeeded.
+        """
+        if method != 'GET':
+            try:
+                response, info = self._send(endpoint, method, data, max_retries, retry_delay)
+                return self._parse_response(response, info)
+            finally:
+                # Creating a record only makes lists stale; updates and deletes also stale the record itself
+                self.response_cache.invalidate(endpoint, subtree=method != 'POST')
+
+        if cache_ttl:
+            cached = self.response_cache.get(endpoint, data, cache_ttl)
+            if cached is not None:
+                with self._metrics_lock:
+                    self.metrics['cache_hits'] += 1
+                return cached
+
+        key = (endpoint, json.dumps(data, sort_keys=True) if data else None)
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            with self._metrics_lock:
+                self.metrics['coalesced_requests'] += 1
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        try:
+            response, info = self._send(endpoint, method, data, max_retries, retry_delay)
+            # flight.result stays private: followers copy it while the leader's caller may change its own result
+            flight.result = self._parse_response(response, info)
+            if cache_ttl:
+                self.response_cache.put(endpoint, data, flight.result)
+            return copy.deepcopy(flight.result)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def call_stream(self, endpoint, response_key, method='GET', data=None, max_retries=3, retry_delay=2):
+        """Like call(), but decodes a list response incrementally.
+
+        Records under response_key are yielded one at a time as they are read
+        from the response stream, so peak memory scales with one record rather
+        than one page. The other top-level members (list_info,
+        response_status, ...) are collected into meta as they are read, and
+        an error response_status raises SDPAPIError as soon as it is seen.
+
+        Returns:
+            A (records, meta) tuple; meta is complete once records is exhausted.
+        """
+        response, info = self._send(endpoint, method, data, max_retries, retry_delay)
+        if info.get('status', -1) >= 400:
+            self._parse_response(response, info)
+
+        meta = {}
+
+        def _on_member(key, value):
+            meta[key] = value
+            if key == 'response_status':
+                self._check_response_status(meta)
+
+        def _records():
+            try:
+                for record in iter_json_list(response, response_key, _on_member):
+                    self.check_deadline()
+                    yield record
+            except ValueError:
+                raise SDPAPIError("Invalid JSON response from SDP API")
+            except (IOError, OSError) as e:
+                raise SDPAPIError("Failed to read response from SDP API: {0}".format(e))
+
+        return _records(), meta
+
+    def _send(self, endpoint, method, data, max_retries, retry_delay):
+        """Send a request with exponential backoff for transient errors.
+
+        Returns:
+            The (response, info) of the first successful attempt. Raises
+            SDPAPIError for non-retryable errors or when retries are exhausted.
+        """
+        self.ensure_auth()
+
+        url = "{0}/{1}".format(self.base_url, endpoint)
+
+        headers = {}
+        payload = None
+        if data:
+            payload = urlencode({'input_data': json.dumps(data)})
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+
+        last_info = None
+        probe = busy = False
+        for attempt in range(max_retries + 1):
+            # A probe the gateway was too busy to send is still this call's probe
+            if not (busy and probe):
+                probe = self._breaker_admit()
+            response, info = self._fetch_authorized(
+                url,
+                data=payload,
+                method=method,
+                headers=headers
+            )
+
+            status_code = info.get('status', -1)
+            last_info = info
+            # The gateway found no free slot and did not send the call: the portal said nothing
+            busy = bool(info.get('gateway_busy'))
+            if not busy:
+                self._breaker_record(status_code, probe)
+
+            # If request succeeded (response is not None), break out of retry loop
+            if response:
+                break
+
+            # Check if the error is retryable
+            if (busy or status_code in self.RETRYABLE_STATUS_CODES) and attempt < max_retries:
+                delay = retry_delay * (2 ** attempt)
+                answer = 'a busy SDP gateway' if busy else 'HTTP {0}'.format(status_code)
+                if not (busy and probe):
+                    self._breaker_check(delay)
+                remaining = self.remaining_time()
+                if remaining is not None and delay >= remaining:
+                    raise DeadlineExceeded(
+                        "Deadline of {0}s would be exceeded retrying {1} after {2}.".format(
+                            self.deadline, url, answer),
+                        details=parse_error_info(info, "API Request Failed"))
+                self.warn(
+                    "Request to {0} returned {1}, retrying in {2}s (attempt {3}/{4})".format(
+                        url, answer, delay, attempt + 1, max_retries
+                    )
+                )
+                time.sleep(delay)
+                continue
+
+            # Non-retryable error or retries exhausted
+            raise SDPAPIError.from_info(info, "API Request Failed")
+
+        return response, last_info
+
+    def _parse_response(self, response, info):
+        """Parse and validate the API response. Raises SDPAPIError on failure."""
+        status_code = info.get('status', -1)
+        try:
+            body = response.read()
+        except (IOError, OSError) as e:
+            raise SDPAPIError("Failed to read response from SDP API: {0}".format(e))
+
+        # Treat HTTP 4xx/5xx as failure (e.g. 404 wrong endpoint) so we don't return changed=True
+        if status_code >= 400:
+            error_info = dict(info)
+            if body:
+                error_info['body'] = body.decode('utf-8', errors='replace') if isinstance(body, bytes) else body
+            raise SDPAPIError.from_info(error_info, "API Request Failed")
+
+        if not body:
+            return {"status": status_code, "msg": "Empty response body"}
+
+        try:
+            result = json.loads(body)
+        except ValueError:
+            raise SDPAPIError("Invalid JSON response from SDP API", raw_response=body)
+
+        # Check for API-level errors even on HTTP 200
+        if isinstance(result, dict):
+            self._check_response_status(result)
+
+        return result
+
+    @staticmethod
+    def _check_response_status(result):
+        """Raise SDPAPIError if the response_status of a decoded response reports an API error."""
+        resp_status = result.get('response_status', {})
+        if isinstance(resp_status, dict) and resp_status.get('status_code', 2000) >= 4000:
+            raise SDPAPIError(
+                "{0}".format(resp_status.get('messages', [{}])[0].get('message', 'API Error')),
+                status=resp_status.get('status_code'),
+                response=result
+            )
+
+    def fetch_existing_record(self, endpoint):
+        """Fetch a single record for idempotency checks. Returns None if not found.
+
+        Raises DeadlineExceeded once the deadline has passed, and SDPAPIError
+        while the circuit breaker is open.
+        """
+        self.ensure_auth()
+
+        url = "{0}/{1}".format(self.base_url, endpoint)
+
+        probe = self._breaker_admit()
+        response, info = self._fetch_authorized(url, method='GET')
+
+        status_code = info.get('status', -1)
+        if not info.get('gateway_busy'):
+            self._breaker_record(status_code, probe)
+
+        if status_code == 404 or not response:
+            return None
+
+        try:
+            body = response.read()
+        except (IOError, OSError):
+            body = None
+        if not body:
+            return None
+
+        try:
+            return json.loads(body)
+        except ValueError:
+            self.warn(
+                "Failed to parse JSON response from {0} (HTTP {1}). "
+                "Idempotency check skipped.".format(endpoint, status_code)
+            )
+            return None
+
+    def iter_records(self, endpoint, response_key, list_info=None, prefetch=0):
+        """Iterate over every record of a list endpoint, one page at a time.
+
+        Pages are requested in order with 'start_index' until the API reports
+        no more rows, and each page is decoded incrementally (see
+        call_stream()), so by default a single record is held in memory at a
+        time. With 'prefetch', up to that many following pages are already
+        requested by a background thread while the caller consumes one page,
+        so network waits overlap with processing; the queue then holds up to
+        'prefetch' pages of decoded records, about two pages in memory in all
+        at a depth of 1. Each request still starts only after the previous
+        page was read, so paging stays strictly sequential.
+
+        Args:
+            endpoint: API endpoint path of the list operation.
+            response_key: Key holding the records in the response (e.g., 'requests').
+            list_info: Optional base list_info dict (row_count, sort, search_criteria...).
+            prefetch: Pages to keep in flight; 0 (the default) fetches pages
+                      on demand. Callers that keep every record anyway pass
+                      prefetch_depth (SDP_CLOUD_PREFETCH_DEPTH, 1).
+
+        Yields:
+            Record dicts in API order. Raises SDPAPIError on API errors.
+        """
+        list_info = dict(list_info or {})
+        list_info.setdefault('row_count', 100)
+
+        records = self._stream_records(endpoint, response_key, list_info)
+        if prefetch:
+            records = self._prefetch(records, prefetch * list_info['row_count'])
+
+        count = 0
+        try:
+            for record in records:
+                count += 1
+                yield record
+        except DeadlineExceeded as e:
+            kwargs = dict(e.fail_kwargs, records_read=count)
+            kwargs.pop('msg')
+            raise DeadlineExceeded("{0} {1} records of {2} were read.".format(e.msg, count, endpoint), **kwargs)
+
+    def _stream_records(self, endpoint, response_key, list_info):
+        """Yield the records of every page in order; raises SDPAPIError on failure."""
+        start_index = list_info.get('start_index') or 1
+
+        while True:
+            list_info['start_index'] = start_index
+            records, meta = self.call_stream(endpoint, response_key, data={'list_info': list_info})
+            count = 0
+            for record in records:
+                count += 1
+                yield record
+
+            if not count or not meta.get('list_info', {}).get('has_more_rows'):
+                return
+            start_index += count
+
+    def _prefetch(self, items, maxsize):
+        """Drain a generator on a background thread through a bounded queue.
+
+        Errors raised by the generator are re-raised on the caller's thread,
+        including SystemExit from a module failed on the producer (a failed
+        token refresh, a cassette replay miss); closing the consumer stops
+        the producer.
+        """
+        # Authenticate on the caller's thread (SDPClient fails the module there)
+        self.ensure_auth()
+
+        done = object()
+        results = Queue(maxsize=maxsize)
+        stop = threading.Event()
+
+        def _put(item):
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    continue
+            return False
+
+        def _produce():
+            try:
+                for item in items:
+                    if not _put((item, None)):
+                        return
+            except BaseException as e:
+                _put((None, e))
+                return
+            _put((done, None))
+
+        producer = threading.Thread(target=_produce, name='sdp-page-prefetch')
+        producer.daemon = True
+        producer.start()
+        try:
+            while True:
+                item, error = results.get()
+                if error is not None:
+                    raise error
+                if item is done:
+                    return
+                yield item
+        finally:
+            stop.set()
+
+    def udf_metadata(self, entity):
+        """Return the UDF definitions of an entity ({field_name: definition}).
+
+        Fetched once per client, and reused from the response cache by later
+        clients and tasks for UDF_METADATA_TTL seconds.
+        """
+        if entity not in self._udf_metadata:
+            response = self.call('{0}/_metainfo'.format(MODULE_CONFIG[entity]['endpoint']), cache_ttl=UDF_METADATA_TTL)
+            self._udf_metadata[entity] = (
+                response.get('metainfo', {}).get('fields', {}).get('udf_fields', {}).get('fields', {}))
+        return self._udf_metadata[entity]
+
+    def build_payload(self, entity, fields):
+        """Build the API payload ({entity: {...}}) for a flat field dict, as the modules' 'payload' option.
+
+        Raises:
+            FieldValidationError: On unknown fields or unconvertible values.
+        """
+        schema = get_entity_schema(entity)
+
+        def _resolve(field_name):
+            if not is_udf_field(field_name):
+                return None
+            spec = schema.get_udf(field_name, self.udf_metadata(entity))
+            if spec is None:
+                raise FieldValidationError("Invalid UDF field '{0}'. Field not found in module metadata.".format(field_name))
+            return spec
+
+        return schema.build(fields, _resolve)
+
+    def upsert(self, entity, fields, record_id=None):
+        """Create a record, or update one unless it already has the given field values.
+
+        Returns:
+            A (changed, record) tuple.
+        """
+        endpoint = MODULE_CONFIG[entity]['endpoint']
+        data = self.build_payload(entity, fields)
+        if record_id is None:
+            return True, self.call(endpoint, method='POST', data=data).get(entity, {})
+
+        endpoint = '{0}/{1}'.format(endpoint, record_id)
+        current = (self.fetch_existing_record(endpoint) or {}).get(entity)
+        if current and not has_differences(data, current, entity):
+            return False, current
+        return True, self.call(endpoint, method='PUT', data=data).get(entity, {})
+
+    def delete(self, entity, record_id):
+        """Delete a record. Returns False if it did not exist."""
+        try:
+            self.call('{0}/{1}'.format(MODULE_CONFIG[entity]['endpoint'], record_id), method='DELETE')
+        except SDPAPIError as e:
+            if e.status == 404:
+                return False
+            raise
+        return True
+
+
+def has_differences(desired_payload, current_record, parent_module):
+    """Compare the desired payload against the current record to detect changes.
+
+    Performs a shallow comparison of the fields present in the desired payload
+    against the current record. Only fields specified in the payload are compared.
+
+    Args:
+        desired_payload: The constructed API payload dict (e.g., {'request': {...}}).
+        current_record: The current record dict from the API.
+        parent_module: The module name key (e.g., 'request').
+
+    Returns:
+        True if there are differences, False if the desired state matches current.
+    """
+    if not desired_payload or not current_record:
+        return True
+
+    desired_fields = desired_payload.get(parent_module, {})
+
+    for key, desired_value in desired_fields.items():
+        current_value = current_record.get(key)
+
+        if key == 'udf_fields':
+            # Compare UDF fields individually
+            current_udfs = current_record.get('udf_fields', {})
+            for udf_key, udf_value in desired_value.items():
+                if not _values_match(udf_value, current_udfs.get(udf_key)):
+                    return True
+            continue
+
+        if not _values_match(desired_value, current_value):
+            return True
+
+    return False
+
+
+def _values_match(desired, current):
+    """Compare a desired value with the current value from the API.
+
+    Handles the various SDP API value formats:
+    - lookup fields: {'name': 'value'} compared to {'name': 'value', 'id': '123', ...}
+    - user fields: {'email_id': 'value'} (only email_id is accepted as input)
+    - datetime fields: {'value': timestamp}
+    - scalar fields: direct comparison
+
+    Returns:
+        True if the values match, False otherwise.
+    """
+    if desired is None and current is None:
+        return True
+    if desired is None or current is None:
+        return False
+
+    # Both are dicts: compare the keys present in desired
+    if isinstance(desired, dict) and isinstance(current, dict):
+        for k, v in desired.items():
+            if current.get(k) != v:
+                return False
+        return True
+
+    # Direct scalar comparison
+    return desired == current
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import time
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.concurrency import (
+    DEFAULT_CONCURRENCY, run_concurrently,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.journal import RETRYABLE_STATUSES
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_core import DeadlineExceeded, SDPAPIError
+
+
+# Datetime fields a list can be partitioned on
+PARTITION_FIELDS = ('created_time', 'last_updated_time')
+
+# Records aimed for per window; a window is split while its count probe exceeds this
+DEFAULT_WINDOW_RECORDS = 5000
+
+# Most windows one oversized window is split into per planning round
+MAX_SPLIT = 16
+
+# Times a window is fetched before its failure is reported
+DEFAULT_WINDOW_ATTEMPTS = 3
+
+# Seconds before a failed window or probe is tried again, doubled before each further attempt
+DEFAULT_WINDOW_RETRY_DELAY = 2
+
+
+def window_key(window):
+    """Return a stable name for a window, e.g. '1700000000000-1700086400000'."""
+    return '{0}-{1}'.format(window['start'], window['end'])
+
+
+def window_criteria(field, start, end, search_criteria=None):
+    """Return the search_criteria selecting records with start <= field < end (epoch milliseconds).
+
+    Windows are half-open, so adjacent windows never share a record. The
+    caller's own search_criteria (a condition or a list of conditions) is
+    ANDed to the range as the children of a new group node, so its
+    conditions keep their own AND/OR operators.
+    """
+    criteria = [
+        {'field': field, 'condition': 'greater or equal', 'value': str(start)},
+        {'field': field, 'condition': 'lesser than', 'value': str(end), 'logical_operator': 'AND'},
+    ]
+    if search_criteria:
+        conditions = search_criteria if isinstance(search_criteria, list) else [search_criteria]
+        criteria.append({'logical_operator': 'AND', 'children': list(conditions)})
+    return criteria
+
+
+def record_time(record, field):
+    """Return a datetime field of an API record as epoch milliseconds, or None if unset."""
+    value = record.get(field)
+    if isinstance(value, dict):
+        value = value.get('value')
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def time_bounds(client, endpoint, field, search_criteria=None):
+    """Return (oldest, newest + 1) of field over the matching records, or None if none match.
+
+    Costs two single-row list calls.
+    """
+    bounds = []
+    for sort_order in ('asc', 'desc'):
+        list_info = {'row_count': 1, 'sort_field': field, 'sort_order': sort_order, 'fields_required': ['id', field]}
+        if search_criteria:
+            list_info['search_criteria'] = search_criteria
+        records = client.call(endpoint, data={'list_info': list_info}).get(endpoint) or []
+        value = record_time(records[0], field) if records else None
+        if value is None:
+            return None
+        bounds.append(value)
+    return bounds[0], bounds[1] + 1
+
+
+def count_records(client, endpoint, field, start, end, search_criteria=None):
+    """Return the number of records in one window, from a single-row get_total_count probe."""
+    list_info = {
+        'row_count': 1,
+        'get_total_count': True,
+        'fields_required': ['id'],
+        'search_criteria': window_criteria(field, start, end, search_criteria),
+    }
+    response = client.call(endpoint, data={'list_info': list_info})
+    return int((response.get('list_info') or {}).get('total_count') or 0)
+
+
+def _retrying(func, attempts, retry_delay=DEFAULT_WINDOW_RETRY_DELAY, remaining_time=None):
+    """Wrap func so an SDPAPIError with a retryable status is retried, up to attempts calls in all.
+
+    Retryable statuses are transport errors, revoked tokens, throttling and
+    server errors. Retries back off exponentially from retry_delay, as in
+    SDPCoreClient._send. A DeadlineExceeded is never retried, and a retry
+    whose wait would pass the deadline (remaining_time() seconds away)
+    raises DeadlineExceeded instead.
+    """
+    def _call(item):
+        attempt = 1
+        while True:
+            try:
+                return func(item)
+            except DeadlineExceeded:
+                raise
+            except SDPAPIError as e:
+                if attempt >= attempts or e.status not in RETRYABLE_STATUSES:
+                    raise
+                delay = retry_delay * (2 ** (attempt - 1))
+                remaining = remaining_time() if remaining_time is not None else None
+                if remaining is not None and delay >= remaining:
+                    raise DeadlineExceeded("Deadline would be exceeded retrying after: {0}".format(e))
+                time.sleep(delay)
+                attempt += 1
+
+    return _call
+
+
+def _split(start, end, parts):
+    step = max(1, -(-(end - start) // parts))
+    edges = list(range(start, end, step)) + [end]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def plan_windows(client, endpoint, field, start, end, window_records=DEFAULT_WINDOW_RECORDS,
+                 max_workers=DEFAULT_CONCURRENCY, search_criteria=None, attempts=DEFAULT_WINDOW_ATTEMPTS,
+                 retry_delay=DEFAULT_WINDOW_RETRY_DELAY):
+    """Split [start, end) into windows of at most about window_records records each.
+
+    Every candidate window is sized with a count probe; probes of one round
+    run concurrently. A window over the target is split evenly into as many
+    parts as its count needs (up to MAX_SPLIT) and probed again, so dense
+    periods get narrow windows and quiet ones wide windows. Empty windows
+    are dropped. A window one millisecond wide is kept whatever its count.
+    A probe failing with a retryable status is retried like a window in
+    fetch_windows; the plan fails only once a probe runs out of attempts.
+
+    Returns:
+        A list of {'start', 'end', 'count'} dicts in time order.
+    """
+    windows = []
+    pending = [(start, end)]
+
+    def _count(bounds):
+        return count_records(client, endpoint, field, bounds[0], bounds[1], search_criteria)
+
+    probe = _retrying(_count, attempts, retry_delay, client.remaining_time)
+
+    while pending:
+        next_round = []
+        for bounds, count, error in run_concurrently(probe, pending, max_workers):
+            if error is not None:
+                raise error
+            if not count:
+                continue
+            if count <= window_records or bounds[1] - bounds[0] <= 1:
+                windows.append(dict(start=bounds[0], end=bounds[1], count=count))
+                continue
+            next_round.extend(_split(bounds[0], bounds[1], min(MAX_SPLIT, -(-count // window_records))))
+        pending = next_round
+
+    return sorted(windows, key=lambda window: window['start'])
+
+
+def fetch_windows(func, windows, max_workers=DEFAULT_CONCURRENCY, attempts=DEFAULT_WINDOW_ATTEMPTS,
+                  retry_delay=DEFAULT_WINDOW_RETRY_DELAY, remaining_time=None):
+    """Apply func to every window concurrently, retrying a failed window on its own.
+
+    A window is tried again, up to 'attempts' times in all, when func raises
+    an SDPAPIError with a retryable status (transport errors, revoked
+    tokens, throttling and server errors); the other windows are not
+    affected. Retries wait retry_delay seconds, doubled each time, unless
+    the wait would pass the deadline given by remaining_time (for example
+    client.remaining_time). func must restart its window from scratch on
+    every call.
+
+    Returns:
+        A list of (window, result, error) tuples in window order.
+    """
+    return run_concurrently(_retrying(func, attempts, retry_delay, remaining_time), windows, max_workers)
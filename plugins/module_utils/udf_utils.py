@@ -5,38 +5,43 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
+
 
 # Allowed UDF Prefixes (must be lowercase)
 UDF_PREFIXES = ["udf_char", "udf_bool", "udf_long", "udf_double", "txt_", "num_", "date_", "dt_", "bool_", "dbl_"]
+_UDF_PREFIX_TUPLE = tuple(UDF_PREFIXES)
 
 # Cache for UDF metadata to avoid repeated calls within the same execution context
 # Key: module_name (e.g., 'request'), Value: { field_name: field_details }
 UDF_METADATA_CACHE = {}
 
+# Seconds a _metainfo response is reused from the response cache, by every task on the controller
+UDF_METADATA_TTL = 3600
+
 
 def is_udf_field(field_name):
     """
     Checks if a field name matches the allowed UDF prefixes.
     Case-insensitive check, but typically UDFs should be lowercase.
     """
-    field_lower = field_name.lower()
-    return any(field_lower.startswith(prefix) for prefix in UDF_PREFIXES)
+    return field_name.lower().startswith(_UDF_PREFIX_TUPLE)
 
 
 def fetch_udf_metadata(module, client, module_name):
     """
     Fetches the metadata for the given module to retrieve UDF definitions.
-    Uses SDPClient for auth handling and caching to prevent redundant API calls.
+    Uses SDPClient for auth handling and caching to prevent redundant API calls;
+    the response is also shared with later tasks through the response cache.
     """
     if module_name in UDF_METADATA_CACHE:
         return UDF_METADATA_CACHE[module_name]
 
-    # Use construct_endpoint with '_metainfo' operation
-    from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util import construct_endpoint
-    endpoint = construct_endpoint(module, operation='_metainfo')
+    # The definitions are per entity, not per record: one endpoint (and cache entry) for every parent_id
+    endpoint = '{0}/_metainfo'.format(MODULE_CONFIG[module_name]['endpoint'])
 
     # SDPClient handles auth token generation/reuse and base URL
-    response = client.request(endpoint, method='GET')
+    response = client.request(endpoint, method='GET', cache_ttl=UDF_METADATA_TTL)
 
     # Parse response to get UDF fields
     # Structure: response['metainfo']['fields']['udf_fields']['fields']
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import time
+
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.local_cache import (
+    cache_key, get_cache_dir, load_json, save_json,
+)
+
+
+DEFAULT_DIRECTORY_TTL = 3600
+
+# Directory list endpoints; the response key matches the endpoint name
+DIRECTORY_ENDPOINTS = ('users', 'technicians')
+
+# Field used for delta syncs once the cached directory is older than its TTL
+DELTA_SYNC_FIELD = 'last_updated_time'
+
+# Delta syncs never see deleted or deactivated users, so the directory is rebuilt
+# with a full sync once its last full sync is this many TTLs old
+FULL_SYNC_TTLS = 24
+
+# Maximum number of emails sent in one targeted lookup
+LOOKUP_BATCH_SIZE = 50
+
+
+def _index_entry(record, kind):
+    return {'id': record.get('id'), 'name': record.get('name'), 'type': kind}
+
+
+class UserDirectory:
+    """Local directory of portal users and technicians indexed by lowercase email.
+
+    The first use pages through both directory endpoints. After that, the
+    directory is refreshed incrementally: once older than 'ttl' seconds only
+    records updated since the last sync are fetched, and emails that are not
+    in the cache are looked up in one targeted search before being reported
+    as unknown. Once the last full sync is FULL_SYNC_TTLS TTLs old, the
+    directory is rebuilt, dropping users removed from the portal.
+
+    The directory is cached per portal and client.cache_identity, so users
+    of a shared OAuth client never see each other's directory.
+    """
+
+    def __init__(self, client, ttl=DEFAULT_DIRECTORY_TTL):
+        self.client = client
+        self.ttl = ttl
+        self._path = os.path.join(get_cache_dir('directory'),
+                                  '{0}.json'.format(cache_key(client.base_url, client.cache_identity)))
+        self._state = None
+
+    def _load(self):
+        if self._state is not None:
+            return self._state
+
+        state = load_json(self._path)
+        now = time.time()
+        if not state or 'entries' not in state or now - state.get('full_synced_at', 0) / 1000.0 > self.ttl * FULL_SYNC_TTLS:
+            state = self._full_sync()
+        elif now - state.get('synced_at', 0) / 1000.0 > self.ttl:
+            self._delta_sync(state)
+
+        self._state = state
+        return state
+
+    def _sync_endpoints(self, entries, search_criteria=None):
+        for kind in DIRECTORY_ENDPOINTS:
+            list_info = {'row_count': 100}
+            if search_criteria:
+                list_info['search_criteria'] = search_criteria
+            for record in self.client.iter_records(kind, kind, list_info, prefetch=self.client.prefetch_depth):
+                email = record.get('email_id')
+                if email:
+                    entries[email.lower()] = _index_entry(record, kind)
+
+    def _full_sync(self):
+        synced_at = int(time.time() * 1000)
+        entries = {}
+        self._sync_endpoints(entries)
+        state = {'synced_at': synced_at, 'full_synced_at': synced_at, 'entries': entries}
+        save_json(self._path, state)
+        return state
+
+    def _delta_sync(self, state):
+        synced_at = int(time.time() * 1000)
+        self._sync_endpoints(state['entries'], {
+            'field': DELTA_SYNC_FIELD,
+            'condition': 'greater than',
+            'value': str(state['synced_at']),
+        })
+        state['synced_at'] = synced_at
+        save_json(self._path, state)
+
+    def _lookup_missing(self, emails):
+        state = self._state
+        for start in range(0, len(emails), LOOKUP_BATCH_SIZE):
+            batch = emails[start:start + LOOKUP_BATCH_SIZE]
+            self._sync_endpoints(state['entries'], {'field': 'email_id', 'condition': 'is', 'values': batch})
+        save_json(self._path, state)
+
+    def get(self, email):
+        """Return the directory entry for an email (case-insensitive), or None."""
+        if not isinstance(email, str):
+            return None
+        return self._load()['entries'].get(email.lower())
+
+    def find_unknown(self, emails):
+        """Return the emails (in input order, de-duplicated) that do not exist in the portal.
+
+        Cache misses are resolved with one batched targeted lookup before
+        being reported, so newly added users are picked up without a full sync.
+        """
+        entries = self._load()['entries']
+        unique = []
+        seen = set()
+        for email in emails:
+            key = email.lower()
+            if key not in seen:
+                seen.add(key)
+                unique.append(email)
+
+        missing = [email for email in unique if email.lower() not in entries]
+        if missing:
+            self._lookup_missing(missing)
+            entries = self._state['entries']
+
+        return [email for email in missing if email.lower() not in entries]
+
+
+def collect_user_references(entity, data):
+    """Return (field_name, email) pairs for every user value in a constructed payload."""
+    record = (data or {}).get(entity) or {}
+    references = []
+    for key, value in record.items():
+        if not isinstance(value, dict):
+            continue
+        if 'email_id' in value:
+            references.append((key, value['email_id']))
+        else:
+            # Grouped fields and UDFs are nested one level deeper
+            for sub_key, sub_value in value.items():
+                if isinstance(sub_value, dict) and 'email_id' in sub_value:
+                    references.append((sub_key, sub_value['email_id']))
+    return references
+
+
+def check_user_values(directory, entity, payloads):
+    """Check every user reference of one or more payloads against the directory.
+
+    Args:
+        directory: UserDirectory for the portal.
+        entity: Entity name (e.g., 'request').
+        payloads: Iterable of payloads built by construct_payload.
+
+    Returns:
+        A list of error messages, empty if every referenced user exists.
+    """
+    references = []
+    for data in payloads:
+        references.extend(collect_user_references(entity, data))
+    if not references:
+        return []
+
+    unknown = set(email.lower() for email in directory.find_unknown([email for _field, email in references]))
+    return [
+        "User '{0}' for field '{1}' does not exist in the portal.".format(email, field)
+        for field, email in references if email.lower() in unknown
+    ]
@@ -5,23 +5,22 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
-from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
-from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.udf_utils import is_udf_field, get_udf_field_type
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.udf_utils import (
+    is_udf_field, fetch_udf_metadata,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.field_schema import (
+    FieldSpec, FieldValidationError, get_converter, get_entity_schema,
+)
 
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.reference_data import (
+    DEFAULT_REFERENCE_TTL, ReferenceDataCache, check_lookup_values,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.user_directory import (
+    UserDirectory, check_user_values,
+)
 
-def _is_valid_email(value):
-    """Return True if value looks like an email (local@domain.tld). Rejects e.g. 'hell@hi'."""
-    if not isinstance(value, str) or not value:
-        return False
-    parts = value.split('@')
-    if len(parts) != 2:
-        return False
-    local, domain = parts
-    if not local or not domain:
-        return False
-    if '.' not in domain:
-        return False
-    return True
+# Re-export so callers that import the email check from here keep working
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.field_schema import _is_valid_email  # noqa: F401  pylint: disable=unused-import
 
 
 def resolve_field_metadata(module, client, module_config, field_name):
@@ -29,110 +28,131 @@ def resolve_field_metadata(module, client, module_config, field_name):
     Determine if a field is System or UDF and return its metadata.
     Returns: (field_type, category, group_name)
     category: 'system' or 'udf'
+    Looked up in the compiled schema of the module's parent_module_name,
+    which is built from the same module_config.
     """
-    system_fields = module_config.get('supported_system_field_meta', {})
-
-    if field_name in system_fields:
-        f_config = system_fields[field_name]
-        return f_config.get('type'), 'system', f_config.get('group_name')
-
-    if is_udf_field(field_name):
-        if not client:
-            module.warn("UDF field '{0}' found but no client available. Treating as string.".format(field_name))
-            return 'string', 'udf', None
-
-        parent_module = module.params['parent_module_name']
-        udf_type = get_udf_field_type(module, client, parent_module, field_name)
-        return udf_type, 'udf', None
-
-    return None, None, None
+    schema = get_entity_schema(module.params['parent_module_name'])
+    spec = schema.system_fields.get(field_name)
+    if spec is None:
+        try:
+            spec = _udf_resolver(module, client, schema)(field_name)
+        except FieldValidationError as e:
+            module.fail_json(msg=str(e))
+    if spec is None:
+        return None, None, None
+    return spec.ftype, spec.category, spec.group_name
 
 
 def transform_field_value(module, field_name, value, ftype):
     """
     Transform the value based on the resolved field type.
     """
-    if ftype == 'string':
-        return value
-
-    elif ftype == 'num':
-        if isinstance(value, (int, float)):
-            return value
-        if isinstance(value, str):
-            try:
-                return int(value)
-            except ValueError:
-                try:
-                    return float(value)
-                except ValueError:
-                    pass
-        module.fail_json(
-            msg="Numeric field '{0}' requires an integer or decimal value. Got: {1}".format(field_name, value)
-        )
+    try:
+        return get_converter(ftype)(field_name, value)
+    except FieldValidationError as e:
+        module.fail_json(msg=str(e))
 
-    elif ftype == 'bool':
-        if isinstance(value, str):
-            return value.lower() == 'true'
-        return bool(value)
 
-    elif ftype == 'datetime':
-        if not isinstance(value, (int, float)):
-            module.fail_json(msg="Invalid datetime format for field '{0}'. value must be a timestamp (int/float).".format(field_name))
-        return {'value': value}
+def _udf_resolver(module, client, schema):
+    """Return a resolver that maps UDF field names to compiled FieldSpecs.
 
-    elif ftype == 'lookup':
-        return {'name': value}
+    Non-UDF names resolve to None so the schema reports them as invalid.
+    """
+    def resolve(field_name):
+        if not is_udf_field(field_name):
+            return None
 
-    elif ftype == 'user':
-        if not _is_valid_email(value):
-            module.fail_json(
-                msg="User field '{0}' accepts only a valid email address (e.g. user@example.com). Got: {1}".format(field_name, value)
-            )
-        return {'email_id': value}
+        if not client:
+            module.warn("UDF field '{0}' found but no client available. Treating as string.".format(field_name))
+            return FieldSpec(field_name, 'string', 'udf')
+
+        spec = schema.get_udf(field_name, fetch_udf_metadata(module, client, schema.module_name))
+        if spec is None:
+            # Strict validation: Fail if UDF matches prefix but is not in metadata
+            raise FieldValidationError("Invalid UDF field '{0}'. Field not found in module metadata.".format(field_name))
+        return spec
+
+    return resolve
 
-    return value
+
+def build_payload(module, client, payload):
+    """Build the API payload for a flat field dict without failing the module.
+
+    Used by bulk operations that validate many records and report every
+    invalid one together.
+
+    Raises:
+        FieldValidationError: On unknown fields or unconvertible values.
+    """
+    schema = get_entity_schema(module.params['parent_module_name'])
+    return schema.build(payload, _udf_resolver(module, client, schema))
 
 
 def construct_payload(module, client=None):
     """
-    Validate and construct the payload using a unified single-pass loop.
+    Validate and construct the payload in a single pass over the compiled entity schema.
     """
     payload = module.params['payload']
     if not payload:
         return None
 
-    parent_module = module.params['parent_module_name']
+    try:
+        return build_payload(module, client, payload)
+    except FieldValidationError as e:
+        module.fail_json(msg=str(e))
+
 
-    module_config = MODULE_CONFIG.get(parent_module)
+def prevalidation_argument_spec():
+    """Return the argument spec for local payload pre-validation options.
+
+    Used by the write modules (request, problem, change, release, write_record).
+    """
+    return dict(
+        validate_lookups=dict(type='bool', default=False),
+        lookup_by_id=dict(type='bool', default=False),
+        validate_users=dict(type='bool', default=False),
+        reference_cache_ttl=dict(type='int', default=DEFAULT_REFERENCE_TTL),
+    )
 
-    root_key = parent_module
 
-    constructed_data = {'udf_fields': {}}
+def prevalidate_payload(module, client, data):
+    """Validate a constructed payload against cached portal data before any write.
+
+    Fails the module listing every invalid value, so a typo costs no API write.
+    Returns the (possibly rewritten) payload.
+    """
+    prevalidate_payloads(module, client, [data] if data else [])
+    return data
 
-    for key, value in payload.items():
-        ftype, category, group_name = resolve_field_metadata(module, client, module_config, key)
 
-        if not category:
-            allowed_fields = list(module_config.get('supported_system_field_meta', {}).keys())
-            module.fail_json(msg="Invalid field '{0}'. Allowed system fields: {1}".format(key, allowed_fields))
+def prevalidate_payloads(module, client, payloads):
+    """Validate several constructed payloads up front (lookups and user references).
 
-        final_value = transform_field_value(module, key, value, ftype)
+    Bulk callers pass every payload at once so user references are resolved
+    with a single batched directory lookup.
+    """
+    params = module.params
+    check_lookups = params.get('validate_lookups') or params.get('lookup_by_id')
+    check_users = params.get('validate_users')
+    if not payloads or not (check_lookups or check_users):
+        return
 
-        if category == 'system':
-            if group_name:
-                if group_name not in constructed_data:
-                    constructed_data[group_name] = {}
-                constructed_data[group_name][key] = final_value
-            else:
-                constructed_data[key] = final_value
+    parent_module = params['parent_module_name']
+    ttl = params.get('reference_cache_ttl')
+    if ttl is None:
+        ttl = DEFAULT_REFERENCE_TTL
+    errors = []
 
-        elif category == 'udf':
-            constructed_data['udf_fields'][key] = final_value
+    if check_lookups:
+        cache = ReferenceDataCache(client, ttl=ttl)
+        for data in payloads:
+            errors.extend(check_lookup_values(cache, parent_module, data, use_ids=params.get('lookup_by_id')))
 
-    if not constructed_data['udf_fields']:
-        del constructed_data['udf_fields']
+    if check_users:
+        errors.extend(check_user_values(UserDirectory(client, ttl=ttl), parent_module, payloads))
 
-    return {root_key: constructed_data}
+    if errors:
+        module.fail_json(msg="Payload validation failed: {0}".format('; '.join(errors)), errors=errors)
 
 
 def handle_absent(module, client, endpoint, entity_config):
@@ -204,6 +224,7 @@ def handle_present(module, client, endpoint, entity_config):
                 mandatory_field, parent_module))
 
     data = construct_payload(module, client)
+    data = prevalidate_payload(module, client, data)
 
     # Idempotency for updates
     current_record = None
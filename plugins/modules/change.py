@@ -24,6 +24,10 @@ description:
 extends_documentation_fragment:
   - manageengine.sdp_cloud.sdp_base
   - manageengine.sdp_cloud.auth
+  - manageengine.sdp_cloud.prevalidation
+  - manageengine.sdp_cloud.bulk
+  - manageengine.sdp_cloud.journal
+  - manageengine.sdp_cloud.concurrency
 options:
   change_id:
     description:
@@ -31,6 +35,17 @@ options:
       - Required for update (C(state=present)) and delete (C(state=absent)) operations.
       - Omit when creating a new change.
     type: str
+  change_ids:
+    description:
+      - A list of existing change IDs to update or delete in one run.
+      - With C(state=present), the same I(payload) is applied to every ID. The payload is built and validated
+        once, current records are fetched in bulk, and only records that differ are updated, concurrently.
+      - With C(state=absent), existing records are resolved in bulk, then deleted in multi-ID batches where
+        the API supports it and otherwise concurrently.
+      - See I(skip_existence_check) and I(concurrency).
+      - Mutually exclusive with C(change_id).
+    type: list
+    elements: str
   state:
     description:
       - The desired state of the change.
@@ -98,6 +113,28 @@ EXAMPLES = r'''
     portal_name: "ithelpdesk"
     change_id: "123456"
     state: absent
+
+- name: Delete several changes
+  manageengine.sdp_cloud.change:
+    domain: "sdpondemand.manageengine.com"
+    auth_token: "{{ auth_token }}"
+    dc: "US"
+    portal_name: "ithelpdesk"
+    change_ids: "{{ stale_ids }}"
+    skip_existence_check: true
+    concurrency: 8
+    state: absent
+
+- name: Move several changes to the Review stage
+  manageengine.sdp_cloud.change:
+    domain: "sdpondemand.manageengine.com"
+    auth_token: "{{ auth_token }}"
+    dc: "US"
+    portal_name: "ithelpdesk"
+    change_ids: "{{ change_batch_ids }}"
+    concurrency: 8
+    payload:
+      stage: "Review"
 '''
 
 RETURN = r'''
@@ -129,6 +166,46 @@ change_id:
   returned: on create or update
   type: str
   sample: "234567890123456"
+updated:
+  description: IDs updated (or, in check mode, that would be updated).
+  returned: when change_ids is provided with state=present
+  type: list
+  elements: str
+unchanged:
+  description: IDs that already matched I(payload).
+  returned: when change_ids is provided with state=present
+  type: list
+  elements: str
+missing:
+  description: IDs that do not exist.
+  returned: when change_ids is provided with state=present
+  type: list
+  elements: str
+deleted:
+  description: IDs deleted (or, in check mode, that would be deleted).
+  returned: when change_ids is provided with state=absent
+  type: list
+  elements: str
+already_absent:
+  description: IDs that did not exist.
+  returned: when change_ids is provided with state=absent
+  type: list
+  elements: str
+failed:
+  description: Updates or deletes that failed, as C(id), C(msg) and C(status).
+  returned: when change_ids is provided
+  type: list
+  elements: dict
+adaptive_concurrency:
+  description: Parallel API calls at the end of the run (C(concurrency)), the highest and lowest values reached
+    (C(peak_concurrency), C(lowest_concurrency)), and the number of calls answered with HTTP 429 or 5xx (C(throttle_events)).
+  returned: when adaptive_concurrency is true
+  type: dict
+  sample:
+    concurrency: 9
+    peak_concurrency: 12
+    lowest_concurrency: 4
+    throttle_events: 3
 '''
 
 from ansible.module_utils.basic import AnsibleModule
@@ -136,9 +213,12 @@ from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util im
     SDPClient, base_argument_spec, construct_endpoint,
     AUTH_MUTUALLY_EXCLUSIVE, AUTH_REQUIRED_TOGETHER
 )
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.bulk_helpers import (
+    bulk_argument_spec, handle_bulk_absent, handle_bulk_present,
+)
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.write_helpers import (
-    handle_absent, handle_present,
+    handle_absent, handle_present, prevalidation_argument_spec,
 )
 
 ENTITY = 'change'
@@ -149,17 +229,20 @@ def run_module():
     module_args = base_argument_spec()
     module_args.update(dict(
         change_id=dict(type='str'),
+        change_ids=dict(type='list', elements='str'),
         state=dict(type='str', default='present', choices=['present', 'absent']),
         payload=dict(type='dict'),
     ))
+    module_args.update(prevalidation_argument_spec())
+    module_args.update(bulk_argument_spec())
 
     module = AnsibleModule(
         argument_spec=module_args,
         supports_check_mode=True,
-        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE,
+        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE + [('change_id', 'change_ids')],
         required_together=AUTH_REQUIRED_TOGETHER,
         required_if=[
-            ('state', 'absent', ('change_id',)),
+            ('state', 'absent', ('change_id', 'change_ids'), True),
         ],
     )
 
@@ -167,6 +250,13 @@ def run_module():
     module.params['parent_id'] = module.params.get('change_id')
 
     client = SDPClient(module)
+
+    ids = module.params.get('change_ids')
+    if ids is not None:
+        if module.params['state'] == 'absent':
+            handle_bulk_absent(module, client, ids)
+        handle_bulk_present(module, client, ids)
+
     endpoint = construct_endpoint(module)
 
     if module.params['state'] == 'absent':
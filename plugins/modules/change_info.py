@@ -15,12 +15,15 @@ short_description: Retrieve change records from ManageEngine ServiceDesk Plus Cl
 description:
   - Fetches change data from ManageEngine ServiceDesk Plus Cloud via the V3 API.
   - If C(change_id) is provided, retrieves a single change by ID.
-  - If C(change_id) is omitted, retrieves a list of changes with optional pagination and sorting.
+  - If C(change_ids) is provided, retrieves many changes by ID in as few API calls as possible.
+  - If neither is provided, retrieves a list of changes with optional pagination and sorting.
   - This is a read-only module; it never modifies data.
   - See U(https://www.manageengine.com/products/service-desk/sdpod-v3-api/changes/change.html) for full API details.
 extends_documentation_fragment:
   - manageengine.sdp_cloud.sdp_base
   - manageengine.sdp_cloud.auth
+  - manageengine.sdp_cloud.concurrency
+  - manageengine.sdp_cloud.response_cache
 options:
   change_id:
     description:
@@ -28,34 +31,49 @@ options:
       - When provided, performs a C(GET /api/v3/changes/{id}) call and returns the single change.
       - When omitted, performs a list operation.
     type: str
+  change_ids:
+    description:
+      - A list of change IDs to retrieve in one run.
+      - IDs are resolved with C(search_criteria) list calls of up to 100 IDs each, falling back to
+        concurrent C(GET /api/v3/changes/{id}) calls if the search is rejected.
+      - Records found by search carry the fields returned by the list API.
+      - IDs that do not exist are returned in C(missing) instead of failing the module.
+      - Mutually exclusive with C(change_id).
+    type: list
+    elements: str
+  concurrency:
+    description:
+      - Maximum number of API calls sent in parallel when C(change_ids) is provided (1-32).
+    type: int
+    default: 4
   row_count:
     description:
       - Number of records to return per page (1-100).
-      - Ignored when C(change_id) is provided.
+      - Ignored when C(change_id) or C(change_ids) is provided.
     type: int
     default: 10
   start_index:
     description:
       - The starting index for pagination.
-      - Ignored when C(change_id) is provided.
+      - Ignored when C(change_id) or C(change_ids) is provided.
     type: int
   sort_field:
     description:
       - The field to sort results by.
-      - Ignored when C(change_id) is provided.
+      - Ignored when C(change_id) or C(change_ids) is provided.
     type: str
     default: created_time
   sort_order:
     description:
       - Sort direction.
-      - Ignored when C(change_id) is provided.
+      - Ignored when C(change_id) or C(change_ids) is provided.
     type: str
     default: desc
     choices: [asc, desc]
   get_total_count:
     description:
       - Whether to include the total count of matching records.
-      - Ignored when C(change_id) is provided.
+      - Ignored when C(change_id) or C(change_ids) is provided.
     type: bool
     default: false
 '''
@@ -80,12 +98,22 @@ EXAMPLES = r'''
     sort_field: "created_time"
     sort_order: "desc"
   register: change_list
+
+- name: Get several changes by ID
+  manageengine.sdp_cloud.change_info:
+    domain: "sdpondemand.manageengine.com"
+    auth_token: "{{ auth_token }}"
+    dc: "US"
+    portal_name: "ithelpdesk"
+    change_ids: "{{ known_change_ids }}"
+    concurrency: 8
+  register: change_batch
 '''
 
 RETURN = r'''
 response:
   description: The raw response from the SDP Cloud API.
-  returned: always
+  returned: when change_ids is omitted
   type: dict
 change:
   description: The single change record (when change_id is provided).
@@ -102,7 +130,7 @@ change:
       id: "100000000000002"
 changes:
   description: List of change records (when listing).
-  returned: when change_id is omitted
+  returned: when change_id and change_ids are omitted
   type: list
   elements: dict
   sample:
@@ -111,6 +139,28 @@ changes:
       status:
         name: "Requested"
         id: "100000000000001"
+records:
+  description: The requested changes, keyed by ID (when change_ids is provided).
+  returned: when change_ids is provided
+  type: dict
+  sample:
+    "234567890123456":
+      id: "234567890123456"
+missing:
+  description: IDs from C(change_ids) that do not exist.
+  returned: when change_ids is provided
+  type: list
+  elements: str
+adaptive_concurrency:
+  description: Parallel API calls at the end of the run (C(concurrency)), the highest and lowest values reached
+    (C(peak_concurrency), C(lowest_concurrency)), and the number of calls answered with HTTP 429 or 5xx (C(throttle_events)).
+  returned: when adaptive_concurrency is true
+  type: dict
+  sample:
+    concurrency: 9
+    peak_concurrency: 12
+    lowest_concurrency: 4
+    throttle_events: 3
 '''
 
 from ansible.module_utils.basic import AnsibleModule
@@ -118,9 +168,12 @@ from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util im
     SDPClient, base_argument_spec, construct_endpoint,
     AUTH_MUTUALLY_EXCLUSIVE, AUTH_REQUIRED_TOGETHER
 )
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.concurrency import (
+    concurrency_argument_spec, validate_concurrency
+)
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.read_helpers import (
-    construct_list_payload, list_info_argument_spec
+    cache_argument_spec, construct_list_payload, fetch_records_by_ids, list_info_argument_spec, validate_cache_ttl,
 )
 
 ENTITY = 'change'
@@ -132,12 +185,15 @@ def run_module():
     module_args.update(list_info_argument_spec())
     module_args.update(dict(
         change_id=dict(type='str'),
+        change_ids=dict(type='list', elements='str'),
     ))
+    module_args.update(concurrency_argument_spec())
+    module_args.update(cache_argument_spec())
 
     module = AnsibleModule(
         argument_spec=module_args,
         supports_check_mode=True,
-        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE,
+        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE + [('change_id', 'change_ids')],
         required_together=AUTH_REQUIRED_TOGETHER
     )
 
@@ -145,10 +201,17 @@ def run_module():
     module.params['parent_id'] = module.params.get('change_id')
 
     client = SDPClient(module)
+    cache_ttl = validate_cache_ttl(module)
+
+    if module.params.get('change_ids') is not None:
+        records, missing = fetch_records_by_ids(
+            module, client, ENTITY, module.params['change_ids'], validate_concurrency(module), cache_ttl=cache_ttl)
+        module.exit_json(changed=False, records=records, missing=missing)
+
     endpoint = construct_endpoint(module)
     data = construct_list_payload(module)
 
-    response = client.request(endpoint=endpoint, method='GET', data=data)
+    response = client.request(endpoint=endpoint, method='GET', data=data, cache_ttl=cache_ttl)
 
     result = dict(changed=False, response=response)
     if module.params.get('change_id'):
@@ -33,6 +33,16 @@ options:
       - The long-lived refresh token.
     type: str
     required: true
+  timeout:
+    description:
+      - Seconds to wait for the accounts server to accept the connection or send data.
+    type: int
+    default: 10
+  deadline:
+    description:
+      - Maximum number of seconds for the token request. Caps I(timeout) when it is lower.
+      - By default there is no limit other than I(timeout).
+    type: int
 '''
 
 EXAMPLES = r'''
@@ -80,7 +90,9 @@ def run_module():
         client_id=dict(type='str', required=True),
         client_secret=dict(type='str', required=True, no_log=True),
         refresh_token=dict(type='str', required=True, no_log=True),
-        dc=dict(type='str', required=True, choices=['US', 'EU', 'IN', 'AU', 'CN', 'JP', 'CA', 'SA'])
+        dc=dict(type='str', required=True, choices=['US', 'EU', 'IN', 'AU', 'CN', 'JP', 'CA', 'SA']),
+        timeout=dict(type='int', default=10),
+        deadline=dict(type='int'),
     )
 
     module = AnsibleModule(
@@ -95,7 +107,13 @@ def run_module():
     refresh_token = module.params['refresh_token']
     dc = module.params['dc']
 
-    data = get_access_token(module, client_id, client_secret, refresh_token, dc)
+    timeout = module.params['timeout']
+    if module.params['deadline']:
+        timeout = min(timeout, module.params['deadline'])
+    if timeout <= 0:
+        module.fail_json(msg="timeout and deadline must be positive numbers of seconds.")
+
+    data = get_access_token(module, client_id, client_secret, refresh_token, dc, timeout=timeout)
 
     module.exit_json(
         changed=False,
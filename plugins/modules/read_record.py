@@ -18,6 +18,7 @@ description:
 extends_documentation_fragment:
   - manageengine.sdp_cloud.sdp
   - manageengine.sdp_cloud.auth
+  - manageengine.sdp_cloud.response_cache
 options:
   row_count:
     description:
@@ -102,7 +103,7 @@ from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util im
     AUTH_MUTUALLY_EXCLUSIVE, AUTH_REQUIRED_TOGETHER
 )
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.read_helpers import (
-    construct_list_payload, list_info_argument_spec,
+    cache_argument_spec, construct_list_payload, list_info_argument_spec, validate_cache_ttl,
 )
 
 # Re-export for backward compatibility with existing tests
@@ -113,6 +114,7 @@ def run_module():
     """Main execution entry point for read module."""
     module_args = common_argument_spec()
     module_args.update(list_info_argument_spec())
+    module_args.update(cache_argument_spec())
 
     module = AnsibleModule(
         argument_spec=module_args,
@@ -131,7 +133,8 @@ def run_module():
     response = client.request(
         endpoint=endpoint,
         method='GET',
-        data=data
+        data=data,
+        cache_ttl=validate_cache_ttl(module)
     )
 
     module.exit_json(changed=False, response=response)
@@ -15,12 +15,15 @@ short_description: Retrieve request records from ManageEngine ServiceDesk Plus C
 description:
   - Fetches request data from ManageEngine ServiceDesk Plus Cloud via the V3 API.
   - If C(request_id) is provided, retrieves a single request by ID.
-  - If C(request_id) is omitted, retrieves a list of requests with optional pagination and sorting.
+  - If C(request_ids) is provided, retrieves many requests by ID in as few API calls as possible.
+  - If neither is provided, retrieves a list of requests with optional pagination and sorting.
   - This is a read-only module; it never modifies data.
   - See U(https://www.manageengine.com/products/service-desk/sdpod-v3-api/requests/request.html) for full API details.
 extends_documentation_fragment:
   - manageengine.sdp_cloud.sdp_base
   - manageengine.sdp_cloud.auth
+  - manageengine.sdp_cloud.concurrency
+  - manageengine.sdp_cloud.response_cache
 options:
   request_id:
     description:
@@ -28,34 +31,49 @@ options:
       - When provided, performs a C(GET /api/v3/requests/{id}) call and returns the single request.
       - When omitted, performs a list operation.
     type: str
+  request_ids:
+    description:
+      - A list of request IDs to retrieve in one run.
+      - IDs are resolved with C(search_criteria) list calls of up to 100 IDs each, falling back to
+        concurrent C(GET /api/v3/requests/{id}) calls if the search is rejected.
+      - Records found by search carry the fields returned by the list API.
+      - IDs that do not exist are returned in C(missing) instead of failing the module.
+      - Mutually exclusive with C(request_id).
+    type: list
+    elements: str
+  concurrency:
+    description:
+      - Maximum number of API calls sent in parallel when C(request_ids) is provided (1-32).
+    type: int
+    default: 4
   row_count:
     description:
       - Number of records to return per page (1-100).
-      - Ignored when C(request_id) is provided.
+      - Ignored when C(request_id) or C(request_ids) is provided.
     type: int
     default: 10
   start_index:
     description:
       - The starting index for pagination.
-      - Ignored when C(request_id) is provided.
+      - Ignored when C(request_id) or C(request_ids) is provided.
     type: int
   sort_field:
     description:
       - The field to sort results by.
-      - Ignored when C(request_id) is provided.
+      - Ignored when C(request_id) or C(request_ids) is provided.
     type: str
     default: created_time
   sort_order:
     description:
       - Sort direction.
-      - Ignored when C(request_id) is provided.
+      - Ignored when C(request_id) or C(request_ids) is provided.
     type: str
     default: desc
     choices: [asc, desc]
   get_total_count:
     description:
       - Whether to include the total count of matching records.
-      - Ignored when C(request_id) is provided.
+      - Ignored when C(request_id) or C(request_ids) is provided.
     type: bool
     default: false
 '''
@@ -80,12 +98,22 @@ EXAMPLES = r'''
     sort_field: "created_time"
     sort_order: "desc"
   register: request_list
+
+- name: Get several requests by ID
+  manageengine.sdp_cloud.request_info:
+    domain: "sdpondemand.manageengine.com"
+    auth_token: "{{ auth_token }}"
+    dc: "US"
+    portal_name: "ithelpdesk"
+    request_ids: "{{ known_request_ids }}"
+    concurrency: 8
+  register: request_batch
 '''
 
 RETURN = r'''
 response:
   description: The raw response from the SDP Cloud API.
-  returned: always
+  returned: when request_ids is omitted
   type: dict
 request:
   description: The single request record (when request_id is provided).
@@ -106,7 +134,7 @@ request:
       id: "100000000000003"
 requests:
   description: List of request records (when listing).
-  returned: when request_id is omitted
+  returned: when request_id and request_ids are omitted
   type: list
   elements: dict
   sample:
@@ -115,6 +143,28 @@ requests:
       status:
         name: "Open"
         id: "100000000000001"
+records:
+  description: The requested requests, keyed by ID (when request_ids is provided).
+  returned: when request_ids is provided
+  type: dict
+  sample:
+    "234567890123456":
+      id: "234567890123456"
+missing:
+  description: IDs from C(request_ids) that do not exist.
+  returned: when request_ids is provided
+  type: list
+  elements: str
+adaptive_concurrency:
+  description: Parallel API calls at the end of the run (C(concurrency)), the highest and lowest values reached
+    (C(peak_concurrency), C(lowest_concurrency)), and the number of calls answered with HTTP 429 or 5xx (C(throttle_events)).
+  returned: when adaptive_concurrency is true
+  type: dict
+  sample:
+    concurrency: 9
+    peak_concurrency: 12
+    lowest_concurrency: 4
+    throttle_events: 3
 '''
 
 from ansible.module_utils.basic import AnsibleModule
@@ -122,9 +172,12 @@ from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util im
     SDPClient, base_argument_spec, construct_endpoint,
     AUTH_MUTUALLY_EXCLUSIVE, AUTH_REQUIRED_TOGETHER
 )
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.concurrency import (
+    concurrency_argument_spec, validate_concurrency
+)
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.read_helpers import (
-    construct_list_payload, list_info_argument_spec
+    cache_argument_spec, construct_list_payload, fetch_records_by_ids, list_info_argument_spec, validate_cache_ttl,
 )
 
 ENTITY = 'request'
@@ -136,12 +189,15 @@ def run_module():
     module_args.update(list_info_argument_spec())
     module_args.update(dict(
         request_id=dict(type='str'),
+        request_ids=dict(type='list', elements='str'),
     ))
+    module_args.update(concurrency_argument_spec())
+    module_args.update(cache_argument_spec())
 
     module = AnsibleModule(
         argument_spec=module_args,
         supports_check_mode=True,
-        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE,
+        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE + [('request_id', 'request_ids')],
         required_together=AUTH_REQUIRED_TOGETHER
     )
 
@@ -149,10 +205,17 @@ def run_module():
     module.params['parent_id'] = module.params.get('request_id')
 
     client = SDPClient(module)
+    cache_ttl = validate_cache_ttl(module)
+
+    if module.params.get('request_ids') is not None:
+        records, missing = fetch_records_by_ids(
+            module, client, ENTITY, module.params['request_ids'], validate_concurrency(module), cache_ttl=cache_ttl)
+        module.exit_json(changed=False, records=records, missing=missing)
+
     endpoint = construct_endpoint(module)
     data = construct_list_payload(module)
 
-    response = client.request(endpoint=endpoint, method='GET', data=data)
+    response = client.request(endpoint=endpoint, method='GET', data=data, cache_ttl=cache_ttl)
 
     result = dict(changed=False, response=response)
     if module.params.get('request_id'):
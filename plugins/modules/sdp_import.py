@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+DOCUMENTATION = r'''
+---
+module: sdp_import
+author:
+  - Harish Kumar (@harishkumar-k-7052)
+short_description: Import records from a CSV or JSONL file into ManageEngine ServiceDesk Plus Cloud
+description:
+  - Creates one record per row of a local CSV or JSONL file.
+  - The file is streamed in batches of I(batch_size) rows and is never loaded into memory as a whole.
+  - Columns are mapped to system fields or UDFs of the entity and validated with the same rules as the entity modules.
+    Rows that fail validation are reported and not sent.
+  - Each batch is created concurrently. With I(checkpoint), the last committed row is saved after each batch,
+    so a restarted import continues after it.
+  - The import stops at the first batch with retryable failures (transport errors, throttling and server errors)
+    and leaves it uncommitted, so the next run tries the batch again instead of skipping its failed rows.
+  - Use I(journal) as well to make sure no row of an interrupted or retried batch is created twice. With a journal,
+    a run with I(resume=true) replays only the pending and retryable rows of the uncommitted batch; without one,
+    the whole batch is sent again.
+  - In check mode, every row is read and validated, but nothing is created.
+  - The file is read on the host the task runs on; use C(delegate_to: localhost) for files on the controller.
+extends_documentation_fragment:
+  - manageengine.sdp_cloud.sdp_base
+  - manageengine.sdp_cloud.auth
+  - manageengine.sdp_cloud.prevalidation
+  - manageengine.sdp_cloud.journal
+  - manageengine.sdp_cloud.concurrency
+options:
+  parent_module_name:
+    description:
+      - The ITSM module to create records in.
+    type: str
+    required: true
+    choices: [request, problem, change, release]
+  src:
+    description:
+      - Path of the CSV or JSONL file to import.
+      - CSV files must have a header row. JSONL files hold one JSON object per line.
+    type: path
+    required: true
+  format:
+    description:
+      - Format of I(src). Defaults to C(jsonl) for C(.jsonl) and C(.ndjson) files and to C(csv) otherwise.
+    type: str
+    choices: [csv, jsonl]
+  field_map:
+    description:
+      - Maps source columns to entity fields (system fields such as C(subject) or UDFs such as C(udf_char1)).
+      - Columns that are not mapped are used as field names as they are; map a column to an empty string to ignore it.
+      - Empty values are left out of the payload.
+    type: dict
+    default: {}
+  batch_size:
+    description:
+      - Number of rows read, validated and submitted per batch (1-1000).
+    type: int
+    default: 100
+  checkpoint:
+    description:
+      - Path of a checkpoint file holding the last committed row, created and updated after each batch.
+      - When it exists, rows up to the recorded row are skipped. Remove it to import the file again.
+      - The rows that failed in committed batches are appended to a C(.failed) file next to it and reported again
+        by later runs.
+    type: path
+  concurrency:
+    description:
+      - Number of records created in parallel within a batch (1-32).
+    type: int
+    default: 4
+'''
+
+EXAMPLES = r'''
+- name: Import requests from a CSV export, resumable
+  manageengine.sdp_cloud.sdp_import:
+    domain: "sdpondemand.manageengine.com"
+    auth_token: "{{ auth_token }}"
+    dc: "US"
+    portal_name: "ithelpdesk"
+    parent_module_name: request
+    src: "/data/legacy_tickets.csv"
+    field_map:
+      Title: subject
+      Details: description
+      Severity: priority
+      Legacy ID: udf_char1
+      Internal notes: ""
+    validate_lookups: true
+    concurrency: 8
+    checkpoint: "/data/legacy_tickets.checkpoint"
+    journal: "/data/legacy_tickets.journal"
+    resume: true
+  delegate_to: localhost
+
+- name: Dry-run validation of a JSONL file
+  manageengine.sdp_cloud.sdp_import:
+    domain: "sdpondemand.manageengine.com"
+    auth_token: "{{ auth_token }}"
+    dc: "US"
+    portal_name: "ithelpdesk"
+    parent_module_name: problem
+    src: "/data/problems.jsonl"
+  check_mode: true
+  delegate_to: localhost
+'''
+
+RETURN = r'''
+rows:
+  description: Number of rows read in this run, excluding rows skipped by the checkpoint.
+  returned: always
+  type: int
+  sample: 2500
+skipped:
+  description: Number of rows skipped because the checkpoint records them as committed.
+  returned: always
+  type: int
+  sample: 1200
+created:
+  description: Number of records created, including those created by earlier runs recorded in the checkpoint.
+    In check mode, the number of rows that would be created.
+  returned: always
+  type: int
+  sample: 3690
+last_row:
+  description: The last committed row (in check mode, the last row read).
+  returned: always
+  type: int
+  sample: 3700
+failed:
+  description: Rows that failed validation or creation, as C(row), C(msg) and C(status).
+  returned: always
+  type: list
+  elements: dict
+  sample:
+    - row: 17
+      msg: "'subject' is required when creating a new request."
+      status: null
+adaptive_concurrency:
+  description: Parallel API calls at the end of the run (C(concurrency)), the highest and lowest values reached
+    (C(peak_concurrency), C(lowest_concurrency)), and the number of calls answered with HTTP 429 or 5xx (C(throttle_events)).
+  returned: when adaptive_concurrency is true
+  type: dict
+  sample:
+    concurrency: 9
+    peak_concurrency: 12
+    lowest_concurrency: 4
+    throttle_events: 3
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util import (
+    DeadlineExceeded, SDPClient, base_argument_spec,
+    AUTH_MUTUALLY_EXCLUSIVE, AUTH_REQUIRED_TOGETHER
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.bulk_helpers import (
+    apply_operations, summarize_operations,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.concurrency import (
+    concurrency_argument_spec, validate_concurrency,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.field_schema import FieldValidationError
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.import_helpers import (
+    SOURCE_FORMATS, detect_format, iter_batches, iter_source_rows, load_checkpoint, load_failures, map_row,
+    save_checkpoint,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.journal import (
+    RETRYABLE_STATUSES, journal_argument_spec, open_journal,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.udf_utils import fetch_udf_metadata
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.write_helpers import (
+    build_payload, prevalidate_payloads, prevalidation_argument_spec,
+)
+
+
+def plan_batch(module, client, entity, batch, from_csv):
+    """Validate one batch of source rows.
+
+    Returns:
+        A (operations, failed) tuple: create operations for the valid rows,
+        and {'row', 'msg', 'status'} dicts for the invalid ones.
+    """
+    entity_config = MODULE_CONFIG[entity]
+    mandatory_field = entity_config.get('mandatory_field')
+    operations = []
+    failed = []
+
+    def _load_udfs():
+        return fetch_udf_metadata(module, client, entity)
+
+    for row_number, record, error in batch:
+        data = None
+        if error is None:
+            payload = map_row(entity, record, module.params['field_map'], from_csv, _load_udfs if client else None)
+            if mandatory_field and not payload.get(mandatory_field):
+                error = "'{0}' is required when creating a new {1}.".format(mandatory_field, entity)
+        if error is None:
+            try:
+                data = build_payload(module, client, payload)
+            except FieldValidationError as e:
+                error = str(e)
+        if data is None:
+            failed.append(dict(row=row_number, msg=error, status=None))
+            continue
+        operations.append(dict(action='create', key='row:{0}'.format(row_number), id=None, row=row_number,
+                               method='POST', endpoint=entity_config['endpoint'], data=data))
+
+    return operations, failed
+
+
+def run_module():
+    module_args = base_argument_spec()
+    module_args.update(dict(
+        parent_module_name=dict(type='str', required=True, choices=list(MODULE_CONFIG.keys())),
+        src=dict(type='path', required=True),
+        format=dict(type='str', choices=list(SOURCE_FORMATS)),
+        field_map=dict(type='dict', default={}),
+        batch_size=dict(type='int', default=100),
+        checkpoint=dict(type='path'),
+    ))
+    module_args.update(concurrency_argument_spec())
+    module_args.update(journal_argument_spec())
+    module_args.update(prevalidation_argument_spec())
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE,
+        required_together=AUTH_REQUIRED_TOGETHER,
+    )
+
+    module.params['parent_id'] = None
+    concurrency = validate_concurrency(module)
+    batch_size = module.params['batch_size']
+    if not (1 <= batch_size <= 1000):
+        module.fail_json(msg="batch_size must be between 1 and 1000.")
+
+    src = module.params['src']
+    source_format = detect_format(src, module.params.get('format'))
+    entity = module.params['parent_module_name']
+    checkpoint_path = module.params.get('checkpoint')
+    checkpoint = load_checkpoint(module, checkpoint_path, src)
+    journal = None if module.check_mode else open_journal(module, entity)
+
+    client = SDPClient(module)
+    skipped = checkpoint['row']
+    created_before = checkpoint['created']
+    rows = 0
+    created = created_before
+    failed = load_failures(checkpoint_path, checkpoint)
+
+    try:
+        for batch in iter_batches(iter_source_rows(src, source_format, skipped), batch_size):
+            try:
+                client.check_deadline("Rows up to {0} are committed.".format(checkpoint['row']))
+            except DeadlineExceeded as e:
+                module.fail_json(changed=created > created_before, rows=rows, skipped=skipped, created=created,
+                                 last_row=checkpoint['row'], failed=failed, **e.fail_kwargs)
+            rows += len(batch)
+            committed_failures = len(failed)
+            operations, invalid = plan_batch(module, client, entity, batch, source_format == 'csv')
+            failed.extend(invalid)
+            prevalidate_payloads(module, client, [op['data'] for op in operations])
+
+            if module.check_mode:
+                created += len(operations)
+                checkpoint['row'] = batch[-1][0]
+                continue
+
+            summary = summarize_operations(entity, apply_operations(
+                client, operations, concurrency, journal, module.params['resume']))
+            created += len(summary['created'])
+            rows_by_key = dict((op['key'], op['row']) for op in operations)
+            failed.extend(dict(row=rows_by_key[entry['key']], msg=entry['msg'], status=entry['status'])
+                          for entry in summary['failed'])
+
+            # A batch with retryable failures stays uncommitted so the next run retries it, and with a
+            # journal and resume=true replays only its pending and retryable rows
+            if any(entry['status'] in RETRYABLE_STATUSES for entry in summary['failed']):
+                break
+
+            checkpoint.update(row=batch[-1][0], created=created)
+            save_checkpoint(checkpoint_path, checkpoint, failed[committed_failures:])
+    except (IOError, OSError) as e:
+        module.fail_json(msg="Failed to read {0}: {1}".format(src, e))
+
+    failed.sort(key=lambda entry: entry['row'])
+    result = dict(changed=created > created_before, rows=rows, skipped=skipped,
+                  created=created, last_row=checkpoint['row'], failed=failed)
+
+    if failed:
+        module.fail_json(msg="{0} rows of {1} failed to import.".format(len(failed), src), **result)
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+DOCUMENTATION = r'''
+---
+module: sdp_reconcile
+author:
+  - Harish Kumar (@harishkumar-k-7052)
+short_description: Reconcile a desired set of records in ManageEngine ServiceDesk Plus Cloud
+description:
+  - Declaratively brings the records of one entity in line with a desired set, matched by an external key field.
+  - The current key-to-record index is built from a single paged list scan instead of one search per record.
+  - Desired records whose key is not found are created, records that differ are updated, and records that
+    already match are left untouched. With C(delete_missing=true), scanned records whose key is not in the
+    desired set are deleted.
+  - Every desired record is validated before any write is sent; writes are then applied concurrently.
+  - Supports check mode.
+extends_documentation_fragment:
+  - manageengine.sdp_cloud.sdp_base
+  - manageengine.sdp_cloud.auth
+  - manageengine.sdp_cloud.prevalidation
+  - manageengine.sdp_cloud.journal
+  - manageengine.sdp_cloud.concurrency
+options:
+  parent_module_name:
+    description:
+      - The ITSM module to reconcile.
+    type: str
+    required: true
+    choices: [request, problem, change, release]
+  key_field:
+    description:
+      - The field that holds the external identifier of each record.
+      - Either a system field (for example C(subject)) or a UDF (for example C(udf_char1)).
+      - Every item in I(records) must set this field, and keys must be unique.
+    type: str
+    required: true
+  records:
+    description:
+      - The full desired set of records, each a payload dict as accepted by the entity modules.
+      - Records are created with all their fields; updates only send records that differ from the portal.
+    type: list
+    elements: dict
+    required: true
+  delete_missing:
+    description:
+      - Delete scanned records that have a key value but are not in I(records).
+      - Records without a key value are never deleted. Use I(search_criteria) to limit the scope.
+    type: bool
+    default: false
+  search_criteria:
+    description:
+      - Optional SDP C(search_criteria) limiting which records are scanned (and so which can be updated or deleted).
+    type: raw
+  concurrency:
+    description:
+      - Number of writes sent in parallel (1-32).
+    type: int
+    default: 4
+'''
+
+EXAMPLES = r'''
+- name: Sync monitoring alerts to requests keyed by a UDF
+  manageengine.sdp_cloud.sdp_reconcile:
+    domain: "sdpondemand.manageengine.com"
+    auth_token: "{{ auth_token }}"
+    dc: "US"
+    portal_name: "ithelpdesk"
+    parent_module_name: request
+    key_field: udf_char1
+    concurrency: 8
+    search_criteria:
+      field: "group.name"
+      condition: "is"
+      value: "Monitoring"
+    records: "{{ alerts | map('combine', {'group': 'Monitoring'}) | list }}"
+    journal: "/var/lib/sdp/alerts-sync.jsonl"
+    resume: true
+
+- name: Keep exactly these problems, deleting the rest of the keyed set
+  manageengine.sdp_cloud.sdp_reconcile:
+    domain: "sdpondemand.manageengine.com"
+    auth_token: "{{ auth_token }}"
+    dc: "US"
+    portal_name: "ithelpdesk"
+    parent_module_name: problem
+    key_field: title
+    delete_missing: true
+    records:
+      - title: "PRB - Storage latency"
+        priority: "High"
+      - title: "PRB - VPN drops"
+        priority: "Normal"
+'''
+
+RETURN = r'''
+created:
+  description: Records created, as C(key) and C(id) pairs. In check mode, C(id) is null.
+  returned: always
+  type: list
+  elements: dict
+  sample:
+    - key: "alert-1001"
+      id: "234567890123456"
+updated:
+  description: Records updated, as C(key) and C(id) pairs.
+  returned: always
+  type: list
+  elements: dict
+deleted:
+  description: Records deleted, as C(key) and C(id) pairs.
+  returned: always
+  type: list
+  elements: dict
+unchanged:
+  description: Records that already matched the desired state, as C(key) and C(id) pairs.
+  returned: always
+  type: list
+  elements: dict
+failed:
+  description: Operations that failed, with C(key), C(id), C(action), C(msg) and C(status).
+  returned: always
+  type: list
+  elements: dict
+adaptive_concurrency:
+  description: Parallel API calls at the end of the run (C(concurrency)), the highest and lowest values reached
+    (C(peak_concurrency), C(lowest_concurrency)), and the number of calls answered with HTTP 429 or 5xx (C(throttle_events)).
+  returned: when adaptive_concurrency is true
+  type: dict
+  sample:
+    concurrency: 9
+    peak_concurrency: 12
+    lowest_concurrency: 4
+    throttle_events: 3
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util import (
+    SDPClient, base_argument_spec,
+    AUTH_MUTUALLY_EXCLUSIVE, AUTH_REQUIRED_TOGETHER
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.bulk_helpers import (
+    apply_operations, build_keyed_payloads, index_records_by_key, plan_reconcile,
+    required_fields_for, summarize_operations,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.concurrency import (
+    concurrency_argument_spec, validate_concurrency,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.journal import (
+    journal_argument_spec, open_journal,
+)
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.write_helpers import (
+    prevalidate_payloads, prevalidation_argument_spec,
+)
+
+
+def run_module():
+    module_args = base_argument_spec()
+    module_args.update(dict(
+        parent_module_name=dict(type='str', required=True, choices=list(MODULE_CONFIG.keys())),
+        key_field=dict(type='str', required=True, no_log=False),
+        records=dict(type='list', elements='dict', required=True),
+        delete_missing=dict(type='bool', default=False),
+        search_criteria=dict(type='raw'),
+    ))
+    module_args.update(concurrency_argument_spec())
+    module_args.update(journal_argument_spec())
+    module_args.update(prevalidation_argument_spec())
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE,
+        required_together=AUTH_REQUIRED_TOGETHER,
+    )
+
+    module.params['parent_id'] = None
+    concurrency = validate_concurrency(module)
+
+    client = SDPClient(module)
+    entity = module.params['parent_module_name']
+    entity_config = MODULE_CONFIG[entity]
+    key_field = module.params['key_field']
+
+    desired = build_keyed_payloads(module, client, module.params['records'], key_field)
+    prevalidate_payloads(module, client, [data for _key, data in desired])
+
+    list_info = {'row_count': 100, 'fields_required': required_fields_for(desired, entity, key_field)}
+    if module.params.get('search_criteria'):
+        list_info['search_criteria'] = module.params['search_criteria']
+    current_index = index_records_by_key(module, client, entity_config, key_field, list_info)
+
+    operations, unchanged = plan_reconcile(
+        entity, entity_config, desired, current_index, module.params['delete_missing'])
+
+    mandatory_field = entity_config.get('mandatory_field')
+    if mandatory_field:
+        missing = [op['key'] for op in operations
+                   if op['action'] == 'create' and not op['data'][entity].get(mandatory_field)]
+        if missing:
+            module.fail_json(msg="'{0}' is required when creating a new {1}. Missing for keys: {2}".format(
+                mandatory_field, entity, missing))
+
+    if module.check_mode:
+        summary = dict(created=[], updated=[], deleted=[], failed=[])
+        for op in operations:
+            summary[op['action'] + 'd'].append(dict(key=op['key'], id=op['id']))
+        module.exit_json(changed=bool(operations), unchanged=unchanged, **summary)
+
+    results = apply_operations(client, operations, concurrency, open_journal(module, entity), module.params['resume'])
+    summary = summarize_operations(entity, results)
+    changed = bool(summary['created'] or summary['updated'] or summary['deleted'])
+    result = dict(changed=changed, unchanged=unchanged, **summary)
+
+    if summary['failed']:
+        module.fail_json(msg="{0} of {1} operations failed.".format(len(summary['failed']), len(operations)), **result)
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -20,7 +20,22 @@ description:
 extends_documentation_fragment:
   - manageengine.sdp_cloud.sdp
   - manageengine.sdp_cloud.auth
+  - manageengine.sdp_cloud.prevalidation
+  - manageengine.sdp_cloud.bulk
+  - manageengine.sdp_cloud.journal
+  - manageengine.sdp_cloud.concurrency
 options:
+  parent_ids:
+    description:
+      - A list of existing record IDs of I(parent_module_name) to update or delete in one run.
+      - With C(state=present), the same I(payload) is applied to every ID. The payload is built and validated
+        once, current records are fetched in bulk, and only records that differ are updated, concurrently.
+      - With C(state=absent), existing records are resolved in bulk, then deleted in multi-ID batches where
+        the API supports it and otherwise concurrently.
+      - See I(skip_existence_check) and I(concurrency).
+      - Mutually exclusive with C(parent_id).
+    type: list
+    elements: str
   state:
     description:
       - The desired state of the record.
@@ -79,6 +94,18 @@ EXAMPLES = r'''
     refresh_token: "your_refresh_token"
     dc: "US"
     portal_name: "ithelpdesk"
+
+- name: Delete several records by ID
+  manageengine.sdp_cloud.write_record:
+    domain: "sdpondemand.manageengine.com"
+    auth_token: "{{ auth_token }}"
+    dc: "US"
+    portal_name: "ithelpdesk"
+    parent_module_name: request
+    parent_ids: "{{ stale_ids }}"
+    skip_existence_check: true
+    concurrency: 8
+    state: absent
 '''
 
 RETURN = r'''
@@ -96,6 +123,46 @@ response:
       status:
         name: "Open"
         id: "100000000000001"
+updated:
+  description: IDs updated (or, in check mode, that would be updated).
+  returned: when parent_ids is provided with state=present
+  type: list
+  elements: str
+unchanged:
+  description: IDs that already matched I(payload).
+  returned: when parent_ids is provided with state=present
+  type: list
+  elements: str
+missing:
+  description: IDs that do not exist.
+  returned: when parent_ids is provided with state=present
+  type: list
+  elements: str
+deleted:
+  description: IDs deleted (or, in check mode, that would be deleted).
+  returned: when parent_ids is provided with state=absent
+  type: list
+  elements: str
+already_absent:
+  description: IDs that did not exist.
+  returned: when parent_ids is provided with state=absent
+  type: list
+  elements: str
+failed:
+  description: Updates or deletes that failed, as C(id), C(msg) and C(status).
+  returned: when parent_ids is provided
+  type: list
+  elements: dict
+adaptive_concurrency:
+  description: Parallel API calls at the end of the run (C(concurrency)), the highest and lowest values reached
+    (C(peak_concurrency), C(lowest_concurrency)), and the number of calls answered with HTTP 429 or 5xx (C(throttle_events)).
+  returned: when adaptive_concurrency is true
+  type: dict
+  sample:
+    concurrency: 9
+    peak_concurrency: 12
+    lowest_concurrency: 4
+    throttle_events: 3
 '''
 
 from ansible.module_utils.basic import AnsibleModule
@@ -103,12 +170,15 @@ from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.api_util im
     SDPClient, common_argument_spec, check_module_config, construct_endpoint,
     AUTH_MUTUALLY_EXCLUSIVE, AUTH_REQUIRED_TOGETHER
 )
+from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.bulk_helpers import (
+    bulk_argument_spec, handle_bulk_absent, handle_bulk_present,
+)
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.sdp_config import MODULE_CONFIG
 
 # Re-export helpers so existing tests that import from this module continue to work
 from ansible_collections.manageengine.sdp_cloud.plugins.module_utils.write_helpers import (  # noqa: F401  pylint: disable=unused-import
     resolve_field_metadata, transform_field_value, construct_payload,
-    handle_absent, handle_present,
+    handle_absent, handle_present, prevalidation_argument_spec,
 )
 
 
@@ -116,17 +186,20 @@ def run_module():
     """Main execution entry point for write module."""
     module_args = common_argument_spec()
     module_args.update(dict(
+        parent_ids=dict(type='list', elements='str'),
         state=dict(type='str', default='present', choices=['present', 'absent']),
         payload=dict(type='dict'),
     ))
+    module_args.update(prevalidation_argument_spec())
+    module_args.update(bulk_argument_spec())
 
     module = AnsibleModule(
         argument_spec=module_args,
         supports_check_mode=True,
-        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE,
+        mutually_exclusive=AUTH_MUTUALLY_EXCLUSIVE + [('parent_id', 'parent_ids')],
         required_together=AUTH_REQUIRED_TOGETHER,
         required_if=[
-            ('state', 'absent', ('parent_id',)),
+            ('state', 'absent', ('parent_id', 'parent_ids'), True),
         ],
     )
 
@@ -134,6 +207,13 @@ def run_module():
     check_module_config(module)
 
     client = SDPClient(module)
+
+    ids = module.params.get('parent_ids')
+    if ids is not None:
+        if module.params['state'] == 'absent':
+            handle_bulk_absent(module, client, ids)
+        handle_bulk_present(module, client, ids)
+
     endpoint = construct_endpoint(module)
     parent_module = module.params['parent_module_name']
     entity_config = MODULE_CONFIG[parent_module]
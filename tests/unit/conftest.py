@@ -26,10 +26,20 @@ class FakeHTTPResponse:
 
     def __init__(self, body, status=200):
         self._body = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        self._offset = 0
         self.status = status
 
-    def read(self):
-        return self._body
+    def read(self, size=-1):
+        end = len(self._body) if size is None or size < 0 else self._offset + size
+        chunk = self._body[self._offset:end]
+        self._offset += len(chunk)
+        return chunk
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep controller-side caches (responses, metadata, breaker state) private to each test."""
+    monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path_factory.mktemp('sdp_cache')))
 
 
 def build_fetch_url_response(body, status=200):
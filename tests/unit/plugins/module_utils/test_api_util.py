@@ -5,6 +5,8 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import threading
+
 import pytest
 from unittest.mock import patch
 
@@ -14,10 +16,11 @@ from tests.unit.conftest import (
 )
 
 from plugins.module_utils.api_util import (
-    SDPClient, common_argument_spec, check_module_config, get_auth_params,
+    SDPAPIError, SDPClient, common_argument_spec, check_module_config, get_auth_params,
     construct_endpoint, get_current_record, has_differences, _values_match,
     sanitize_string_params, _strip_strings,
 )
+from plugins.module_utils import sdp_core
 
 
 # ---------------------------------------------------------------------------
@@ -28,8 +31,8 @@ class TestCommonArgumentSpec:
         spec = common_argument_spec()
         expected_keys = {
             'domain', 'portal_name', 'auth_token', 'client_id',
-            'client_secret', 'refresh_token', 'dc', 'parent_module_name',
-            'parent_id',
+            'client_secret', 'refresh_token', 'dc', 'timeout', 'deadline',
+            'parent_module_name', 'parent_id',
         }
         assert set(spec.keys()) == expected_keys
 
@@ -300,7 +303,7 @@ class TestSDPClient:
         assert call_kwargs['error_details'] == {'error': 'Not Found'}
 
     @patch(FETCH_URL_PATH)
-    @patch('plugins.module_utils.api_util.time.sleep')
+    @patch('plugins.module_utils.sdp_core.time.sleep')
     def test_request_retries_on_transient_errors(self, mock_sleep, mock_fetch):
         """Retry on 503 then succeed on second attempt."""
         success_response = build_fetch_url_response({'request': {'id': '1'}})
@@ -352,6 +355,203 @@ class TestSDPClient:
         result = client.fetch_existing_record('requests/1')
         assert result == record
 
+    @patch(FETCH_URL_PATH)
+    def test_iter_records_pages_until_no_more_rows(self, mock_fetch):
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'priorities': [{'id': '1'}, {'id': '2'}], 'list_info': {'has_more_rows': True}}),
+            build_fetch_url_response({'priorities': [{'id': '3'}], 'list_info': {'has_more_rows': False}}),
+        ]
+
+        client, module = self._make_client({
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+        })
+
+        records = list(client.iter_records('priorities', 'priorities', {'row_count': 2}))
+        assert [r['id'] for r in records] == ['1', '2', '3']
+        assert mock_fetch.call_count == 2
+        assert 'start_index%22%3A+3' in mock_fetch.call_args_list[1].kwargs['data']
+
+    @patch(FETCH_URL_PATH)
+    def test_iter_records_prefetch_preserves_order_and_fails_module(self, mock_fetch):
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'priorities': [{'id': '1'}], 'list_info': {'has_more_rows': True}}),
+            build_fetch_url_response({'priorities': [{'id': '2'}], 'list_info': {'has_more_rows': True}}),
+            build_fetch_url_error(403, 'Forbidden'),
+        ]
+
+        client, module = self._make_client({
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+        })
+
+        seen = []
+        with pytest.raises(SystemExit):
+            for record in client.iter_records('priorities', 'priorities', {'row_count': 1}, prefetch=2):
+                seen.append(record['id'])
+        assert seen == ['1', '2']
+        assert module.fail_json.call_args[1]['status'] == 403
+        starts = [c.kwargs['data'] for c in mock_fetch.call_args_list]
+        assert ['start_index%22%3A+{0}'.format(i) in data for i, data in zip((1, 2, 3), starts)] == [True] * 3
+
+    @patch('plugins.module_utils.api_util.get_access_token')
+    @patch(FETCH_URL_PATH)
+    def test_iter_records_prefetch_fails_module_when_refresh_fails(self, mock_fetch, mock_token):
+        client, module = self._make_client({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': 'cid', 'client_secret': 'secret', 'refresh_token': 'refresh', 'dc': 'US',
+        })
+
+        def _refresh_fails(*args, **kwargs):
+            module.fail_json(msg="OAuth Error: invalid_code")
+
+        mock_token.side_effect = _refresh_fails
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'priorities': [{'id': '1'}], 'list_info': {'has_more_rows': True}}),
+            build_fetch_url_error(401, 'Unauthorized'),
+        ]
+
+        seen = []
+        outcome = []
+
+        def _consume():
+            try:
+                for record in client.iter_records('priorities', 'priorities', {'row_count': 1}, prefetch=2):
+                    seen.append(record['id'])
+            except SystemExit:
+                outcome.append('failed')
+
+        consumer = threading.Thread(target=_consume)
+        consumer.daemon = True
+        consumer.start()
+        consumer.join(5)
+        assert not consumer.is_alive()
+        assert outcome == ['failed']
+        assert seen == ['1']
+        assert module.fail_json.call_args[1]['msg'] == "OAuth Error: invalid_code"
+
+    @patch(FETCH_URL_PATH)
+    def test_call_raises_instead_of_failing(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_error(403, 'Forbidden')
+
+        client, module = self._make_client({
+            'domain': 'test.example.com',
+            'portal_name': 'portal',
+            'auth_token': 'tok',
+            'client_id': None, 'client_secret': None,
+            'refresh_token': None, 'dc': 'US',
+        })
+
+        with pytest.raises(SDPAPIError) as excinfo:
+            client.call('requests/1', method='DELETE')
+        assert excinfo.value.status == 403
+        module.fail_json.assert_not_called()
+
+    @patch('plugins.module_utils.api_util.get_access_token')
+    @patch(FETCH_URL_PATH)
+    def test_expired_token_is_refreshed_once_without_using_a_retry(self, mock_fetch, mock_token):
+        mock_token.side_effect = [{'access_token': 'first'}, {'access_token': 'second'}]
+        mock_fetch.side_effect = [
+            build_fetch_url_error(401, 'Unauthorized'),
+            build_fetch_url_response({'request': {'id': '1'}}),
+        ]
+        client, _module = self._make_client({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': None,
+            'client_id': 'cid', 'client_secret': 'secret', 'refresh_token': 'refresh', 'dc': 'US',
+        })
+
+        assert client.call('requests/1', max_retries=0) == {'request': {'id': '1'}}
+        tokens = [c.kwargs['headers']['Authorization'] for c in mock_fetch.call_args_list]
+        assert tokens == ['Zoho-oauthtoken first', 'Zoho-oauthtoken second']
+        assert client.auth_token == 'second'
+
+    @patch('plugins.module_utils.api_util.get_access_token')
+    @patch(FETCH_URL_PATH)
+    def test_second_401_fails(self, mock_fetch, mock_token):
+        mock_token.side_effect = [{'access_token': 'first'}, {'access_token': 'second'}]
+        mock_fetch.return_value = build_fetch_url_error(401, 'Unauthorized')
+        client, _module = self._make_client({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': None,
+            'client_id': 'cid', 'client_secret': 'secret', 'refresh_token': 'refresh', 'dc': 'US',
+        })
+
+        with pytest.raises(SDPAPIError) as excinfo:
+            client.call('requests/1', max_retries=0)
+        assert excinfo.value.status == 401
+        assert mock_fetch.call_count == 2
+        assert mock_token.call_count == 2
+
+    @patch('plugins.module_utils.api_util.get_access_token')
+    def test_concurrent_refreshes_generate_one_token(self, mock_token):
+        mock_token.return_value = {'access_token': 'fresh'}
+        client, _module = self._make_client({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'stale',
+            'client_id': 'cid', 'client_secret': 'secret', 'refresh_token': 'refresh', 'dc': 'US',
+        })
+
+        client._refresh_auth('stale')
+        client._refresh_auth('stale')
+
+        assert client.auth_token == 'fresh'
+        mock_token.assert_called_once()
+
+    @patch(FETCH_URL_PATH)
+    def test_401_without_refresh_credentials_fails(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_error(401, 'Unauthorized')
+        client, _module = self._make_client({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+        })
+
+        with pytest.raises(SDPAPIError):
+            client.call('requests/1', max_retries=0)
+        mock_fetch.assert_called_once()
+
+    @patch('plugins.module_utils.sdp_core.time.sleep')
+    @patch(FETCH_URL_PATH)
+    def test_deadline_stops_retries_before_sleeping_past_it(self, mock_fetch, mock_sleep):
+        mock_fetch.return_value = build_fetch_url_error(503, 'Service Unavailable')
+        client, _module = self._make_client({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+            'timeout': 10, 'deadline': 5,
+        })
+
+        with pytest.raises(SDPAPIError) as excinfo:
+            client.call('requests', retry_delay=10)
+        assert 'Deadline of 5s' in excinfo.value.msg
+        assert excinfo.value.status == -1
+        assert mock_fetch.call_args.kwargs['timeout'] <= 5
+        mock_sleep.assert_not_called()
+
+    @patch(FETCH_URL_PATH)
+    def test_deadline_during_pagination_reports_progress(self, mock_fetch):
+        client, module = self._make_client({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+            'deadline': 60,
+        })
+        mock_fetch.return_value = build_fetch_url_response(
+            {'requests': [{'id': '1'}, {'id': '2'}], 'list_info': {'has_more_rows': True}})
+
+        seen = []
+        with pytest.raises(SystemExit):
+            for record in client.iter_records('requests', 'requests', {'row_count': 2}, prefetch=0):
+                seen.append(record['id'])
+                if len(seen) == 2:
+                    client.deadline_at = 0
+        assert seen == ['1', '2']
+        assert mock_fetch.call_count == 1
+        kwargs = module.fail_json.call_args.kwargs
+        assert kwargs['records_read'] == 2
+        assert 'Deadline of 60s exceeded' in kwargs['msg']
+
     def test_missing_auth_fails(self):
         client, module = self._make_client({
             'domain': 'test.example.com',
@@ -366,6 +566,111 @@ class TestSDPClient:
         module.fail_json.assert_called_once()
 
 
+class _CountingEvent(threading.Event):
+    """Event that counts the threads waiting on it."""
+
+    def __init__(self):
+        super(_CountingEvent, self).__init__()
+        self.waiters = 0
+
+    def wait(self, timeout=None):
+        self.waiters += 1
+        return super(_CountingEvent, self).wait(timeout)
+
+
+class TestRequestCoalescing:
+    PARAMS = {
+        'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+        'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+    }
+
+    def _run_concurrent_gets(self, mock_fetch, response, followers=3, endpoint='requests/_metainfo'):
+        client = SDPClient(create_mock_module(dict(self.PARAMS)))
+        release = threading.Event()
+
+        def _fetch(*args, **kwargs):
+            release.wait(5)
+            return response
+
+        mock_fetch.side_effect = _fetch
+        results = []
+        errors = []
+
+        def _get():
+            try:
+                results.append(client.call(endpoint))
+            except SDPAPIError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=_get)
+        leader.start()
+        while not client._flights:
+            threading.Event().wait(0.001)
+        flight = next(iter(client._flights.values()))
+        flight.done = _CountingEvent()
+
+        threads = [threading.Thread(target=_get) for _unused in range(followers)]
+        for thread in threads:
+            thread.start()
+        while flight.done.waiters < followers:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in [leader] + threads:
+            thread.join(5)
+        return client, results, errors
+
+    @patch(FETCH_URL_PATH)
+    def test_identical_gets_share_one_request(self, mock_fetch):
+        client, results, errors = self._run_concurrent_gets(
+            mock_fetch, build_fetch_url_response({'metainfo': {'fields': ['subject']}}))
+
+        assert mock_fetch.call_count == 1
+        assert errors == []
+        assert results == [{'metainfo': {'fields': ['subject']}}] * 4
+        assert len(set(id(result) for result in results)) == 4
+        assert client.metrics['coalesced_requests'] == 3
+        assert client._flights == {}
+
+    @patch(FETCH_URL_PATH)
+    def test_leader_does_not_return_the_shared_result(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response({'requests': [{'id': '1'}]})
+        client = SDPClient(create_mock_module(dict(self.PARAMS)))
+        flights = []
+        flight_class = sdp_core._Flight
+
+        class _RecordedFlight(flight_class):
+            def __init__(self):
+                flight_class.__init__(self)
+                flights.append(self)
+
+        with patch.object(sdp_core, '_Flight', _RecordedFlight):
+            result = client.call('requests')
+        result['requests'].append({'id': '2'})
+
+        assert flights[0].result == {'requests': [{'id': '1'}]}
+        assert result is not flights[0].result
+
+    @patch(FETCH_URL_PATH)
+    def test_followers_receive_the_error(self, mock_fetch):
+        client, results, errors = self._run_concurrent_gets(mock_fetch, build_fetch_url_error(404, 'Not Found'))
+
+        assert mock_fetch.call_count == 1
+        assert results == []
+        assert [e.status for e in errors] == [404] * 4
+
+    @patch(FETCH_URL_PATH)
+    def test_writes_and_different_payloads_are_not_coalesced(self, mock_fetch):
+        mock_fetch.side_effect = lambda *args, **kwargs: build_fetch_url_response({'requests': []})
+        client = SDPClient(create_mock_module(dict(self.PARAMS)))
+
+        client.call('requests', data={'list_info': {'start_index': 1}})
+        client.call('requests', data={'list_info': {'start_index': 2}})
+        client.call('requests/1', method='PUT', data={'request': {}})
+
+        assert mock_fetch.call_count == 3
+        assert client.metrics['coalesced_requests'] == 0
+
+
 # ---------------------------------------------------------------------------
 # get_current_record
 # ---------------------------------------------------------------------------
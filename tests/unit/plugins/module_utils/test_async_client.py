@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+from plugins.module_utils.async_client import AsyncHTTPTransport, AsyncSDPClient, _read_response
+from plugins.module_utils.circuit_breaker import CircuitBreaker
+from plugins.module_utils.concurrency import AdaptiveLimiter
+from plugins.module_utils.sdp_core import DeadlineExceeded, SDPAPIError, SDPCoreClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        state = self.server.state
+        with state['lock']:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+            state['hits'][self.path] = state['hits'].get(self.path, 0) + 1
+            hits = state['hits'][self.path]
+            state['tokens'].append(self.headers.get('Authorization'))
+        record_id = self.path.rsplit('/', 1)[-1]
+        time.sleep(1 if record_id == 'slow' else 0.02)
+        with state['lock']:
+            state['active'] -= 1
+
+        if record_id == 'flaky' and hits == 1:
+            status, body = 503, {}
+        elif record_id == 'expired' and hits == 1:
+            status, body = 401, {}
+        elif record_id == 'invalid':
+            status, body = 200, {'response_status': {'status_code': 4001, 'messages': [{'message': 'Bad id'}]}}
+        else:
+            status, body = 200, {'request': {'id': record_id}}
+
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.state = {'lock': threading.Lock(), 'active': 0, 'peak': 0, 'hits': {}, 'tokens': []}
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _client(server, max_concurrency, **kwargs):
+    kwargs.setdefault('auth_token', 'tok')
+    client = SDPCoreClient('test.example.com', 'portal', dc='US', warn=MagicMock(), **kwargs)
+    client.base_url = 'http://127.0.0.1:{0}/app/portal/api/v3'.format(server.server_address[1])
+    return AsyncSDPClient(client, max_concurrency=max_concurrency)
+
+
+class TestAsyncSDPClient:
+    def test_call_many_returns_results_in_order_within_bound(self, server):
+        client = _client(server, max_concurrency=5)
+        calls = [{'endpoint': 'requests/{0}'.format(i)} for i in range(30)]
+
+        results = client.call_many(calls)
+
+        assert [result['request']['id'] for _call, result, _err in results] == [str(i) for i in range(30)]
+        assert 1 < server.state['peak'] <= 5
+        assert client.client.metrics['responses'] == 30
+
+    def test_retries_transient_errors_and_raises_api_errors(self, server):
+        client = _client(server, max_concurrency=4)
+        results = client.call_many([
+            {'endpoint': 'requests/flaky', 'retry_delay': 0},
+            {'endpoint': 'requests/invalid'},
+        ])
+
+        assert results[0][1] == {'request': {'id': 'flaky'}}
+        assert server.state['hits']['/app/portal/api/v3/requests/flaky'] == 2
+        assert isinstance(results[1][2], SDPAPIError)
+        assert results[1][2].status == 4001
+
+    def test_expired_token_is_refreshed_off_the_loop(self, server):
+        client = _client(server, max_concurrency=4, auth_token='stale', client_id='cid', client_secret='secret',
+                         refresh_token='refresh')
+        threads = []
+
+        def _request_token(stale_token=None):
+            threads.append(threading.current_thread())
+            return {'access_token': 'fresh'}
+
+        client.client._request_token = _request_token
+        results = client.call_many([{'endpoint': 'requests/expired', 'max_retries': 0}])
+
+        assert results[0][1] == {'request': {'id': 'expired'}}
+        assert server.state['tokens'] == ['Zoho-oauthtoken stale', 'Zoho-oauthtoken fresh']
+        assert threads and threading.current_thread() not in threads
+
+    def test_timeout_and_deadline_are_honoured(self, server):
+        client = _client(server, max_concurrency=4, timeout=0.2)
+        results = client.call_many([{'endpoint': 'requests/slow', 'max_retries': 0}])
+        assert results[0][2].status == -1
+
+        client = _client(server, max_concurrency=4, deadline=5)
+        client.client.deadline_at = 0
+        results = client.call_many([{'endpoint': 'requests/1'}])
+        assert isinstance(results[0][2], DeadlineExceeded)
+        assert '/app/portal/api/v3/requests/1' not in server.state['hits']
+
+    def test_calls_go_through_the_limiter(self, server):
+        limiter = AdaptiveLimiter(initial=2, maximum=2)
+        client = _client(server, max_concurrency=50, limiter=limiter)
+
+        results = client.call_many([{'endpoint': 'requests/{0}'.format(i)} for i in range(20)])
+
+        assert all(error is None for _call, _result, error in results)
+        assert server.state['peak'] <= 2
+        assert limiter.stats()['concurrency'] == 2
+
+    def test_breaker_file_io_runs_off_the_loop(self, server, tmp_path):
+        client = _client(server, max_concurrency=4)
+        breaker = client.client.breaker = CircuitBreaker(client.client.base_url, directory=str(tmp_path))
+        threads = []
+        original = breaker.record
+
+        def _record(*args):
+            threads.append(threading.current_thread())
+            return original(*args)
+
+        breaker.record = _record
+        client.call_many([{'endpoint': 'requests/{0}'.format(i)} for i in range(3)])
+
+        assert len(threads) == 3
+        assert threading.current_thread() not in threads
+
+
+class TestAsyncHTTPTransport:
+    def test_stalled_upload_times_out(self):
+        async def upload():
+            stalled = asyncio.Event()
+
+            async def _never_read(reader, writer):
+                await stalled.wait()
+                writer.close()
+
+            server = await asyncio.start_server(_never_read, '127.0.0.1', 0)
+            url = 'http://127.0.0.1:{0}/'.format(server.sockets[0].getsockname()[1])
+            transport = AsyncHTTPTransport()
+            try:
+                started = time.time()
+                with pytest.raises(asyncio.TimeoutError):
+                    await transport.request('POST', url, body=b'x' * (64 * 1024 * 1024), timeout=0.2)
+                return time.time() - started
+            finally:
+                stalled.set()
+                transport.close()
+                server.close()
+                await server.wait_closed()
+
+        assert asyncio.run(upload()) < 5
+
+
+class TestReadResponse:
+    def test_chunked_body(self):
+        async def parse():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n'
+                             b'4\r\n{"a"\r\n4\r\n: 1}\r\n0\r\n\r\n')
+            reader.feed_eof()
+            return await _read_response(reader)
+
+        result, keep_alive = asyncio.run(parse())
+        assert result.status == 200
+        assert json.loads(result.read()) == {'a': 1}
+        assert keep_alive
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from tests.unit.conftest import FETCH_URL_PATH, build_fetch_url_error, build_fetch_url_response, create_mock_module
+
+from plugins.module_utils.api_util import SDPAPIError, SDPClient
+from plugins.module_utils.bulk_helpers import (
+    apply_operations, build_keyed_payloads, bulk_delete, bulk_update, handle_bulk_absent, index_records_by_key,
+    plan_reconcile, record_key_value, required_fields_for, summarize_operations,
+)
+from plugins.module_utils.concurrency import MAX_CONCURRENCY, AdaptiveLimiter, run_concurrently, validate_concurrency
+from plugins.module_utils.sdp_config import MODULE_CONFIG
+
+
+class TestRunConcurrently:
+    def test_results_in_input_order_with_errors_captured(self):
+        def func(item):
+            if item == 3:
+                raise ValueError('boom')
+            return item * 2
+
+        results = run_concurrently(func, [1, 2, 3, 4], max_workers=3)
+        assert [(item, result) for item, result, _err in results] == [(1, 2), (2, 4), (3, None), (4, 8)]
+        assert isinstance(results[2][2], ValueError)
+
+    def test_validate_concurrency_bounds(self):
+        module = create_mock_module({'concurrency': 64})
+        with pytest.raises(SystemExit):
+            validate_concurrency(module)
+        assert validate_concurrency(create_mock_module({'concurrency': 8})) == 8
+
+    def test_adaptive_concurrency_uses_the_full_pool(self):
+        module = create_mock_module({'concurrency': 8, 'adaptive_concurrency': True})
+        assert validate_concurrency(module) == MAX_CONCURRENCY
+
+
+class TestAdaptiveLimiter:
+    def test_additive_increase_after_a_streak(self):
+        limiter = AdaptiveLimiter(initial=2, maximum=3, increase_after=3)
+        for _unused in range(9):
+            limiter.release(limiter.acquire(), throttled=False)
+        assert limiter.stats() == dict(concurrency=3, peak_concurrency=3, lowest_concurrency=2, throttle_events=0)
+
+    def test_multiplicative_decrease_once_per_burst(self):
+        limiter = AdaptiveLimiter(initial=8)
+        tokens = [limiter.acquire() for _unused in range(4)]
+        for token in tokens:
+            limiter.release(token, throttled=True)
+        assert limiter.limit == 4
+        assert limiter.throttle_events == 4
+
+        limiter.release(limiter.acquire(), throttled=True)
+        assert limiter.limit == 2
+
+    def test_transport_errors_leave_the_limit_alone(self):
+        limiter = AdaptiveLimiter(initial=4, increase_after=1)
+        limiter.release(limiter.acquire(), throttled=None)
+        assert limiter.stats()['concurrency'] == 4
+
+    def test_acquire_blocks_at_the_limit(self):
+        limiter = AdaptiveLimiter(initial=1)
+        token = limiter.acquire()
+        acquired = threading.Event()
+
+        def _second():
+            limiter.release(limiter.acquire(), throttled=False)
+            acquired.set()
+
+        worker = threading.Thread(target=_second)
+        worker.start()
+        assert not acquired.wait(0.05)
+        limiter.release(token, throttled=False)
+        assert acquired.wait(1)
+        worker.join()
+
+    @patch('plugins.module_utils.sdp_core.time.sleep')
+    @patch(FETCH_URL_PATH)
+    def test_client_feeds_the_limiter_and_reports_it(self, mock_fetch, _mock_sleep):
+        mock_fetch.side_effect = [build_fetch_url_error(429, 'Too Many Requests'),
+                                  build_fetch_url_response({'request': {'id': '1'}})]
+        module = create_mock_module({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+            'concurrency': 8, 'adaptive_concurrency': True,
+        })
+        exit_json = module.exit_json
+        client = SDPClient(module)
+
+        client.call('requests/1')
+        with pytest.raises(SystemExit):
+            module.exit_json(changed=False)
+
+        exit_json.assert_called_once_with(changed=False, adaptive_concurrency=dict(
+            concurrency=4, peak_concurrency=8, lowest_concurrency=4, throttle_events=1))
+
+
+class TestKeys:
+    def test_record_key_value_system_and_udf(self):
+        record = {'subject': 'Disk', 'udf_fields': {'udf_char1': 'alert-1'}, 'group': {'name': 'Ops'}}
+        assert record_key_value(record, 'subject') == 'Disk'
+        assert record_key_value(record, 'UDF_CHAR1') == 'alert-1'
+        assert record_key_value(record, 'group') == 'Ops'
+        assert record_key_value(record, 'udf_char2') is None
+
+    def test_build_keyed_payloads_reports_all_errors(self):
+        module = create_mock_module({'parent_module_name': 'request'})
+        records = [{'subject': 'A'}, {'subject': 'A'}, {'description': 'no key'}]
+        with pytest.raises(SystemExit):
+            build_keyed_payloads(module, None, records, 'subject')
+        errors = module.fail_json.call_args[1]['errors']
+        assert errors == ["records[1]: duplicate key 'A'.", "records[2]: missing value for key field 'subject'."]
+
+    def test_required_fields_include_payload_and_key(self):
+        desired = [('a', {'request': {'subject': 'a', 'udf_fields': {'udf_char1': 'x'}}})]
+        assert required_fields_for(desired, 'request', 'udf_char1') == ['id', 'subject', 'udf_fields.udf_char1']
+
+    def test_index_warns_on_duplicate_keys(self):
+        module = create_mock_module({})
+        client = MagicMock()
+        client.iter_records.return_value = iter([
+            {'id': '1', 'subject': 'A'}, {'id': '2', 'subject': 'A'}, {'id': '3', 'subject': ''},
+        ])
+        index = index_records_by_key(module, client, MODULE_CONFIG['request'], 'subject', {'row_count': 100})
+        assert list(index) == ['A'] and index['A']['id'] == '1'
+        module.warn.assert_called_once()
+
+
+class TestPlanReconcile:
+    def test_creates_updates_deletes_and_unchanged(self):
+        desired = [
+            ('new', {'request': {'subject': 'new'}}),
+            ('same', {'request': {'subject': 'same', 'priority': {'name': 'High'}}}),
+            ('diff', {'request': {'subject': 'diff', 'priority': {'name': 'Low'}}}),
+        ]
+        current = {
+            'same': {'id': '1', 'subject': 'same', 'priority': {'name': 'High'}},
+            'diff': {'id': '2', 'subject': 'diff', 'priority': {'name': 'High'}},
+            'gone': {'id': '3', 'subject': 'gone'},
+        }
+        operations, unchanged = plan_reconcile('request', MODULE_CONFIG['request'], desired, current, delete_missing=True)
+
+        assert [(op['action'], op['key'], op['endpoint']) for op in operations] == [
+            ('create', 'new', 'requests'), ('update', 'diff', 'requests/2'), ('delete', 'gone', 'requests/3'),
+        ]
+        assert unchanged == [{'key': 'same', 'id': '1'}]
+
+    def test_no_deletes_by_default(self):
+        operations, _unchanged = plan_reconcile('request', MODULE_CONFIG['request'], [], {'x': {'id': '1'}})
+        assert operations == []
+
+
+class TestApplyOperations:
+    def test_partial_failures_are_summarized(self):
+        client = MagicMock()
+
+        def call(endpoint, method='GET', data=None, cache_ttl=None):
+            if method == 'DELETE':
+                raise SDPAPIError('Not allowed', status=403)
+            return {'request': {'id': '99'}}
+
+        client.call.side_effect = call
+        operations = [
+            dict(action='create', key='a', id=None, method='POST', endpoint='requests', data={}),
+            dict(action='delete', key='b', id='5', method='DELETE', endpoint='requests/5', data=None),
+        ]
+        summary = summarize_operations('request', apply_operations(client, operations, 2))
+
+        client.ensure_auth.assert_called_once()
+        assert summary['created'] == [{'key': 'a', 'id': '99'}]
+        assert summary['failed'] == [{'key': 'b', 'id': '5', 'action': 'delete', 'msg': 'Not allowed', 'status': 403}]
+
+
+class TestBulkDelete:
+    def _client(self, existing=('1', '2', '3'), batch_response=None, batch_error=None):
+        client = MagicMock()
+        calls = []
+
+        def call(endpoint, method='GET', data=None, cache_ttl=None):
+            calls.append((method, endpoint))
+            if method == 'GET':
+                values = data['list_info']['search_criteria']['values']
+                return {endpoint: [{'id': v} for v in values if v in existing]}
+            if '?ids=' in endpoint:
+                if batch_error:
+                    raise batch_error
+                return batch_response or {}
+            record_id = endpoint.split('/')[1]
+            if record_id not in existing:
+                raise SDPAPIError('Not found', status=404)
+            if record_id == '3':
+                raise SDPAPIError('Locked', status=4005)
+            return {}
+
+        client.call.side_effect = call
+        client.calls = calls
+        return client
+
+    def test_existence_check_then_single_deletes(self):
+        module = create_mock_module({})
+        client = self._client()
+        result = bulk_delete(module, client, 'problem', ['1', '9', '3'], 2)
+
+        assert result == dict(deleted=['1'], already_absent=['9'],
+                              failed=[{'id': '3', 'msg': 'Locked', 'status': 4005}])
+        assert ('DELETE', 'problems/9') not in client.calls
+
+    def test_skip_existence_check_reports_404_as_absent(self):
+        module = create_mock_module({})
+        client = self._client()
+        result = bulk_delete(module, client, 'problem', ['1', '9'], 2, skip_existence_check=True)
+
+        assert result == dict(deleted=['1'], already_absent=['9'], failed=[])
+        assert all(method == 'DELETE' for method, _endpoint in client.calls)
+
+    def test_batched_delete_uses_per_record_statuses(self):
+        module = create_mock_module({})
+        batch_response = {'response_status': [
+            {'id': '1', 'status_code': 2000},
+            {'id': '2', 'status_code': 4001, 'messages': [{'message': 'Not allowed'}]},
+        ]}
+        client = self._client(batch_response=batch_response)
+        result = bulk_delete(module, client, 'request', ['1', '2'], 2, skip_existence_check=True)
+
+        assert result['deleted'] == ['1']
+        assert result['failed'] == [{'id': '2', 'msg': 'Not allowed', 'status': 4001}]
+        assert client.calls == [('DELETE', 'requests?ids=1,2')]
+
+    def test_batch_not_found_status_counts_as_absent(self):
+        module = create_mock_module({})
+        batch_response = {'response_status': [
+            {'id': '1', 'status_code': 2000},
+            {'id': '9', 'status_code': 4007, 'messages': [{'message': 'Not found'}]},
+        ]}
+        client = self._client(batch_response=batch_response)
+        result = bulk_delete(module, client, 'request', ['1', '9'], 2, skip_existence_check=True)
+
+        assert result == dict(deleted=['1'], already_absent=['9'], failed=[])
+
+    def test_unconfirmed_batch_ids_fall_back_to_single_deletes(self):
+        module = create_mock_module({})
+        batch_response = {'response_status': [{'id': '1', 'status_code': 2000}]}
+        client = self._client(batch_response=batch_response)
+        result = bulk_delete(module, client, 'request', ['1', '2', '9'], 2, skip_existence_check=True)
+
+        assert result == dict(deleted=['1', '2'], already_absent=['9'], failed=[])
+        assert sorted(client.calls[1:]) == [('DELETE', 'requests/2'), ('DELETE', 'requests/9')]
+
+        client = self._client(batch_response={'response_status': {'status_code': 2000}})
+        result = bulk_delete(module, client, 'request', ['1', '2'], 2, skip_existence_check=True)
+        assert result == dict(deleted=['1', '2'], already_absent=[], failed=[])
+        assert len(client.calls) == 3
+
+    def test_failure_message_counts_every_id(self):
+        module = create_mock_module({'parent_module_name': 'problem', 'concurrency': 2,
+                                     'skip_existence_check': True})
+        with pytest.raises(SystemExit):
+            handle_bulk_absent(module, self._client(), ['1', '9', '3'])
+
+        kwargs = module.fail_json.call_args.kwargs
+        assert kwargs['msg'] == "1 of 3 deletes failed."
+        assert kwargs['already_absent'] == ['9']
+
+    def test_rejected_batch_falls_back_to_single_deletes(self):
+        module = create_mock_module({})
+        client = self._client(batch_error=SDPAPIError('Unsupported', status=405))
+        result = bulk_delete(module, client, 'request', ['1', '2'], 2, skip_existence_check=True)
+
+        assert result == dict(deleted=['1', '2'], already_absent=[], failed=[])
+
+    def test_check_mode_sends_no_deletes(self):
+        module = create_mock_module({}, check_mode=True)
+        client = self._client()
+        result = bulk_delete(module, client, 'change', ['2', '8'], 2)
+
+        assert result == dict(deleted=['2'], already_absent=['8'], failed=[])
+        assert all(method == 'GET' for method, _endpoint in client.calls)
+
+
+class TestBulkUpdate:
+    DATA = {'request': {'group': {'name': 'Network'}}}
+
+    def _client(self):
+        client = MagicMock()
+        current = {'1': {'id': '1', 'group': {'name': 'Network'}}, '2': {'id': '2', 'group': {'name': 'Desk'}},
+                   '3': {'id': '3', 'group': {'name': 'Desk'}}}
+
+        def call(endpoint, method='GET', data=None, cache_ttl=None):
+            if method == 'GET':
+                assert data['list_info']['fields_required'] == ['group', 'id']
+                values = data['list_info']['search_criteria']['values']
+                return {'requests': [current[v] for v in values if v in current]}
+            record_id = endpoint.split('/')[1]
+            if record_id == '3':
+                raise SDPAPIError('Closed request', status=4002)
+            if record_id not in current:
+                raise SDPAPIError('Not found', status=404)
+            return {'request': {'id': record_id}}
+
+        client.call.side_effect = call
+        return client
+
+    def test_only_differing_records_are_updated(self):
+        module = create_mock_module({})
+        client = self._client()
+        result = bulk_update(module, client, 'request', ['1', '2', '3', '9'], self.DATA, 4)
+
+        assert result == dict(updated=['2'], unchanged=['1'], missing=['9'],
+                              failed=[{'id': '3', 'msg': 'Closed request', 'status': 4002}])
+        puts = [c.args[0] for c in client.call.call_args_list if c.kwargs.get('method') == 'PUT']
+        assert sorted(puts) == ['requests/2', 'requests/3']
+
+    def test_skip_existence_check_updates_all_ids(self):
+        module = create_mock_module({})
+        client = self._client()
+        result = bulk_update(module, client, 'request', ['1', '9'], self.DATA, 2, skip_existence_check=True)
+
+        assert result == dict(updated=['1'], unchanged=[], missing=['9'], failed=[])
+
+    def test_check_mode_reports_plan(self):
+        module = create_mock_module({}, check_mode=True)
+        result = bulk_update(module, self._client(), 'request', ['1', '2'], self.DATA, 2)
+        assert result == dict(updated=['2'], unchanged=['1'], missing=[], failed=[])
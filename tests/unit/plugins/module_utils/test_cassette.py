@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import pytest
+from unittest.mock import patch
+
+from tests.unit.conftest import (
+    FETCH_URL_PATH, build_fetch_url_response, build_fetch_url_error,
+    create_mock_module,
+)
+
+from plugins.module_utils.api_util import SDPClient
+from plugins.module_utils.cassette import Cassette, redact, REDACTED
+
+
+CLIENT_PARAMS = {
+    'domain': 'test.example.com',
+    'portal_name': 'portal',
+    'auth_token': None,
+    'client_id': 'cid',
+    'client_secret': 'csecret',
+    'refresh_token': 'rtoken',
+    'dc': 'US',
+}
+
+
+def _read_lines(path):
+    with open(str(path)) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class TestRedact:
+    def test_redacts_nested_secrets(self):
+        value = {'access_token': 'abc', 'nested': [{'client_secret': 'x', 'name': 'keep'}]}
+        assert redact(value) == {'access_token': REDACTED, 'nested': [{'client_secret': REDACTED, 'name': 'keep'}]}
+
+
+class TestCassetteRecordReplay:
+    def test_invalid_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            Cassette(str(tmp_path / 'c.jsonl'), mode='rewind')
+
+    def test_replay_missing_file(self, tmp_path):
+        with pytest.raises(ValueError):
+            Cassette(str(tmp_path / 'missing.jsonl'), mode='replay')
+
+    def test_from_env_unset(self, monkeypatch):
+        monkeypatch.delenv('SDP_CLOUD_CASSETTE', raising=False)
+        assert Cassette.from_env() is None
+
+    @patch('plugins.module_utils.oauth.fetch_url')
+    @patch(FETCH_URL_PATH)
+    def test_record_redacts_oauth_and_replays_offline(self, mock_fetch, mock_oauth_fetch, tmp_path, monkeypatch):
+        path = tmp_path / 'run.jsonl'
+        mock_oauth_fetch.return_value = build_fetch_url_response({'access_token': 'live-token', 'expires_in': 3600})
+        mock_fetch.return_value = build_fetch_url_response({'request': {'id': '1', 'subject': 'Test'}})
+
+        monkeypatch.setenv('SDP_CLOUD_CASSETTE', str(path))
+        monkeypatch.setenv('SDP_CLOUD_CASSETTE_MODE', 'record')
+        client = SDPClient(create_mock_module(dict(CLIENT_PARAMS)))
+        assert client.request('requests/1') == {'request': {'id': '1', 'subject': 'Test'}}
+
+        entries = _read_lines(path)
+        assert [e['method'] for e in entries] == ['POST', 'GET']
+        token_entry = entries[0]
+        assert token_entry['request']['client_secret'] == REDACTED
+        assert token_entry['request']['refresh_token'] == REDACTED
+        assert 'live-token' not in json.dumps(entries)
+        assert 'csecret' not in json.dumps(entries)
+
+        # Replay: no network calls at all
+        mock_fetch.reset_mock()
+        mock_oauth_fetch.reset_mock()
+        monkeypatch.setenv('SDP_CLOUD_CASSETTE_MODE', 'replay')
+        client = SDPClient(create_mock_module(dict(CLIENT_PARAMS)))
+        assert client.request('requests/1') == {'request': {'id': '1', 'subject': 'Test'}}
+        mock_fetch.assert_not_called()
+        mock_oauth_fetch.assert_not_called()
+
+    @patch(FETCH_URL_PATH)
+    def test_replays_errors_and_payload_matching(self, mock_fetch, tmp_path):
+        path = str(tmp_path / 'err.jsonl')
+        module = create_mock_module({})
+        cassette = Cassette(path, mode='record')
+        mock_fetch.return_value = build_fetch_url_error(404, msg='Not Found', body={'error': 'missing'})
+        cassette.fetch(module, mock_fetch, 'https://x/requests/9', method='GET')
+        mock_fetch.return_value = build_fetch_url_response({'request': {'id': '2'}})
+        cassette.fetch(module, mock_fetch, 'https://x/requests', data='input_data=%7B%22a%22%3A+1%7D', method='POST')
+
+        replay = Cassette(path, mode='replay')
+        response, info = replay.fetch(module, None, 'https://x/requests/9', method='GET')
+        assert response is None
+        assert info['status'] == 404
+        assert json.loads(info['body']) == {'error': 'missing'}
+
+        response, info = replay.fetch(module, None, 'https://x/requests', data='input_data=%7B%22a%22%3A+1%7D', method='POST')
+        assert json.loads(response.read()) == {'request': {'id': '2'}}
+
+    def test_unmatched_interaction_fails(self, tmp_path):
+        path = tmp_path / 'empty.jsonl'
+        path.write_text('')
+        module = create_mock_module({})
+        replay = Cassette(str(path), mode='replay')
+        with pytest.raises(SystemExit):
+            replay.fetch(module, None, 'https://x/requests/1', method='GET')
+        assert 'No recorded interaction' in module.fail_json.call_args[1]['msg']
+
+    @patch('plugins.module_utils.cassette.time.sleep')
+    def test_replay_latency(self, mock_sleep, tmp_path):
+        path = tmp_path / 'slow.jsonl'
+        path.write_text(json.dumps({
+            'method': 'GET', 'url': 'https://x/r', 'request': None, 'status': 200,
+            'msg': 'OK', 'has_response': True, 'body': '{}', 'elapsed': 1.5,
+        }) + '\n')
+        replay = Cassette(str(path), mode='replay', replay_latency=True)
+        replay.fetch(create_mock_module({}), None, 'https://x/r', method='GET')
+        mock_sleep.assert_called_once_with(1.5)
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+from unittest.mock import patch
+
+from tests.unit.conftest import FETCH_URL_PATH, build_fetch_url_error, build_fetch_url_response, create_mock_module
+
+from plugins.module_utils.api_util import SDPAPIError, SDPClient
+from plugins.module_utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from plugins.module_utils.local_cache import load_json
+
+
+KEY = 'https://test.example.com/app/portal/api/v3'
+
+
+@pytest.fixture
+def clock():
+    with patch('plugins.module_utils.circuit_breaker.time.time') as mock_time:
+        mock_time.return_value = 1000.0
+        yield mock_time
+
+
+def _breaker(tmp_path, **kwargs):
+    kwargs.setdefault('min_calls', 4)
+    return CircuitBreaker(KEY, failure_rate=0.5, window=60, cooldown=30, directory=str(tmp_path), **kwargs)
+
+
+class TestCircuitBreaker:
+    def test_opens_at_failure_rate_after_min_calls(self, tmp_path, clock):
+        breaker = _breaker(tmp_path)
+        for success in (False, True, False):
+            breaker.before_call()
+            breaker.record(success)
+        assert breaker.state() == CLOSED
+
+        breaker.record(True)
+        assert breaker.state() == OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_state_is_shared_between_instances(self, tmp_path, clock):
+        first, second = _breaker(tmp_path, min_calls=1), _breaker(tmp_path, min_calls=1)
+        first.record(False)
+        with pytest.raises(CircuitOpenError):
+            second.before_call()
+
+    def test_failures_outside_the_window_are_forgotten(self, tmp_path, clock):
+        breaker = _breaker(tmp_path, min_calls=2)
+        breaker.record(False)
+        clock.return_value += 61
+        breaker.record(True)
+        breaker.record(True)
+        assert breaker.state() == CLOSED
+
+    def test_half_open_admits_one_probe_and_closes_on_success(self, tmp_path, clock):
+        breaker = _breaker(tmp_path, min_calls=1)
+        breaker.record(False)
+        clock.return_value += 31
+
+        assert breaker.before_call() is True
+        assert breaker.state() == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record(True, probe=True)
+        assert breaker.state() == CLOSED
+        assert breaker.before_call() is False
+
+    def test_only_the_probe_decides_a_half_open_breaker(self, tmp_path, clock):
+        breaker = _breaker(tmp_path, min_calls=1)
+        breaker.record(False)
+        clock.return_value += 31
+        assert breaker.before_call() is True
+
+        # A call admitted before the breaker opened reports back late
+        breaker.record(True)
+        assert breaker.state() == HALF_OPEN
+        breaker.record(False)
+        assert breaker.state() == HALF_OPEN
+
+        breaker.record(False, probe=True)
+        assert breaker.state() == OPEN
+
+    def test_failed_probe_reopens(self, tmp_path, clock):
+        breaker = _breaker(tmp_path, min_calls=1)
+        breaker.record(False)
+        clock.return_value += 31
+        breaker.record(False, probe=breaker.before_call())
+
+        assert breaker.state() == OPEN
+        clock.return_value += 10
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_lost_probe_expires(self, tmp_path, clock):
+        breaker = _breaker(tmp_path, min_calls=1)
+        breaker.record(False)
+        clock.return_value += 31
+        breaker.before_call()
+
+        clock.return_value += 31
+        assert breaker.before_call() is True
+
+    def test_check_looks_ahead_without_admitting(self, tmp_path, clock):
+        breaker = _breaker(tmp_path, min_calls=1)
+        breaker.check()
+        breaker.record(False)
+
+        with pytest.raises(CircuitOpenError):
+            breaker.check(within=29)
+        breaker.check(within=31)
+        assert breaker.state() == OPEN
+
+    def test_successes_are_written_in_batches(self, tmp_path, clock):
+        breaker = _breaker(tmp_path)
+        breaker.record(True)
+        with patch.object(breaker, '_update', wraps=breaker._update) as update:
+            for _i in range(10):
+                breaker.before_call()
+                breaker.record(True)
+            assert update.call_count == 0
+
+            breaker.flush()
+            assert update.call_count == 1
+        assert breaker.state() == CLOSED
+        assert load_json(breaker.path)['calls'] == 11
+
+    def test_window_rollover_is_written(self, tmp_path, clock):
+        breaker = _breaker(tmp_path)
+        breaker.record(True)
+        breaker.record(True)
+        clock.return_value += 61
+        breaker.record(True)
+
+        assert load_json(breaker.path)['window_start'] == 1061
+
+    @patch.dict('os.environ', {'SDP_CLOUD_CIRCUIT_BREAKER': 'false'})
+    def test_disabled_by_default(self):
+        assert CircuitBreaker.from_env(KEY) is None
+
+
+PARAMS = {
+    'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+    'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+}
+
+
+class TestClientCircuitBreaker:
+    @patch(FETCH_URL_PATH)
+    def test_idempotency_lookups_go_through_the_breaker(self, mock_fetch, tmp_path, monkeypatch):
+        monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path))
+        monkeypatch.setenv('SDP_CLOUD_CIRCUIT_BREAKER', 'true')
+        monkeypatch.setenv('SDP_CLOUD_BREAKER_MIN_CALLS', '2')
+        mock_fetch.return_value = build_fetch_url_error(503, 'Service Unavailable')
+        client = SDPClient(create_mock_module(dict(PARAMS)))
+
+        assert client.fetch_existing_record('requests/1') is None
+        assert client.fetch_existing_record('requests/2') is None
+        assert client.breaker.state() == OPEN
+
+        mock_fetch.reset_mock()
+        with pytest.raises(SystemExit):
+            client.fetch_existing_record('requests/3')
+        assert 'Circuit breaker' in client.module.fail_json.call_args[1]['msg']
+        mock_fetch.assert_not_called()
+
+    @patch('plugins.module_utils.sdp_core.time.sleep')
+    @patch(FETCH_URL_PATH)
+    def test_open_breaker_fails_fast_across_clients(self, mock_fetch, mock_sleep, tmp_path, monkeypatch):
+        monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path))
+        monkeypatch.setenv('SDP_CLOUD_CIRCUIT_BREAKER', 'true')
+        monkeypatch.setenv('SDP_CLOUD_BREAKER_MIN_CALLS', '2')
+        mock_fetch.return_value = build_fetch_url_error(503, 'Service Unavailable')
+
+        with pytest.raises(SDPAPIError) as excinfo:
+            SDPClient(create_mock_module(dict(PARAMS))).call('requests', max_retries=3)
+        assert 'Circuit breaker' in excinfo.value.msg
+        assert mock_fetch.call_count == 2
+        # The breaker opened on the second failure, so the client gave up instead of backing off again
+        assert mock_sleep.call_count == 1
+
+        mock_fetch.reset_mock()
+        mock_fetch.return_value = build_fetch_url_response({'requests': []})
+        with pytest.raises(SDPAPIError) as excinfo:
+            SDPClient(create_mock_module(dict(PARAMS))).call('requests')
+        assert excinfo.value.status == -1
+        mock_fetch.assert_not_called()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import gzip
+import io
+import json
+import zlib
+
+import pytest
+from unittest.mock import patch
+
+from tests.unit.conftest import FETCH_URL_PATH, FakeHTTPResponse, create_mock_module
+
+from plugins.module_utils.api_util import SDPAPIError, SDPClient
+from plugins.module_utils.compression import DecodingResponse, decode_body
+
+
+BODY = {
+    'response_status': [{'status_code': 2000, 'status': 'success'}],
+    'requests': [{'id': str(i), 'subject': 'Printer offline on floor {0}'.format(i % 5)} for i in range(200)],
+    'list_info': {'has_more_rows': False, 'row_count': 200},
+}
+RAW = json.dumps(BODY).encode('utf-8')
+
+
+def _raw_deflate(data):
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+ENCODED = {
+    'gzip': gzip.compress(RAW),
+    'deflate': zlib.compress(RAW),
+}
+
+
+class TestDecodingResponse:
+    @pytest.mark.parametrize('encoding,body', [
+        ('gzip', ENCODED['gzip']),
+        ('deflate', ENCODED['deflate']),
+        ('deflate', _raw_deflate(RAW)),
+        ('identity', RAW),
+    ])
+    @pytest.mark.parametrize('read_size', [1, 100, 64 * 1024])
+    def test_decodes_in_chunks_and_counts_bytes(self, encoding, body, read_size):
+        counted = []
+        response = DecodingResponse(io.BytesIO(body), encoding, lambda *sizes: counted.append(sizes), read_size)
+
+        chunks = []
+        while True:
+            chunk = response.read(4096)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+        assert b''.join(chunks) == RAW
+        assert sum(wire for wire, _decoded in counted) == len(body)
+        assert sum(decoded for _wire, decoded in counted) == len(RAW)
+
+    def test_corrupt_body_raises_ioerror(self):
+        response = DecodingResponse(io.BytesIO(b'\x1f\x8bnot really gzip'), 'gzip')
+        with pytest.raises(IOError):
+            response.read()
+
+    def test_decode_body_passes_text_and_corrupt_bodies_through(self):
+        assert decode_body(ENCODED['gzip'], 'gzip') == RAW
+        assert decode_body('{"a": 1}', 'gzip') == '{"a": 1}'
+        assert decode_body(b'plain', 'gzip') == b'plain'
+
+
+class TestClientCompression:
+    def _client(self):
+        return SDPClient(create_mock_module({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+        }))
+
+    @patch(FETCH_URL_PATH)
+    def test_negotiates_gzip_and_streams_decoded_records(self, mock_fetch):
+        mock_fetch.return_value = (FakeHTTPResponse(ENCODED['gzip']),
+                                   {'status': 200, 'msg': 'OK', 'content-encoding': 'gzip'})
+        client = self._client()
+
+        records, _meta = client.call_stream('requests', 'requests')
+
+        assert list(records) == BODY['requests']
+        kwargs = mock_fetch.call_args.kwargs
+        assert kwargs['headers']['Accept-Encoding'] == 'gzip, deflate'
+        assert kwargs['decompress'] is False
+        assert client.metrics == dict(responses=1, bytes_wire=len(ENCODED['gzip']), bytes_decoded=len(RAW),
+                                      coalesced_requests=0, cache_hits=0)
+
+    @patch(FETCH_URL_PATH)
+    def test_compressed_error_body_is_decoded(self, mock_fetch):
+        error = {'response_status': {'status_code': 4000, 'messages': [{'message': 'Invalid input'}]}}
+        mock_fetch.return_value = (None, {'status': 400, 'msg': 'Bad Request', 'content-encoding': 'deflate',
+                                          'body': zlib.compress(json.dumps(error).encode('utf-8'))})
+
+        with pytest.raises(SDPAPIError) as excinfo:
+            self._client().call('requests', max_retries=0)
+        assert 'Invalid input' in excinfo.value.msg
+
+    @patch.dict('os.environ', {'SDP_CLOUD_METRICS': 'true'})
+    @patch(FETCH_URL_PATH)
+    def test_metrics_are_reported_in_module_results(self, mock_fetch):
+        mock_fetch.return_value = (FakeHTTPResponse(ENCODED['deflate']),
+                                   {'status': 200, 'msg': 'OK', 'content-encoding': 'deflate'})
+        module = create_mock_module({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+        })
+        exit_json = module.exit_json
+        client = SDPClient(module)
+
+        client.call('requests')
+        with pytest.raises(SystemExit):
+            module.exit_json(changed=False)
+
+        exit_json.assert_called_once_with(
+            changed=False, sdp_metrics=dict(responses=1, bytes_wire=len(ENCODED['deflate']), bytes_decoded=len(RAW),
+                                            coalesced_requests=0, cache_hits=0))
@@ -9,7 +9,7 @@ import json
 import pytest
 
 from tests.unit.conftest import create_mock_module
-from plugins.module_utils.error_handler import handle_error
+from plugins.module_utils.error_handler import handle_error, parse_error_info
 
 
 class TestHandleError:
@@ -94,3 +94,7 @@ class TestHandleError:
         call_kwargs = module.fail_json.call_args[1]
         assert call_kwargs['msg'] == 'Not Found'
         assert call_kwargs.get('error_details') is None
+
+    def test_parse_error_info_does_not_fail_module(self):
+        info = {'status': 429, 'msg': 'Too Many Requests'}
+        assert parse_error_info(info, "Default") == {'msg': 'Too Many Requests', 'status': 429, 'error_details': None}
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+
+import pytest
+from unittest.mock import MagicMock
+
+from tests.unit.conftest import create_mock_module
+
+from plugins.module_utils import udf_utils
+from plugins.module_utils.field_schema import (
+    EntitySchema, FieldSpec, FieldValidationError, get_entity_schema,
+)
+from plugins.module_utils.sdp_config import MODULE_CONFIG
+from plugins.module_utils.write_helpers import construct_payload
+
+
+UDF_DEFINITIONS = {
+    'udf_char1': {'type': 'string'},
+    'udf_long1': {'type': 'integer'},
+    'udf_char2': {'type': 'lookup', 'lookup_entity': 'user'},
+}
+
+
+def _no_udfs(field_name):
+    return None
+
+
+class TestEntitySchema:
+    def test_schema_is_compiled_once(self):
+        assert get_entity_schema('request') is get_entity_schema('request')
+
+    def test_group_targets_precomputed(self):
+        schema = EntitySchema('problem', MODULE_CONFIG['problem'])
+        assert 'known_error_details' in schema.group_targets
+        assert schema.system_fields['is_known_error'].group_name == 'known_error_details'
+
+    def test_build_dispatches_converters(self):
+        schema = get_entity_schema('request')
+        result = schema.build({'subject': 'S', 'priority': 'High', 'due_by_time': 5}, _no_udfs)
+        assert result == {'request': {'subject': 'S', 'priority': {'name': 'High'}, 'due_by_time': {'value': 5}}}
+
+    def test_build_unknown_field_uses_allowed_index(self):
+        schema = get_entity_schema('request')
+        with pytest.raises(FieldValidationError) as exc:
+            schema.build({'bogus': 'x'}, _no_udfs)
+        assert "Invalid field 'bogus'" in str(exc.value)
+        assert "'subject'" in str(exc.value)
+
+    def test_build_conversion_error(self):
+        schema = get_entity_schema('request')
+        with pytest.raises(FieldValidationError):
+            schema.build({'requester': 'not-an-email'}, _no_udfs)
+
+    def test_build_udf_values(self):
+        schema = get_entity_schema('request')
+        result = schema.build({'udf_char1': 'v'}, lambda name: FieldSpec(name, 'string', 'udf'))
+        assert result == {'request': {'udf_fields': {'udf_char1': 'v'}}}
+
+    def test_compile_udfs_resolves_types(self):
+        schema = EntitySchema('request', MODULE_CONFIG['request'])
+        assert schema.compile_udfs(UDF_DEFINITIONS) is schema.compile_udfs(UDF_DEFINITIONS)
+        assert schema.get_udf('UDF_LONG1', UDF_DEFINITIONS).ftype == 'num'
+        assert schema.get_udf('udf_char2', UDF_DEFINITIONS).ftype == 'user'
+        assert schema.get_udf('udf_char9', UDF_DEFINITIONS) is None
+
+    def test_udf_lookup_uses_the_given_definitions(self):
+        schema = EntitySchema('request', MODULE_CONFIG['request'])
+        other = {'udf_long1': {'type': 'boolean'}}
+        results = []
+
+        def _lookup(definitions, expected):
+            for _i in range(200):
+                results.append((expected, schema.get_udf('udf_long1', definitions).ftype))
+
+        threads = [threading.Thread(target=_lookup, args=args) for args in ((UDF_DEFINITIONS, 'num'), (other, 'bool')) * 4]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert all(expected == ftype for expected, ftype in results)
+        assert schema.get_udf('udf_long1', UDF_DEFINITIONS).ftype == 'num'
+        assert schema.get_udf('udf_long1', other).ftype == 'bool'
+
+
+class TestConstructPayloadWithUdfMetadata:
+    def setup_method(self):
+        udf_utils.UDF_METADATA_CACHE.clear()
+
+    def teardown_method(self):
+        udf_utils.UDF_METADATA_CACHE.clear()
+
+    def _client(self):
+        client = MagicMock()
+        client.request.return_value = {'metainfo': {'fields': {'udf_fields': {'fields': UDF_DEFINITIONS}}}}
+        return client
+
+    def test_udf_metadata_fetched_once_and_typed(self):
+        client = self._client()
+        module = create_mock_module({
+            'parent_module_name': 'request',
+            'parent_id': None,
+            'payload': {'subject': 'S', 'udf_long1': '7', 'udf_char2': 'a@b.com'},
+        })
+        result = construct_payload(module, client)
+        assert result['request']['udf_fields'] == {'udf_long1': 7, 'udf_char2': {'email_id': 'a@b.com'}}
+
+        construct_payload(module, client)
+        client.request.assert_called_once()
+
+    def test_udf_metadata_endpoint_does_not_depend_on_the_record(self):
+        client = self._client()
+        module = create_mock_module({
+            'parent_module_name': 'request',
+            'parent_id': '42',
+            'payload': {'udf_long1': '7'},
+        })
+        construct_payload(module, client)
+
+        assert client.request.call_args[0][0] == 'requests/_metainfo'
+
+    def test_unknown_udf_fails(self):
+        module = create_mock_module({
+            'parent_module_name': 'request',
+            'parent_id': None,
+            'payload': {'udf_char99': 'x'},
+        })
+        with pytest.raises(SystemExit):
+            construct_payload(module, self._client())
+        assert 'Invalid UDF field' in module.fail_json.call_args[1]['msg']
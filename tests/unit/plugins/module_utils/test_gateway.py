@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import pytest
+from unittest.mock import patch
+
+from tests.unit.conftest import FETCH_URL_PATH, build_fetch_url_response, create_mock_module
+
+from plugins.module_utils.api_util import SDPClient
+from plugins.module_utils.concurrency import MAX_CONCURRENCY
+from plugins.module_utils.gateway import Gateway, GatewayServer, GatewayUnavailable
+
+
+class _Upstream(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), _UpstreamHandler)
+        self.connections = 0
+        self.requests = []
+        self.tokens = iter(['token-1', 'token-2'])
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+
+class _UpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _answer(self, status, document):
+        body = json.dumps(document).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.requests.append(('GET', self.path, None))
+        with self.server.lock:
+            self.server.active += 1
+            self.server.peak = max(self.server.peak, self.server.active)
+        if self.path.endswith('/slow'):
+            time.sleep(0.1)
+        with self.server.lock:
+            self.server.active -= 1
+        if self.path.endswith('/missing'):
+            self._answer(404, {'response_status': {'status_code': 4000}})
+        else:
+            self._answer(200, {'request': {'id': self.path.rsplit('/', 1)[-1]}})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8')
+        self.server.requests.append(('POST', self.path, body))
+        self._answer(200, {'access_token': next(self.server.tokens), 'expires_in': 3600})
+
+
+@pytest.fixture
+def upstream():
+    server = _Upstream()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def gateway(tmp_path):
+    path = str(tmp_path / 'gateway.sock')
+    server = GatewayServer(path, idle_timeout=60)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield Gateway(path)
+    server.shutdown()
+    server.server_close()
+
+
+def _url(upstream, path):
+    return 'http://127.0.0.1:{0}{1}'.format(upstream.server_address[1], path)
+
+
+class TestGateway:
+    def test_calls_are_relayed_over_one_kept_alive_connection(self, upstream, gateway):
+        for record_id in ('1', '2'):
+            response, info = gateway.fetch(_url(upstream, '/api/v3/requests/' + record_id), timeout=5)
+            assert info['status'] == 200
+            assert info['content-type'] == 'application/json'
+            assert json.loads(response.read(4) + response.read()) == {'request': {'id': record_id}}
+
+        assert upstream.connections == 1
+
+    def test_error_body_is_returned_in_info(self, upstream, gateway):
+        response, info = gateway.fetch(_url(upstream, '/api/v3/missing'), timeout=5)
+
+        assert response is None
+        assert info['status'] == 404
+        assert json.loads(info['body']) == {'response_status': {'status_code': 4000}}
+
+    def test_token_is_reused_until_rejected(self, upstream, gateway):
+        url, payload = _url(upstream, '/oauth/v2/token'), 'refresh_token=r&grant_type=refresh_token'
+
+        tokens = [json.loads(gateway.fetch_token(url, payload, timeout=5)[0].read())['access_token'] for _i in range(2)]
+        assert tokens == ['token-1', 'token-1']
+
+        response, _info = gateway.fetch_token(url, payload, timeout=5, stale_token='token-1')
+        assert json.loads(response.read())['access_token'] == 'token-2'
+        assert len(upstream.requests) == 2
+
+    def test_tasks_share_one_concurrency_limit(self, upstream, tmp_path):
+        path = str(tmp_path / 'gateway.sock')
+        server = GatewayServer(path, idle_timeout=60, concurrency=2)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        statuses = []
+
+        def _task():
+            # Each task is a separate client of the daemon, as forks are
+            response, info = Gateway(path).fetch(_url(upstream, '/api/v3/slow'), timeout=5)
+            response.read()
+            statuses.append(info['status'])
+
+        try:
+            tasks = [threading.Thread(target=_task) for _i in range(6)]
+            for task in tasks:
+                task.start()
+            for task in tasks:
+                task.join()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert statuses == [200] * 6
+        assert upstream.peak == 2
+
+    def test_call_without_a_free_slot_is_answered_busy(self, upstream, tmp_path):
+        url = _url(upstream, '/api/v3/requests/1')
+        server = GatewayServer(str(tmp_path / 'full.sock'), idle_timeout=60, concurrency=1)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            server.limiter(url).acquire()
+            response, info = Gateway(str(tmp_path / 'full.sock')).fetch(url, timeout=0.1)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert response is None
+        assert info['status'] == -1
+        assert info['gateway_busy'] is True
+        assert upstream.requests == []
+
+    @patch.dict('os.environ', {'SDP_CLOUD_GATEWAY': 'true'})
+    def test_limit_starts_at_the_maximum(self):
+        assert Gateway.from_env().concurrency == MAX_CONCURRENCY
+
+    @patch.dict('os.environ', {'SDP_CLOUD_GATEWAY': 'true', 'SDP_CLOUD_GATEWAY_CONCURRENCY': '0'})
+    def test_invalid_concurrency(self):
+        with pytest.raises(ValueError):
+            Gateway.from_env()
+
+    def test_unreachable_gateway_is_unavailable(self, tmp_path):
+        gateway = Gateway(str(tmp_path / 'none.sock'))
+
+        assert not gateway.is_running()
+        with pytest.raises(GatewayUnavailable):
+            gateway.fetch('https://example.com/', timeout=5)
+
+    @patch.dict('os.environ', {'SDP_CLOUD_GATEWAY': 'true', 'SDP_CLOUD_GATEWAY_IDLE_TIMEOUT': '0'})
+    def test_invalid_idle_timeout(self):
+        with pytest.raises(ValueError):
+            Gateway.from_env()
+
+
+class TestClientGateway:
+    PARAMS = {
+        'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+        'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+    }
+
+    @patch(FETCH_URL_PATH)
+    def test_calls_go_through_a_running_gateway(self, mock_fetch, tmp_path, monkeypatch):
+        monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path))
+        monkeypatch.setenv('SDP_CLOUD_GATEWAY', 'true')
+        server = GatewayServer(os.path.join(str(tmp_path), 'gateway.sock'))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            client = SDPClient(create_mock_module(dict(self.PARAMS)))
+            with patch.object(client.gateway, 'fetch', return_value=build_fetch_url_response({'requests': []})) as fetch:
+                assert client.call('requests') == {'requests': []}
+            fetch.assert_called_once()
+            mock_fetch.assert_not_called()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    @patch('time.sleep')
+    def test_busy_gateway_is_retried_without_tripping_the_breaker(self, _mock_sleep, tmp_path, monkeypatch):
+        monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path))
+        monkeypatch.setenv('SDP_CLOUD_GATEWAY', 'true')
+        monkeypatch.setenv('SDP_CLOUD_CIRCUIT_BREAKER', 'true')
+        monkeypatch.setenv('SDP_CLOUD_BREAKER_MIN_CALLS', '1')
+        busy = (None, {'status': -1, 'msg': 'Request failed: SDP gateway busy', 'gateway_busy': True})
+        with patch('plugins.module_utils.gateway.Gateway.ensure_running', return_value=True):
+            client = SDPClient(create_mock_module(dict(self.PARAMS)))
+        with patch.object(client.gateway, 'fetch', side_effect=[busy, busy, build_fetch_url_response({'requests': []})]):
+            assert client.call('requests') == {'requests': []}
+
+        assert client.breaker.state() == 'closed'
+        assert client.breaker.before_call() is False
+
+    @patch(FETCH_URL_PATH)
+    def test_falls_back_to_direct_calls(self, mock_fetch, tmp_path, monkeypatch):
+        monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path))
+        monkeypatch.setenv('SDP_CLOUD_GATEWAY', 'true')
+        mock_fetch.side_effect = lambda *args, **kwargs: build_fetch_url_response({'requests': []})
+        with patch('plugins.module_utils.gateway.Gateway.ensure_running', return_value=True):
+            client = SDPClient(create_mock_module(dict(self.PARAMS)))
+
+        assert client.call('requests') == {'requests': []}
+        assert client.gateway is None
+        assert mock_fetch.call_count == 1
+
+    @patch('plugins.module_utils.gateway.Gateway.ensure_running', return_value=False)
+    def test_warns_when_the_gateway_cannot_start(self, _mock_running, tmp_path, monkeypatch):
+        monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path))
+        monkeypatch.setenv('SDP_CLOUD_GATEWAY', 'true')
+        module = create_mock_module(dict(self.PARAMS))
+
+        assert SDPClient(module).gateway is None
+        module.warn.assert_called_once()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import gc
+import threading
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from tests.unit.conftest import FETCH_URL_PATH, build_fetch_url_response, create_mock_module
+
+from plugins.module_utils.api_util import SDPClient
+from plugins.module_utils import hedging
+from plugins.module_utils.hedging import FLUSH_EVERY, MIN_SAMPLES, Hedger, percentile
+from plugins.module_utils.local_cache import load_json, update_json
+
+
+KEY = 'https://test.example.com/app/portal/api/v3'
+
+
+def _seed(hedger, latency=0.01, requests=1000):
+    def _change(stats):
+        stats.update(latencies=[latency] * MIN_SAMPLES, requests=requests, hedged=0)
+    update_json(hedger.path, _change)
+
+
+class _SlowThenFast:
+    """send() whose first call blocks until released and whose second call answers at once."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+        self.first = MagicMock()
+        self.second = MagicMock()
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls == 1:
+            self.release.wait(5)
+            return self.first, {'status': 200}
+        return self.second, {'status': 200}
+
+
+class TestHedger:
+    def test_percentile_nearest_rank(self):
+        assert percentile([5, 1, 4, 2, 3], 50) == 3
+        assert percentile(list(range(1, 101)), 95) == 95
+
+    def test_no_hedge_until_latencies_are_known(self, tmp_path):
+        hedger = Hedger(KEY, directory=str(tmp_path))
+        send = MagicMock(return_value=('response', {'status': 200}))
+
+        assert hedger.run(send) == ('response', {'status': 200}, None)
+        send.assert_called_once()
+
+    def test_slow_request_is_hedged_and_loser_closed(self, tmp_path):
+        hedger = Hedger(KEY, directory=str(tmp_path))
+        _seed(hedger)
+        send = _SlowThenFast()
+
+        response, info, hedged = hedger.run(send)
+
+        assert (response, hedged) == (send.second, 'won')
+        send.release.set()
+        for thread in threading.enumerate():
+            if thread.name == 'sdp-hedge-0':
+                thread.join(5)
+        send.first.close.assert_called_once()
+
+    def test_hedges_are_capped(self, tmp_path):
+        hedger = Hedger(KEY, max_extra=0.05, directory=str(tmp_path))
+        _seed(hedger, requests=0)
+        send = _SlowThenFast()
+        threading.Timer(0.1, send.release.set).start()
+
+        response, _info, hedged = hedger.run(send)
+
+        assert (response, hedged, send.calls) == (send.first, None, 1)
+
+    def test_stats_are_kept_in_memory_and_flushed_in_batches(self, tmp_path):
+        first, second = Hedger(KEY, directory=str(tmp_path)), Hedger(KEY, directory=str(tmp_path))
+        send = MagicMock(return_value=('response', {'status': 200}))
+
+        with patch('plugins.module_utils.hedging.update_json', wraps=update_json) as write:
+            for _i in range(FLUSH_EVERY - 1):
+                first.run(send)
+            assert write.call_count == 0
+            first.run(send)
+            assert write.call_count == 1
+
+        second.run(send)
+        second.flush()
+        stats = load_json(first.path)
+        assert stats['requests'] == FLUSH_EVERY + 1
+        assert len(stats['latencies']) == FLUSH_EVERY + 1
+
+    def test_pending_stats_are_flushed_at_exit_without_keeping_hedgers_alive(self, tmp_path):
+        hedger = Hedger(KEY, directory=str(tmp_path))
+        hedger.run(MagicMock(return_value=('response', {'status': 200})))
+        path = hedger.path
+
+        hedging._flush_all()
+        assert load_json(path)['requests'] == 1
+
+        count = len(hedging._HEDGERS)
+        del hedger
+        gc.collect()
+        assert len(hedging._HEDGERS) == count - 1
+
+
+class TestClientHedging:
+    @patch(FETCH_URL_PATH)
+    def test_only_gets_are_hedged(self, mock_fetch, tmp_path, monkeypatch):
+        monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path))
+        monkeypatch.setenv('SDP_CLOUD_HEDGE', 'true')
+        mock_fetch.return_value = build_fetch_url_response({'request': {'id': '1'}})
+        client = SDPClient(create_mock_module({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+        }))
+
+        with patch.object(client.hedger, 'run', wraps=client.hedger.run) as run:
+            client.call('requests/1')
+            client.call('requests/1', method='PUT', data={'request': {'subject': 'x'}})
+
+        assert run.call_count == 1
+        assert client.metrics['hedged_requests'] == 0
+
+    @patch.dict('os.environ', {'SDP_CLOUD_HEDGE': 'true', 'SDP_CLOUD_HEDGE_PERCENTILE': '100'})
+    def test_invalid_percentile_fails(self):
+        with pytest.raises(SystemExit):
+            SDPClient(create_mock_module({
+                'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+                'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+            }))
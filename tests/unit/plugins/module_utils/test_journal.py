@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import pytest
+from unittest.mock import MagicMock
+
+from tests.unit.conftest import create_mock_module
+
+from plugins.module_utils.api_util import SDPAPIError
+from plugins.module_utils.bulk_helpers import apply_operations, summarize_operations
+from plugins.module_utils.journal import WriteJournal, open_journal, read_journal
+
+
+def _operations():
+    return [
+        dict(action='create', key='a', id=None, method='POST', endpoint='requests', data={'request': {'subject': 'a'}}),
+        dict(action='create', key='b', id=None, method='POST', endpoint='requests', data={'request': {'subject': 'b'}}),
+        dict(action='create', key='c', id=None, method='POST', endpoint='requests', data={'request': {'subject': 'c'}}),
+    ]
+
+
+def _client(fail=None):
+    client = MagicMock()
+
+    def call(endpoint, method='GET', data=None):
+        subject = data['request']['subject']
+        if fail and subject in fail:
+            raise fail[subject]
+        return {'request': {'id': 'id-' + subject}}
+
+    client.call.side_effect = call
+    return client
+
+
+class TestWriteJournal:
+    def test_intents_and_outcomes_are_journaled(self, tmp_path):
+        path = str(tmp_path / 'run.jsonl')
+        apply_operations(_client(), _operations(), 2, WriteJournal(path, 'request'))
+
+        with open(path) as f:
+            events = [json.loads(line)['event'] for line in f]
+        assert events[:3] == ['intent'] * 3
+        assert sorted(events[3:6]) == ['done'] * 3
+        assert events[-1] == 'complete'
+        assert read_journal(path) == []
+
+    def test_resume_replays_only_pending_and_retryable(self, tmp_path):
+        path = str(tmp_path / 'run.jsonl')
+        failures = {'b': SDPAPIError('Throttled', status=429), 'c': SDPAPIError('Invalid subject', status=4001)}
+        apply_operations(_client(fail=failures), _operations(), 1, WriteJournal(path, 'request'))
+        assert read_journal(path), 'a retryable failure leaves the run open'
+
+        client = _client()
+        results = apply_operations(client, _operations(), 1, WriteJournal(path, 'request'), resume=True)
+
+        assert [c.kwargs['data']['request']['subject'] for c in client.call.call_args_list] == ['b']
+        summary = summarize_operations('request', results)
+        assert [entry['id'] for entry in summary['created']] == ['id-a', 'id-b']
+        assert summary['failed'][0]['msg'] == 'Invalid subject'
+        assert read_journal(path) == []
+
+    def test_truncated_last_line_is_ignored(self, tmp_path):
+        path = tmp_path / 'run.jsonl'
+        path.write_text('{"event": "intent", "op": "x"}\n{"event": "do')
+        assert read_journal(str(path)) == [{'event': 'intent', 'op': 'x'}]
+
+    def test_interrupted_journal_requires_resume(self, tmp_path):
+        path = tmp_path / 'run.jsonl'
+        path.write_text('{"event": "intent", "op": "x"}\n')
+        module = create_mock_module({'journal': str(path), 'resume': False})
+        with pytest.raises(SystemExit):
+            open_journal(module, 'request')
+        assert 'resume=true' in module.fail_json.call_args[1]['msg']
+
+        assert open_journal(create_mock_module({'journal': str(path), 'resume': True}), 'request') is not None
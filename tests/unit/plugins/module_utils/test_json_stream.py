@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import json
+
+import pytest
+from unittest.mock import patch
+
+from tests.unit.conftest import FETCH_URL_PATH, build_fetch_url_response, create_mock_module
+
+from plugins.module_utils.api_util import SDPAPIError, SDPClient
+from plugins.module_utils.json_stream import iter_json_list
+
+
+BODY = {
+    'response_status': [{'status_code': 2000, 'status': 'success'}],
+    'requests': [{'id': '1', 'subject': 'Café ☕', 'n': 12345}, {'id': '2', 'subject': 'x' * 300}],
+    'list_info': {'has_more_rows': False, 'row_count': 2},
+}
+
+
+class TestIterJsonList:
+    @pytest.mark.parametrize('chunk_size', [1, 3, 7, 64 * 1024])
+    def test_streams_records_and_reports_other_members(self, chunk_size):
+        members = {}
+        stream = io.BytesIO(json.dumps(BODY, ensure_ascii=False).encode('utf-8'))
+
+        records = list(iter_json_list(stream, 'requests', members.__setitem__, chunk_size=chunk_size))
+
+        assert records == BODY['requests']
+        assert members == {'response_status': BODY['response_status'], 'list_info': BODY['list_info']}
+
+    def test_members_before_the_array_are_seen_before_records(self):
+        seen = []
+        stream = io.BytesIO(b'{"response_status": {"status_code": 4000}, "requests": [{"id": "1"}]}')
+        for record in iter_json_list(stream, 'requests', lambda key, value: seen.append(key)):
+            seen.append(record['id'])
+        assert seen == ['response_status', '1']
+
+    def test_truncated_body_raises(self):
+        stream = io.BytesIO(b'{"requests": [{"id": "1"}, {"id": "2"')
+        with pytest.raises(ValueError):
+            list(iter_json_list(stream, 'requests', chunk_size=4))
+
+    def test_empty_body_yields_nothing(self):
+        assert list(iter_json_list(io.BytesIO(b''), 'requests')) == []
+
+
+class TestCallStream:
+    def _client(self):
+        return SDPClient(create_mock_module({
+            'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+            'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+        }))
+
+    @patch(FETCH_URL_PATH)
+    def test_error_status_raises_while_streaming(self, mock_fetch):
+        mock_fetch.return_value = build_fetch_url_response(
+            {'response_status': {'status_code': 4001, 'messages': [{'message': 'Invalid input'}]}})
+        records, _meta = self._client().call_stream('requests', 'requests')
+
+        with pytest.raises(SDPAPIError) as excinfo:
+            list(records)
+        assert excinfo.value.status == 4001
+
+    @patch(FETCH_URL_PATH)
+    def test_iter_records_streams_pages_without_prefetch_by_default(self, mock_fetch):
+        mock_fetch.side_effect = [
+            build_fetch_url_response({'requests': [{'id': '1'}, {'id': '2'}], 'list_info': {'has_more_rows': True}}),
+            build_fetch_url_response({'list_info': {'has_more_rows': False}, 'requests': [{'id': '3'}]}),
+        ]
+        client = self._client()
+        with patch.object(client, '_prefetch') as prefetch:
+            records = list(client.iter_records('requests', 'requests', {'row_count': 2}))
+        assert [r['id'] for r in records] == ['1', '2', '3']
+        prefetch.assert_not_called()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+from unittest.mock import MagicMock
+
+from tests.unit.conftest import create_mock_module
+
+from plugins.module_utils.reference_data import (
+    ReferenceDataCache, build_name_index, check_lookup_values,
+)
+from plugins.module_utils.write_helpers import prevalidate_payload
+
+
+PRIORITIES = [{'id': '1', 'name': 'High'}, {'id': '2', 'name': 'Low'}]
+GROUPS = [{'id': '10', 'name': 'Network'}]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def _client(identity='user-1'):
+    client = MagicMock()
+    client.base_url = 'https://test.example.com/app/portal/api/v3'
+    client.cache_identity = identity
+    data = {'priorities': PRIORITIES, 'groups': GROUPS}
+    client.iter_records.side_effect = lambda endpoint, key, list_info=None, prefetch=0: iter(data.get(endpoint, []))
+    return client
+
+
+class TestReferenceDataCache:
+    def test_build_name_index(self):
+        assert build_name_index(PRIORITIES + [{'id': '3'}]) == {
+            'high': {'id': '1', 'name': 'High'},
+            'low': {'id': '2', 'name': 'Low'},
+        }
+
+    def test_resolve_is_case_insensitive(self):
+        cache = ReferenceDataCache(_client())
+        assert cache.resolve('priorities', 'hIGH') == {'id': '1', 'name': 'High'}
+        assert cache.resolve('priorities', 'Urgent') is None
+
+    def test_disk_cache_shared_between_instances(self):
+        first = _client()
+        ReferenceDataCache(first).get_index('priorities')
+        second = _client()
+        assert ReferenceDataCache(second).resolve('priorities', 'low')['id'] == '2'
+        second.iter_records.assert_not_called()
+
+    def test_disk_cache_is_kept_per_identity(self):
+        ReferenceDataCache(_client()).get_index('priorities')
+        other = _client(identity='user-2')
+        ReferenceDataCache(other).get_index('priorities')
+        other.iter_records.assert_called_once()
+
+    def test_zero_ttl_refetches(self):
+        ReferenceDataCache(_client()).get_index('priorities')
+        client = _client()
+        ReferenceDataCache(client, ttl=0).get_index('priorities')
+        client.iter_records.assert_called_once()
+
+
+class TestCheckLookupValues:
+    def test_rewrites_canonical_names(self):
+        data = {'request': {'priority': {'name': 'high'}, 'subject': 'x'}}
+        assert check_lookup_values(ReferenceDataCache(_client()), 'request', data) == []
+        assert data['request']['priority'] == {'name': 'High'}
+
+    def test_use_ids(self):
+        data = {'request': {'priority': {'name': 'Low'}, 'group': {'name': 'network'}}}
+        assert check_lookup_values(ReferenceDataCache(_client()), 'request', data, use_ids=True) == []
+        assert data['request']['priority'] == {'id': '2'}
+        assert data['request']['group'] == {'id': '10'}
+
+    def test_reports_all_invalid_values(self):
+        data = {'request': {'priority': {'name': 'Hgh'}, 'group': {'name': 'Nope'}}}
+        errors = check_lookup_values(ReferenceDataCache(_client()), 'request', data)
+        assert len(errors) == 2
+        assert "Invalid value 'Hgh' for field 'priority'" in errors[0] or "Invalid value 'Hgh' for field 'priority'" in errors[1]
+
+    def test_fields_without_reference_endpoint_untouched(self):
+        data = {'request': {'subcategory': {'name': 'Anything'}}}
+        client = _client()
+        assert check_lookup_values(ReferenceDataCache(client), 'request', data) == []
+        client.iter_records.assert_not_called()
+
+
+class TestPrevalidatePayload:
+    def test_disabled_by_default(self):
+        module = create_mock_module({'parent_module_name': 'request'})
+        client = _client()
+        data = {'request': {'priority': {'name': 'Bogus'}}}
+        assert prevalidate_payload(module, client, data) is data
+        client.iter_records.assert_not_called()
+
+    def test_fails_before_write(self):
+        module = create_mock_module({
+            'parent_module_name': 'request',
+            'validate_lookups': True,
+            'reference_cache_ttl': 3600,
+        })
+        with pytest.raises(SystemExit):
+            prevalidate_payload(module, _client(), {'request': {'priority': {'name': 'Bogus'}}})
+        assert 'Payload validation failed' in module.fail_json.call_args[1]['msg']
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+
+import pytest
+from unittest.mock import patch
+
+from tests.unit.conftest import FETCH_URL_PATH, build_fetch_url_response, create_mock_module
+
+from plugins.module_utils.api_util import SDPClient
+from plugins.module_utils.read_helpers import validate_cache_ttl
+from plugins.module_utils.response_cache import ResponseCache
+
+
+KEY = 'https://test.example.com/app/portal/api/v3'
+LIST_INFO = {'list_info': {'row_count': 10}}
+
+
+@pytest.fixture
+def clock():
+    with patch('plugins.module_utils.response_cache.time.time') as mock_time:
+        mock_time.return_value = 1000.0
+        yield mock_time
+
+
+def _fill(cache):
+    cache.put('requests', LIST_INFO, {'requests': [{'id': '100'}]})
+    cache.put('requests/100', None, {'request': {'id': '100'}})
+    cache.put('requests/100/notes', None, {'notes': []})
+    cache.put('requests/200', None, {'request': {'id': '200'}})
+
+
+class TestResponseCache:
+    def test_hit_within_ttl_returns_a_copy(self, tmp_path):
+        cache = ResponseCache(KEY, directory=str(tmp_path))
+        cache.put('requests', LIST_INFO, {'requests': []})
+
+        hit = cache.get('requests', {'list_info': {'row_count': 10}}, ttl=60)
+        hit['requests'].append('changed')
+
+        assert cache.get('requests', LIST_INFO, ttl=60) == {'requests': []}
+        assert cache.get('requests', {'list_info': {'row_count': 20}}, ttl=60) is None
+
+    def test_ttl_is_chosen_per_call(self, tmp_path, clock):
+        cache = ResponseCache(KEY, directory=str(tmp_path))
+        cache.put('requests/100', None, {'request': {}})
+        clock.return_value += 30
+
+        assert cache.get('requests/100', None, ttl=10) is None
+        assert cache.get('requests/100', None, ttl=60) == {'request': {}}
+
+    def test_disk_tier_is_shared_between_instances(self, tmp_path):
+        ResponseCache(KEY, directory=str(tmp_path)).put('requests/100', None, {'request': {'id': '100'}})
+
+        assert ResponseCache(KEY, directory=str(tmp_path)).get('requests/100', None, ttl=60) == {'request': {'id': '100'}}
+
+    def test_tiers_are_size_bounded_lru(self, tmp_path):
+        cache = ResponseCache(KEY, memory_entries=2, disk_entries=2, directory=str(tmp_path))
+        cache.put('requests/1', None, {'n': 1})
+        cache.put('requests/2', None, {'n': 2})
+        os.utime(cache._path(cache._key('requests/1', None)), (0, 0))
+        cache.put('requests/3', None, {'n': 3})
+
+        assert len(cache._memory) == 2
+        assert ResponseCache(KEY, directory=str(tmp_path)).get('requests/1', None, ttl=60) is None
+        assert ResponseCache(KEY, directory=str(tmp_path)).get('requests/2', None, ttl=60) == {'n': 2}
+
+    def test_disk_tier_is_not_walked_on_every_put(self, tmp_path):
+        cache = ResponseCache(KEY, disk_entries=20, directory=str(tmp_path))
+        with patch('os.walk', wraps=os.walk) as walk:
+            for n in range(22):
+                cache.put('requests/{0}'.format(n), None, {'n': n})
+            assert walk.call_count == 1
+
+            cache.put('requests/22', None, {'n': 22})
+            assert walk.call_count == 2
+        assert sum(len(files) for _root, _dirs, files in os.walk(cache.directory)) == 20
+
+    def test_update_invalidates_record_subresources_and_lists(self, tmp_path):
+        cache = ResponseCache(KEY, directory=str(tmp_path))
+        _fill(cache)
+        cache.invalidate('requests/100')
+
+        for cached in (cache, ResponseCache(KEY, directory=str(tmp_path))):
+            assert cached.get('requests', LIST_INFO, ttl=60) is None
+            assert cached.get('requests/100', None, ttl=60) is None
+            assert cached.get('requests/100/notes', None, ttl=60) is None
+            assert cached.get('requests/200', None, ttl=60) == {'request': {'id': '200'}}
+
+    def test_create_only_invalidates_lists(self, tmp_path):
+        cache = ResponseCache(KEY, directory=str(tmp_path))
+        _fill(cache)
+        cache.invalidate('requests', subtree=False)
+
+        for cached in (cache, ResponseCache(KEY, directory=str(tmp_path))):
+            assert cached.get('requests', LIST_INFO, ttl=60) is None
+            assert cached.get('requests/100', None, ttl=60) == {'request': {'id': '100'}}
+
+    def test_multi_id_write_invalidates_lists_and_named_records(self, tmp_path):
+        cache = ResponseCache(KEY, directory=str(tmp_path))
+        _fill(cache)
+        cache.put('requests?ids=100', None, {'requests': []})
+        cache.invalidate('requests?ids=100,300', subtree=True)
+
+        for cached in (cache, ResponseCache(KEY, directory=str(tmp_path))):
+            assert cached.get('requests', LIST_INFO, ttl=60) is None
+            assert cached.get('requests?ids=100', None, ttl=60) is None
+            assert cached.get('requests/100', None, ttl=60) is None
+            assert cached.get('requests/100/notes', None, ttl=60) is None
+            assert cached.get('requests/200', None, ttl=60) == {'request': {'id': '200'}}
+
+    def test_negative_cache_ttl_fails(self):
+        with pytest.raises(SystemExit):
+            validate_cache_ttl(create_mock_module({'cache_ttl': -1}))
+
+
+class TestClientResponseCache:
+    PARAMS = {
+        'domain': 'test.example.com', 'portal_name': 'portal', 'auth_token': 'tok',
+        'client_id': None, 'client_secret': None, 'refresh_token': None, 'dc': 'US',
+    }
+
+    @patch(FETCH_URL_PATH)
+    def test_cached_gets_skip_the_api_until_written(self, mock_fetch, tmp_path, monkeypatch):
+        monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path))
+        mock_fetch.side_effect = lambda *args, **kwargs: build_fetch_url_response({'request': {'id': '100'}})
+        client = SDPClient(create_mock_module(dict(self.PARAMS)))
+
+        client.call('requests/100', cache_ttl=60)
+        other = SDPClient(create_mock_module(dict(self.PARAMS)))
+        assert other.call('requests/100', cache_ttl=60) == {'request': {'id': '100'}}
+        client.call('requests/100')
+        assert mock_fetch.call_count == 2
+        assert other.metrics['cache_hits'] == 1
+
+        client.call('requests/100', method='PUT', data={'request': {'subject': 'x'}})
+        other.call('requests/100', cache_ttl=60)
+        assert mock_fetch.call_count == 4
+
+    @patch(FETCH_URL_PATH)
+    def test_gets_without_cache_ttl_are_not_cached(self, mock_fetch, tmp_path, monkeypatch):
+        monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path))
+        mock_fetch.side_effect = lambda *args, **kwargs: build_fetch_url_response({'requests': []})
+        client = SDPClient(create_mock_module(dict(self.PARAMS)))
+
+        client.call('requests')
+        client.call('requests', cache_ttl=60)
+
+        assert mock_fetch.call_count == 2
+        assert client.metrics['cache_hits'] == 0
+
+    @patch(FETCH_URL_PATH)
+    def test_credentials_do_not_share_entries(self, mock_fetch, tmp_path, monkeypatch):
+        monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path))
+        mock_fetch.side_effect = lambda *args, **kwargs: build_fetch_url_response({'request': {'id': '100'}})
+        SDPClient(create_mock_module(dict(self.PARAMS))).call('requests/100', cache_ttl=60)
+
+        other = SDPClient(create_mock_module(dict(self.PARAMS, auth_token='other')))
+        other.call('requests/100', cache_ttl=60)
+
+        assert mock_fetch.call_count == 2
+        assert other.metrics['cache_hits'] == 0
+
+    @patch(FETCH_URL_PATH)
+    def test_refresh_tokens_of_one_client_do_not_share_entries(self, mock_fetch, tmp_path, monkeypatch):
+        monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path))
+        mock_fetch.side_effect = lambda *args, **kwargs: build_fetch_url_response({'request': {'id': '100'}})
+        params = dict(self.PARAMS, client_id='shared', client_secret='secret', refresh_token='alice')
+        alice = SDPClient(create_mock_module(dict(params)))
+        bob = SDPClient(create_mock_module(dict(params, refresh_token='bob')))
+        alice.call('requests/100', cache_ttl=60)
+
+        bob.call('requests/100', cache_ttl=60)
+        assert bob.metrics['cache_hits'] == 0
+        assert mock_fetch.call_count == 2
+
+        assert SDPClient(create_mock_module(dict(params))).call('requests/100', cache_ttl=60)
+        assert mock_fetch.call_count == 2
+
+        # A write by one user drops the entries every other user cached for the record
+        alice.call('requests/100', method='PUT', data={'request': {'subject': 'x'}})
+        bob.call('requests/100', cache_ttl=60)
+        assert bob.metrics['cache_hits'] == 0
+        assert mock_fetch.call_count == 4
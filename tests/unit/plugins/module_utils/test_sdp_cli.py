@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import json
+from urllib.parse import parse_qs
+
+import pytest
+from unittest.mock import patch
+
+from tests.unit.conftest import build_fetch_url_error, build_fetch_url_response
+
+from plugins.module_utils.sdp_cli import main
+
+
+CONNECTION = ['--domain', 'test.example.com', '--portal-name', 'portal', '--dc', 'US', '--auth-token', 'tok', '--quiet']
+
+
+@pytest.fixture
+def transport():
+    with patch('plugins.module_utils.sdp_core.PooledTransport') as transport_class:
+        yield transport_class.return_value
+
+
+def _run(*argv):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    status = main(CONNECTION + list(argv), stdout=stdout, stderr=stderr)
+    return status, json.loads(stdout.getvalue()), stderr.getvalue()
+
+
+def _page(records, has_more_rows):
+    return build_fetch_url_response({'requests': records, 'list_info': {'has_more_rows': has_more_rows}})
+
+
+def _list_info(call):
+    return json.loads(parse_qs(call[1]['data'])['input_data'][0])['list_info']
+
+
+class TestExport:
+    def test_interrupted_export_resumes_from_the_checkpoint(self, transport, tmp_path):
+        output, checkpoint = str(tmp_path / 'requests.jsonl'), str(tmp_path / 'requests.checkpoint')
+        args = ('export', 'request', '--output', output, '--checkpoint', checkpoint, '--row-count', '2')
+        transport.side_effect = [
+            _page([{'id': '1'}, {'id': '2'}], True),
+            build_fetch_url_error(400, body={'response_status': {'messages': [{'message': 'Bad'}]}}),
+        ]
+
+        status, result, stderr = _run(*args)
+        assert status == 1
+        assert result['records'] == 2
+        assert stderr.startswith('error:')
+
+        transport.side_effect = [_page([{'id': '3'}], False)]
+        status, result, _stderr = _run(*args)
+
+        assert status == 0
+        assert result == {'output': output, 'records': 3, 'skipped': 2}
+        with open(output) as f:
+            assert [json.loads(line)['id'] for line in f] == ['1', '2', '3']
+        assert _list_info(transport.call_args)['start_index'] == 3
+
+    def test_checkpoint_of_another_export_is_refused(self, transport, tmp_path):
+        checkpoint = str(tmp_path / 'export.checkpoint')
+        transport.side_effect = [_page([], False)]
+        _run('export', 'request', '--output', str(tmp_path / 'a.jsonl'), '--checkpoint', checkpoint)
+
+        status, result, _stderr = _run('export', 'request', '--output', str(tmp_path / 'b.jsonl'), '--checkpoint', checkpoint)
+
+        assert status == 1
+        assert 'belongs to another export' in result['msg']
+
+
+class TestPartitionedExport:
+    TIMES = [100, 150, 700, 710, 720, 730]
+
+    def _answer(self, url, data=None, **kwargs):
+        list_info = _list_info(((), {'data': data}))
+        records = [{'id': str(value), 'created_time': {'value': str(value)}} for value in self.TIMES]
+        for condition in list_info.get('search_criteria') or []:
+            bound = int(condition['value'])
+            if condition['condition'] == 'greater or equal':
+                records = [record for record in records if int(record['id']) >= bound]
+            else:
+                records = [record for record in records if int(record['id']) < bound]
+        if list_info.get('sort_order') == 'desc':
+            records.reverse()
+        start = (list_info.get('start_index') or 1) - 1
+        page = records[start:start + list_info['row_count']]
+        return build_fetch_url_response({'requests': page, 'list_info': {
+            'total_count': len(records), 'has_more_rows': start + len(page) < len(records)}})
+
+    def test_windows_are_fetched_and_joined_in_time_order(self, transport, tmp_path):
+        output = str(tmp_path / 'requests.jsonl')
+        transport.side_effect = self._answer
+
+        status, result, _stderr = _run('--concurrency', '3', 'export', 'request', '--output', output,
+                                       '--partition-by', 'created_time', '--window-records', '2', '--row-count', '1')
+
+        assert status == 0
+        assert result['records'] == 6
+        assert result['windows'] >= 3
+        with open(output) as f:
+            assert [int(json.loads(line)['id']) for line in f] == self.TIMES
+        assert not (tmp_path / 'requests.jsonl.parts').exists()
+
+    def test_rerun_fetches_only_failed_windows(self, transport, tmp_path):
+        output, checkpoint = str(tmp_path / 'requests.jsonl'), str(tmp_path / 'requests.checkpoint')
+        args = ('--concurrency', '1', 'export', 'request', '--output', output, '--checkpoint', checkpoint,
+                '--partition-by', 'created_time', '--window-records', '3', '--since', '0', '--until', '1000')
+
+        def _failing(url, data=None, **kwargs):
+            list_info = _list_info(((), {'data': data}))
+            if not list_info.get('get_total_count') and list_info['search_criteria'][0]['value'] != '0':
+                return build_fetch_url_error(400, body={'response_status': {'messages': [{'message': 'Bad'}]}})
+            return self._answer(url, data=data)
+
+        transport.side_effect = _failing
+        status, result, _stderr = _run(*args)
+        assert status == 1
+        assert result['records'] == 2
+        failed = len(result['failed'])
+        assert failed == result['windows'] - 1
+
+        transport.reset_mock()
+        transport.side_effect = self._answer
+        status, result, _stderr = _run(*args)
+
+        assert status == 0
+        assert result['skipped'] == 1
+        with open(output) as f:
+            assert [int(json.loads(line)['id']) for line in f] == self.TIMES
+        # Neither the plan nor the finished window is fetched again
+        assert transport.call_count == failed
+
+
+class TestImport:
+    def test_rows_are_created_and_invalid_rows_reported(self, transport, tmp_path):
+        src = tmp_path / 'tickets.csv'
+        src.write_text('Title,Notes\nDisk full,x\n,y\nPrinter,z\n')
+        transport.side_effect = lambda *args, **kwargs: build_fetch_url_response({'request': {'id': '500'}})
+
+        status, result, _stderr = _run('import', 'request', str(src), '--map', 'Title=subject', '--map', 'Notes=')
+
+        assert status == 1
+        assert (result['rows'], result['created'], result['last_row']) == (3, 2, 3)
+        assert [entry['row'] for entry in result['failed']] == [2]
+        assert transport.call_count == 2
+
+    @patch('plugins.module_utils.sdp_core.time.sleep')
+    def test_batch_with_retryable_failures_is_not_committed(self, _mock_sleep, transport, tmp_path):
+        src, checkpoint = tmp_path / 'tickets.csv', str(tmp_path / 'tickets.checkpoint')
+        src.write_text('subject\nDisk full\nPrinter\nVPN down\n')
+
+        def _answer(url, data=None, **kwargs):
+            if 'Printer' in data:
+                return build_fetch_url_error(503)
+            return build_fetch_url_response({'request': {'id': '500'}})
+
+        transport.side_effect = _answer
+        status, result, _stderr = _run('--concurrency', '1', 'import', 'request', str(src), '--batch-size', '2',
+                                       '--checkpoint', checkpoint)
+
+        assert status == 1
+        assert (result['rows'], result['created'], result['last_row']) == (2, 1, 0)
+        assert [(entry['row'], entry['status']) for entry in result['failed']] == [(2, 503)]
+
+    def test_dry_run_sends_nothing(self, transport, tmp_path):
+        src = tmp_path / 'tickets.jsonl'
+        src.write_text('{"subject": "Disk full"}\n')
+
+        status, result, _stderr = _run('import', 'request', str(src), '--dry-run')
+
+        assert status == 0
+        assert result['created'] == 1
+        transport.assert_not_called()
+
+
+class TestBulkWrites:
+    def test_bulk_update_only_writes_differing_records(self, transport):
+        records = [{'id': '1', 'status': {'name': 'Closed'}}, {'id': '2', 'status': {'name': 'Open'}}]
+        transport.side_effect = [
+            build_fetch_url_response({'requests': records}),
+            build_fetch_url_response({'request': {'id': '2'}}),
+        ]
+
+        status, result, _stderr = _run('bulk-update', 'request', '--ids', '1,2,3', '--set', 'status=Closed')
+
+        assert status == 0
+        assert (result['updated'], result['unchanged'], result['missing']) == (['2'], ['1'], ['3'])
+        assert transport.call_args[1]['method'] == 'PUT'
+
+    def test_bulk_delete_reports_absent_records(self, transport, tmp_path):
+        ids_file = tmp_path / 'ids.txt'
+        ids_file.write_text('10\n11\n')
+        transport.side_effect = [build_fetch_url_response({}), build_fetch_url_error(404)]
+
+        status, result, _stderr = _run('--concurrency', '1', 'bulk-delete', 'problem', '--ids-file', str(ids_file),
+                                       '--skip-existence-check')
+
+        assert status == 0
+        assert (result['deleted'], result['already_absent']) == (['10'], ['11'])
+
+    def test_bulk_writes_report_progress(self, transport):
+        transport.side_effect = lambda *args, **kwargs: build_fetch_url_response({})
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        argv = [arg for arg in CONNECTION if arg != '--quiet'] + ['bulk-delete', 'request', '--ids', '1,2', '--skip-existence-check']
+
+        status = main(argv, stdout=stdout, stderr=stderr)
+
+        assert status == 0
+        assert stderr.getvalue().startswith('bulk-delete request: {0} deletes'.format(transport.call_count))
+        assert transport.call_count
+
+
+class TestConnection:
+    @patch.dict('os.environ', {'SDP_CLOUD_CLIENT_ID': 'id'})
+    def test_conflicting_credentials(self, transport):
+        status, result, _stderr = _run('bulk-delete', 'request', '--ids', '1')
+
+        assert status == 1
+        assert 'cannot be combined' in result['msg']
+        transport.assert_not_called()
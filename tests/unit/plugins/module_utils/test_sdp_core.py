@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from tests.unit.conftest import build_fetch_url_error, build_fetch_url_response
+
+from plugins.module_utils.sdp_core import PooledTransport, SDPAPIError, SDPCoreClient
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), _Handler)
+        self.connections = 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        status = 404 if self.path.endswith('/missing') else 200
+        body = json.dumps({'path': self.path}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = _Server()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(transport, **kwargs):
+    kwargs.setdefault('auth_token', 'tok')
+    return SDPCoreClient('test.example.com', 'portal', dc='US', transport=transport, **kwargs)
+
+
+class TestPooledTransport:
+    def test_reuses_the_connection(self, server):
+        transport = PooledTransport()
+        url = 'http://127.0.0.1:{0}/api/v3/requests'.format(server.server_address[1])
+
+        for _i in range(2):
+            response, info = transport(url, headers={'Accept': 'application/json'}, timeout=5)
+            assert info['status'] == 200
+            assert info['content-type'] == 'application/json'
+            assert json.loads(response.read()) == {'path': '/api/v3/requests'}
+
+        assert server.connections == 1
+
+    def test_http_error_body_is_in_info(self, server):
+        response, info = PooledTransport()('http://127.0.0.1:{0}/missing'.format(server.server_address[1]), timeout=5)
+
+        assert response is None
+        assert info['status'] == 404
+        assert info['msg'].startswith('HTTP Error 404')
+        assert json.loads(info['body']) == {'path': '/missing'}
+
+
+class TestSDPCoreClient:
+    def test_call_without_a_module(self):
+        transport = MagicMock(return_value=build_fetch_url_response({'request': {'id': '100'}}))
+
+        assert _client(transport).call('requests/100') == {'request': {'id': '100'}}
+        url = transport.call_args[0][0]
+        assert url == 'https://test.example.com/app/portal/api/v3/requests/100'
+        assert transport.call_args[1]['headers']['Authorization'] == 'Zoho-oauthtoken tok'
+
+    def test_errors_are_raised(self):
+        transport = MagicMock(return_value=build_fetch_url_error(400, body={'response_status': {'messages': [{'message': 'Bad'}]}}))
+
+        with pytest.raises(SDPAPIError) as error:
+            _client(transport).call('requests', method='POST', data={'request': {}})
+        assert error.value.status == 400
+
+    def test_missing_credentials(self):
+        with pytest.raises(SDPAPIError, match='Missing authentication credentials'):
+            _client(MagicMock(), auth_token=None).call('requests')
+
+    def test_refresh_token_is_exchanged_through_the_transport(self):
+        transport = MagicMock(side_effect=[
+            build_fetch_url_response({'access_token': 'generated', 'expires_in': 3600}),
+            build_fetch_url_response({'requests': []}),
+        ])
+        client = _client(transport, auth_token=None, client_id='id', client_secret='secret', refresh_token='refresh')
+
+        assert client.call('requests') == {'requests': []}
+        assert transport.call_args_list[0][0][0] == 'https://accounts.zoho.com/oauth/v2/token'
+        assert transport.call_args[1]['headers']['Authorization'] == 'Zoho-oauthtoken generated'
+
+    def test_invalid_timeout(self):
+        with pytest.raises(ValueError):
+            _client(MagicMock(), timeout=-1)
+
+    def test_upsert_skips_unchanged_records(self):
+        current = {'request': {'id': '100', 'subject': 'Disk full'}}
+        transport = MagicMock(return_value=build_fetch_url_response(current))
+
+        assert _client(transport).upsert('request', {'subject': 'Disk full'}, record_id='100') == (False, current['request'])
+        assert transport.call_count == 1
+
+    def test_upsert_creates_records(self):
+        transport = MagicMock(return_value=build_fetch_url_response({'request': {'id': '200', 'subject': 'New'}}))
+
+        changed, record = _client(transport).upsert('request', {'subject': 'New'})
+
+        assert (changed, record['id']) == (True, '200')
+        assert transport.call_args[1]['method'] == 'POST'
+
+    def test_udf_metadata_is_shared_between_clients(self):
+        metainfo = {'metainfo': {'fields': {'udf_fields': {'fields': {'udf_char1': {'type': 'string'}}}}}}
+        transport = MagicMock(side_effect=lambda *args, **kwargs: build_fetch_url_response(metainfo))
+
+        for _i in range(2):
+            assert _client(transport).udf_metadata('request') == {'udf_char1': {'type': 'string'}}
+        transport.assert_called_once()
+        assert transport.call_args[0][0].endswith('/requests/_metainfo')
+
+    @patch('plugins.module_utils.sdp_core.time.sleep')
+    def test_delete_of_missing_record(self, _mock_sleep):
+        transport = MagicMock(return_value=build_fetch_url_error(404))
+
+        assert _client(transport).delete('request', '100') is False
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from unittest.mock import patch
+
+from plugins.module_utils.sdp_core import DeadlineExceeded, SDPAPIError
+from plugins.module_utils.time_windows import (
+    fetch_windows, plan_windows, time_bounds, window_criteria,
+)
+
+
+class FakeClient:
+    """Answers list calls over records created at the given times, honouring window_criteria ranges."""
+
+    def __init__(self, times):
+        self.records = [{'id': str(index), 'created_time': {'value': str(value)}} for index, value in enumerate(times)]
+        self.calls = []
+
+    def remaining_time(self):
+        return None
+
+    def call(self, endpoint, method='GET', data=None, **kwargs):
+        list_info = data['list_info']
+        self.calls.append(list_info)
+        records = self.records
+        for condition in list_info.get('search_criteria') or []:
+            if 'field' not in condition:
+                continue
+            value = int(condition['value'])
+            if condition['condition'] == 'greater or equal':
+                records = [r for r in records if int(r['created_time']['value']) >= value]
+            elif condition['condition'] == 'lesser than':
+                records = [r for r in records if int(r['created_time']['value']) < value]
+        records = sorted(records, key=lambda r: int(r['created_time']['value']),
+                         reverse=list_info.get('sort_order') == 'desc')
+        return {endpoint: records[:list_info['row_count']], 'list_info': {'total_count': len(records)}}
+
+
+class TestWindowCriteria:
+    def test_range_is_half_open(self):
+        assert window_criteria('created_time', 10, 20) == [
+            {'field': 'created_time', 'condition': 'greater or equal', 'value': '10'},
+            {'field': 'created_time', 'condition': 'lesser than', 'value': '20', 'logical_operator': 'AND'},
+        ]
+
+    def test_caller_criteria_are_anded_as_one_group(self):
+        conditions = [
+            {'field': 'status.name', 'condition': 'is', 'value': 'Open'},
+            {'field': 'status.name', 'condition': 'is', 'value': 'On Hold', 'logical_operator': 'OR'},
+        ]
+
+        criteria = window_criteria('created_time', 10, 20, conditions)
+
+        assert criteria[2] == {'logical_operator': 'AND', 'children': conditions}
+
+    def test_operator_of_the_first_caller_condition_is_kept(self):
+        condition = {'field': 'status.name', 'condition': 'is', 'value': 'Open', 'logical_operator': 'OR',
+                     'children': [{'field': 'priority.name', 'condition': 'is', 'value': 'High', 'logical_operator': 'AND'}]}
+
+        criteria = window_criteria('created_time', 10, 20, condition)
+
+        assert criteria[2] == {'logical_operator': 'AND', 'children': [condition]}
+        assert condition['logical_operator'] == 'OR'
+
+
+class TestPlanWindows:
+    def test_dense_periods_get_narrow_windows(self):
+        times = list(range(0, 1000, 100)) + list(range(5000, 5100))
+        client = FakeClient(times)
+
+        windows = plan_windows(client, 'requests', 'created_time', 0, 10000, window_records=25, max_workers=1)
+
+        assert sum(window['count'] for window in windows) == len(times)
+        assert all(window['count'] <= 25 for window in windows)
+        assert all(a['end'] <= b['start'] for a, b in zip(windows, windows[1:]))
+        assert windows[0]['end'] - windows[0]['start'] > windows[-1]['end'] - windows[-1]['start']
+
+    @patch('plugins.module_utils.time_windows.time.sleep')
+    def test_failed_probes_are_retried(self, mock_sleep):
+        client = FakeClient(list(range(0, 1000, 10)))
+        answer = client.call
+        failures = [SDPAPIError('Too many requests', status=429), SDPAPIError('Server error', status=503)]
+
+        def _call(endpoint, **kwargs):
+            if failures and len(client.calls) == 1:
+                raise failures.pop()
+            return answer(endpoint, **kwargs)
+
+        client.call = _call
+        windows = plan_windows(client, 'requests', 'created_time', 0, 1000, window_records=30, max_workers=1)
+
+        assert not failures
+        assert sum(window['count'] for window in windows) == 100
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [2, 4]
+
+    def test_time_bounds(self):
+        assert time_bounds(FakeClient([300, 100, 200]), 'requests', 'created_time') == (100, 301)
+        assert time_bounds(FakeClient([]), 'requests', 'created_time') is None
+
+
+class TestFetchWindows:
+    @patch('plugins.module_utils.time_windows.time.sleep')
+    def test_only_the_failed_window_is_retried(self, mock_sleep):
+        windows = [dict(start=0, end=10), dict(start=10, end=20)]
+        attempts = []
+
+        def _fetch(window):
+            attempts.append(window['start'])
+            if window['start'] == 10 and attempts.count(10) == 1:
+                raise SDPAPIError('Server error', status=503)
+            return window['start']
+
+        results = fetch_windows(_fetch, windows, max_workers=1)
+
+        assert [(result, error) for _window, result, error in results] == [(0, None), (10, None)]
+        assert attempts == [0, 10, 10]
+        mock_sleep.assert_called_once_with(2)
+
+    @patch('plugins.module_utils.time_windows.time.sleep')
+    def test_retry_past_the_deadline_is_not_waited_for(self, mock_sleep):
+        def _fetch(window):
+            raise SDPAPIError('Server error', status=503)
+
+        [(_window, result, error)] = fetch_windows(_fetch, [dict(start=0, end=10)], remaining_time=lambda: 1)
+
+        assert result is None
+        assert isinstance(error, DeadlineExceeded)
+        mock_sleep.assert_not_called()
+
+    def test_non_retryable_errors_are_reported(self):
+        def _fetch(window):
+            raise SDPAPIError('Bad request', status=400)
+
+        [(_window, result, error)] = fetch_windows(_fetch, [dict(start=0, end=10)])
+
+        assert result is None
+        assert error.status == 400
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import time
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from tests.unit.conftest import create_mock_module
+
+from plugins.module_utils.user_directory import (
+    DIRECTORY_ENDPOINTS, FULL_SYNC_TTLS, UserDirectory, check_user_values, collect_user_references,
+)
+from plugins.module_utils.write_helpers import prevalidate_payloads
+
+
+USERS = [{'id': '1', 'name': 'Ann', 'email_id': 'ann@example.com'}]
+TECHNICIANS = [{'id': '2', 'name': 'Tom', 'email_id': 'Tom@Example.com'}]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('SDP_CLOUD_CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def _client(extra_users=None, identity='user-1'):
+    client = MagicMock()
+    client.base_url = 'https://test.example.com/app/portal/api/v3'
+    client.cache_identity = identity
+
+    def iter_records(endpoint, key, list_info=None, prefetch=0):
+        records = list(USERS if endpoint == 'users' else TECHNICIANS)
+        criteria = (list_info or {}).get('search_criteria')
+        if criteria and criteria['field'] == 'email_id' and endpoint == 'users':
+            records = [r for r in (extra_users or []) if r['email_id'] in criteria['values']]
+        elif criteria:
+            records = []
+        return iter(records)
+
+    client.iter_records.side_effect = iter_records
+    return client
+
+
+class TestUserDirectory:
+    def test_lookup_by_email_is_case_insensitive(self):
+        directory = UserDirectory(_client())
+        assert directory.get('ANN@example.com')['id'] == '1'
+        assert directory.get('tom@example.com')['type'] == 'technicians'
+
+    def test_cached_on_disk_within_ttl(self):
+        UserDirectory(_client()).get('ann@example.com')
+        client = _client()
+        assert UserDirectory(client).get('tom@example.com')['id'] == '2'
+        client.iter_records.assert_not_called()
+
+    def test_cache_is_kept_per_identity(self):
+        UserDirectory(_client()).get('ann@example.com')
+        client = _client(identity='user-2')
+        UserDirectory(client).get('ann@example.com')
+        assert client.iter_records.call_count == len(DIRECTORY_ENDPOINTS)
+
+    def test_expired_cache_uses_delta_sync(self):
+        UserDirectory(_client(), ttl=10).get('ann@example.com')
+        client = _client()
+        with patch('plugins.module_utils.user_directory.time.time', return_value=time.time() + 20):
+            UserDirectory(client, ttl=10).get('ann@example.com')
+        assert client.iter_records.call_count == 2
+        for call in client.iter_records.call_args_list:
+            assert call.args[2]['search_criteria']['field'] == 'last_updated_time'
+
+    def test_stale_snapshot_is_rebuilt_without_removed_users(self):
+        UserDirectory(_client(), ttl=10).get('ann@example.com')
+        with patch('plugins.module_utils.user_directory.time.time', return_value=time.time() + 20):
+            UserDirectory(_client(), ttl=10).get('ann@example.com')
+
+        client = _client()
+        with patch.dict(TECHNICIANS[0], email_id='tom@elsewhere.com'):
+            with patch('plugins.module_utils.user_directory.time.time', return_value=time.time() + 10 * FULL_SYNC_TTLS + 1):
+                directory = UserDirectory(client, ttl=10)
+                assert directory.get('tom@example.com') is None
+        assert all('search_criteria' not in call.args[2] for call in client.iter_records.call_args_list)
+
+    def test_misses_resolved_with_targeted_lookup(self):
+        new_user = {'id': '3', 'name': 'New', 'email_id': 'new@example.com'}
+        directory = UserDirectory(_client(extra_users=[new_user]))
+        assert directory.find_unknown(['new@example.com', 'ghost@example.com', 'ann@example.com']) == ['ghost@example.com']
+        assert directory.get('new@example.com')['id'] == '3'
+
+
+class TestCheckUserValues:
+    def test_collects_top_level_grouped_and_udf_references(self):
+        data = {'request': {
+            'requester': {'email_id': 'a@x.com'},
+            'priority': {'name': 'High'},
+            'udf_fields': {'udf_char1': {'email_id': 'b@x.com'}, 'udf_char2': 'plain'},
+        }}
+        assert sorted(collect_user_references('request', data)) == [('requester', 'a@x.com'), ('udf_char1', 'b@x.com')]
+
+    def test_reports_unknown_users_across_payloads(self):
+        payloads = [
+            {'request': {'requester': {'email_id': 'ann@example.com'}}},
+            {'request': {'technician': {'email_id': 'ghost@example.com'}}},
+        ]
+        errors = check_user_values(UserDirectory(_client()), 'request', payloads)
+        assert errors == ["User 'ghost@example.com' for field 'technician' does not exist in the portal."]
+
+    def test_prevalidate_payloads_fails_on_unknown_user(self):
+        module = create_mock_module({'parent_module_name': 'request', 'validate_users': True, 'reference_cache_ttl': 3600})
+        with pytest.raises(SystemExit):
+            prevalidate_payloads(module, _client(), [{'request': {'requester': {'email_id': 'ghost@example.com'}}}])
+        assert module.fail_json.call_args[1]['errors'] == ["User 'ghost@example.com' for field 'requester' does not exist in the portal."]
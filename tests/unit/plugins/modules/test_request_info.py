@@ -6,9 +6,12 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 import pytest
+from unittest.mock import MagicMock
 
 from tests.unit.conftest import create_mock_module
-from plugins.module_utils.read_helpers import construct_list_payload
+from plugins.module_utils import read_helpers
+from plugins.module_utils.api_util import SDPAPIError
+from plugins.module_utils.read_helpers import construct_list_payload, fetch_records_by_ids
 
 
 # ---------------------------------------------------------------------------
@@ -118,3 +121,56 @@ class TestRequestInfoListPayload:
         })
         result = construct_list_payload(module)
         assert 'start_index' not in result['list_info']
+
+
+# ---------------------------------------------------------------------------
+# fetch_records_by_ids — request_ids
+# ---------------------------------------------------------------------------
+class TestRequestInfoMultiId:
+    def _client(self, search_error=None, known=('1', '2')):
+        client = MagicMock()
+
+        def call(endpoint, method='GET', data=None, cache_ttl=None):
+            if endpoint == 'requests':
+                if search_error:
+                    raise search_error
+                values = data['list_info']['search_criteria']['values']
+                return {'requests': [{'id': v} for v in values if v in known]}
+            record_id = endpoint.split('/')[1]
+            if record_id not in known:
+                raise SDPAPIError('Not found', status=404)
+            return {'request': {'id': record_id}}
+
+        client.call.side_effect = call
+        return client
+
+    def test_resolves_ids_with_search_chunks(self, monkeypatch):
+        monkeypatch.setattr(read_helpers, 'ID_CHUNK_SIZE', 2)
+        module = create_mock_module({})
+        client = self._client()
+
+        records, missing = fetch_records_by_ids(module, client, 'request', ['1', '9', '2', '1'])
+
+        assert list(records) == ['1', '2']
+        assert missing == ['9']
+        assert client.call.call_count == 2
+        module.warn.assert_not_called()
+
+    def test_falls_back_to_individual_gets(self):
+        module = create_mock_module({})
+        client = self._client(search_error=SDPAPIError('Invalid search field', status=4001))
+
+        records, missing = fetch_records_by_ids(module, client, 'request', ['2', '7'], max_workers=2)
+
+        assert records == {'2': {'id': '2'}}
+        assert missing == ['7']
+        module.warn.assert_called_once()
+
+    def test_fallback_errors_fail_the_module(self):
+        module = create_mock_module({})
+        client = self._client(search_error=SDPAPIError('Forbidden', status=403), known=())
+        client.call.side_effect = SDPAPIError('Forbidden', status=403)
+
+        with pytest.raises(SystemExit):
+            fetch_records_by_ids(module, client, 'request', ['1'])
+        assert module.fail_json.call_args[1]['errors'] == ['1: Forbidden']
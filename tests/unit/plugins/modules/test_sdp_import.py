@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Copyright: (c) 2024, Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+
+from tests.unit.conftest import create_mock_module
+
+from plugins.module_utils.import_helpers import (
+    detect_format, iter_batches, iter_source_rows, load_checkpoint, load_failures, map_row, save_checkpoint,
+)
+from plugins.modules.sdp_import import plan_batch
+
+
+class TestSourceRows:
+    def test_csv_rows_are_streamed_after_start_row(self, tmp_path):
+        path = tmp_path / 'tickets.csv'
+        path.write_text('Title,Severity\nDisk full,High\nVPN down,Low\nPrinter,Low\n')
+
+        rows = list(iter_source_rows(str(path), 'csv', start_row=1))
+        assert [(n, r['Title']) for n, r, _e in rows] == [(2, 'VPN down'), (3, 'Printer')]
+
+    def test_jsonl_reports_bad_lines_per_row(self, tmp_path):
+        path = tmp_path / 'tickets.jsonl'
+        path.write_text('{"subject": "a"}\n\nnot json\n[1]\n')
+
+        rows = list(iter_source_rows(str(path), detect_format(str(path))))
+        assert rows[0] == (1, {'subject': 'a'}, None)
+        assert rows[1][0] == 2 and rows[1][2].startswith('Invalid JSON')
+        assert rows[2] == (3, None, 'Expected a JSON object per line.')
+
+    def test_iter_batches(self):
+        assert list(iter_batches(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+class TestMapRow:
+    def test_field_map_renames_and_drops_columns(self):
+        record = {'Title': ' Disk full ', 'Notes': 'internal', 'udf_char1': 'L-1', 'Empty': ''}
+        payload = map_row('request', record, {'Title': 'subject', 'Notes': ''}, from_csv=True)
+        assert payload == {'subject': 'Disk full', 'udf_char1': 'L-1'}
+
+    def test_csv_datetime_strings_become_timestamps(self):
+        payload = map_row('request', {'due_by_time': '1731234000000'}, from_csv=True)
+        assert payload == {'due_by_time': 1731234000000}
+
+    def test_csv_udf_datetime_strings_become_timestamps(self):
+        definitions = {'date_due': {'type': 'date'}, 'udf_char1': {'type': 'string'}}
+        loads = []
+
+        def _load_udfs():
+            loads.append(1)
+            return definitions
+
+        record = {'date_due': '1731234000000', 'udf_char1': '42', 'subject': 'Disk full'}
+        payload = map_row('request', record, from_csv=True, load_udfs=_load_udfs)
+
+        assert payload == {'date_due': 1731234000000, 'udf_char1': '42', 'subject': 'Disk full'}
+        assert loads
+
+    def test_udf_definitions_are_not_loaded_without_udf_columns(self):
+        def _load_udfs():
+            raise AssertionError('UDF metadata fetched')
+
+        assert map_row('request', {'subject': '1'}, from_csv=True, load_udfs=_load_udfs) == {'subject': '1'}
+
+
+class TestPlanBatch:
+    def test_invalid_rows_are_reported_not_sent(self):
+        module = create_mock_module({'parent_module_name': 'request', 'field_map': {'Title': 'subject'}})
+        batch = [
+            (1, {'Title': 'ok', 'priority': 'High'}, None),
+            (2, {'priority': 'High'}, None),
+            (3, {'Title': 'bad', 'bogus': 'x'}, None),
+            (4, None, 'Invalid JSON'),
+        ]
+        operations, failed = plan_batch(module, None, 'request', batch, from_csv=True)
+
+        assert [(op['row'], op['endpoint'], op['data']) for op in operations] == [
+            (1, 'requests', {'request': {'subject': 'ok', 'priority': {'name': 'High'}}}),
+        ]
+        assert [entry['row'] for entry in failed] == [2, 3, 4]
+        assert failed[0]['msg'] == "'subject' is required when creating a new request."
+
+
+class TestCheckpoint:
+    def test_round_trip_and_source_mismatch(self, tmp_path):
+        path = str(tmp_path / 'import.checkpoint')
+        module = create_mock_module({})
+        checkpoint = load_checkpoint(module, path, 'a.csv')
+        assert checkpoint['row'] == 0
+
+        checkpoint.update(row=200, created=199)
+        save_checkpoint(path, checkpoint)
+        assert load_checkpoint(module, path, 'a.csv')['row'] == 200
+
+        with pytest.raises(SystemExit):
+            load_checkpoint(module, path, 'b.csv')
+
+    def test_failures_are_appended_per_batch(self, tmp_path):
+        path = str(tmp_path / 'import.checkpoint')
+        module = create_mock_module({})
+        checkpoint = load_checkpoint(module, path, 'a.csv')
+
+        checkpoint.update(row=100)
+        save_checkpoint(path, checkpoint, [dict(row=7, msg='Bad', status=None)])
+        checkpoint.update(row=200)
+        save_checkpoint(path, checkpoint, [dict(row=150, msg='Bad', status=400)])
+
+        checkpoint = load_checkpoint(module, path, 'a.csv')
+        assert checkpoint['failed'] == 2
+        assert [entry['row'] for entry in load_failures(path, checkpoint)] == [7, 150]
+
+    def test_failures_of_an_uncommitted_batch_are_dropped(self, tmp_path):
+        path = str(tmp_path / 'import.checkpoint')
+        module = create_mock_module({})
+        checkpoint = load_checkpoint(module, path, 'a.csv')
+        save_checkpoint(path, checkpoint, [dict(row=7, msg='Bad', status=None)])
+        # Interrupted after the failures were appended but before the checkpoint was replaced
+        with open(path + '.failed', 'a') as f:
+            f.write('{"row": 150, "msg": "Bad", "status": 400}\n')
+
+        checkpoint = load_checkpoint(module, path, 'a.csv')
+        assert [entry['row'] for entry in load_failures(path, checkpoint)] == [7]
+        save_checkpoint(path, checkpoint, [dict(row=150, msg='Bad', status=400)])
+        assert [entry['row'] for entry in load_failures(path, checkpoint)] == [7, 150]